@@ -1,6 +1,14 @@
+import importlib
 
-from .static_generator import MockEngine
-from .static_generator import get_generator
-from .static_generator.schema_parser import SchemaParser, SchemaError
+__all__ = ["MockEngine", "get_generator", "SchemaParser", "SchemaError"]
 
-__all__ = ["MockEngine", "get_generator", "SchemaParser", "SchemaError"]
\ No newline at end of file
+
+def __getattr__(name):
+    # Export risolti al primo accesso tramite il package static_generator (anch'esso lazy)
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(".static_generator", __name__), name)
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
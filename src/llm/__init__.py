@@ -7,5 +7,15 @@ provider di LLM (OpenAI, Anthropic, Ollama, ecc.) per la generazione di dati moc
 
 from .v2olama_chat import V2OlamaChat
 from . import v2Olama
+from .v2Olama import OllamaClient
+from .response_cache import ResponseCache
 
-__all__ = ['V2OlamaChat', 'v2Olama']
+__all__ = ['V2OlamaChat', 'OllamaClient', 'ResponseCache', 'EmbeddingStore', 'v2Olama']
+
+
+def __getattr__(name):
+    # EmbeddingStore richiede NumPy: importato solo al primo accesso (PEP 562)
+    if name == 'EmbeddingStore':
+        from .embedding_store import EmbeddingStore
+        return EmbeddingStore
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
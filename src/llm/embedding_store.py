@@ -0,0 +1,285 @@
+import hashlib
+import json
+import os
+import re
+import threading
+from typing import Iterable, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+
+def default_store_dir() -> str:
+    """Cartella di default degli embedding: ~/.cache/mockgen/embeddings."""
+    return os.path.join(os.path.expanduser("~"), ".cache", "mockgen", "embeddings")
+
+
+class EmbeddingStore:
+    """
+    Archivio persistente degli embedding di un modello, con memoizzazione per
+    (modello, SHA-256 del testo) e ricerca per similarità coseno.
+
+    Su disco, per ogni modello, nella cartella directory:
+    - <modello>.f32: matrice float32 (righe x dim) in append, letta tramite np.memmap;
+    - <modello>.keys: una chiave (hash del testo) per riga, nello stesso ordine;
+    - <modello>.texts: il testo di ogni riga (una stringa JSON per riga), restituito dalla ricerca;
+    - <modello>.json: metadati (modello, dimensione dei vettori).
+    Un embedding già calcolato non richiede più chiamate al server. Thread-safe.
+    I vettori vengono salvati e restituiti normalizzati (norma 1): /api/embeddings e
+    /api/embed (usato da embed_many) restituiscono scale diverse per lo stesso testo.
+    """
+    # Righe confrontate per blocco nella ricerca (memoria limitata anche su archivi grandi)
+    SEARCH_BATCH_SIZE = 65_536
+    # Lato dei blocchi della matrice di similarità in near_duplicates (~16 MB in float32)
+    DUPLICATE_BLOCK_SIZE = 2048
+
+    def __init__(self, directory: Optional[str] = None, model: Optional[str] = None, client=None):
+        if client is None:
+            # Supporta sia import relativo (quando usato come modulo) che assoluto
+            try:
+                from . import v2Olama
+            except ImportError:
+                import v2Olama
+            client = v2Olama.get_client()
+        self.client = client
+        self.model = model or client.embed_model
+        self.directory = directory or default_store_dir()
+        os.makedirs(self.directory, exist_ok=True)
+
+        slug = re.sub(r"[^A-Za-z0-9_.-]+", "_", self.model)
+        self._matrix_path = os.path.join(self.directory, f"{slug}.f32")
+        self._keys_path = os.path.join(self.directory, f"{slug}.keys")
+        self._texts_path = os.path.join(self.directory, f"{slug}.texts")
+        self._meta_path = os.path.join(self.directory, f"{slug}.json")
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._norms = None
+        self.dim = None
+        self.keys: List[str] = []
+        # Testo di ogni riga (None per le righe di archivi creati senza file .texts)
+        self.texts: List[Optional[str]] = []
+        self._rows = {}
+        self.hits = 0
+        self.misses = 0
+        self._load()
+
+    # --- PERSISTENZA ---
+
+    def _load(self) -> None:
+        if not os.path.exists(self._meta_path):
+            return
+        with open(self._meta_path, encoding="utf-8") as f:
+            self.dim = json.load(f)["dim"]
+        keys = []
+        if os.path.exists(self._keys_path):
+            with open(self._keys_path, encoding="utf-8") as f:
+                keys = f.read().split()
+        # Una scrittura interrotta può lasciare una riga della matrice senza chiave (o viceversa)
+        stored = os.path.getsize(self._matrix_path) // (4 * self.dim) if os.path.exists(self._matrix_path) else 0
+        self.keys = keys[:stored]
+        self._rows = {key: row for row, key in enumerate(self.keys)}
+        if len(keys) > stored:
+            with open(self._keys_path, "w", encoding="utf-8") as f:
+                f.writelines(key + "\n" for key in self.keys)
+
+        texts = []
+        if os.path.exists(self._texts_path):
+            with open(self._texts_path, encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        texts.append(json.loads(line))
+                    except ValueError:
+                        break
+        # Il file dei testi segue le righe della matrice: quelli in più si scartano,
+        # quelli mancanti (scrittura interrotta o archivio precedente) restano None
+        if len(texts) != len(self.keys):
+            texts = texts[:len(self.keys)]
+            texts += [None] * (len(self.keys) - len(texts))
+            self._write_texts(texts, "w")
+        self.texts = texts
+
+    def _write_texts(self, texts: List[Optional[str]], mode: str) -> None:
+        with open(self._texts_path, mode, encoding="utf-8") as f:
+            f.writelines(json.dumps(text, ensure_ascii=False) + "\n" for text in texts)
+
+    def _append(self, texts: List[str], vectors: np.ndarray) -> None:
+        """Aggiunge in coda le righe (testi nuovi e distinti, vettori righe x dim)."""
+        keys = [self.key_for(text) for text in texts]
+        if self.dim is None:
+            self.dim = int(vectors.shape[1])
+            with open(self._meta_path, "w", encoding="utf-8") as f:
+                json.dump({"model": self.model, "dim": self.dim}, f)
+        elif vectors.shape[1] != self.dim:
+            raise ValueError(f"Embedding di dimensione {vectors.shape[1]}, attesa {self.dim}")
+        with open(self._matrix_path, "r+b" if os.path.exists(self._matrix_path) else "wb") as f:
+            f.seek(len(self.keys) * 4 * self.dim)
+            f.write(vectors.astype("<f4").tobytes())
+            f.truncate()
+        with open(self._keys_path, "w" if not self.keys else "a", encoding="utf-8") as f:
+            f.writelines(key + "\n" for key in keys)
+        self._write_texts(texts, "w" if not self.keys else "a")
+        for key, text in zip(keys, texts):
+            self._rows[key] = len(self.keys)
+            self.keys.append(key)
+            self.texts.append(text)
+        self._matrix = None
+        self._norms = None
+
+    @property
+    def vectors(self) -> np.ndarray:
+        """Matrice (righe x dim) degli embedding salvati, mappata in memoria dal file."""
+        with self._lock:
+            return self._vectors()
+
+    def _vectors(self) -> np.ndarray:
+        if not self.keys:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        if self._matrix is None:
+            self._matrix = np.memmap(self._matrix_path, dtype="<f4", mode="r", shape=(len(self.keys), self.dim))
+        return self._matrix
+
+    # --- MEMOIZZAZIONE ---
+
+    @staticmethod
+    def _unit(vectors) -> np.ndarray:
+        """Vettori (righe x dim) a norma 1; quelli nulli restano nulli."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+    @staticmethod
+    def key_for(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def __contains__(self, text: str) -> bool:
+        return self.key_for(text) in self._rows
+
+    def get(self, text: str) -> Optional[np.ndarray]:
+        """Embedding salvato per il testo, senza chiamare il server (None se assente)."""
+        with self._lock:
+            row = self._rows.get(self.key_for(text))
+            return None if row is None else np.array(self._vectors()[row])
+
+    def embed(self, text: str) -> np.ndarray:
+        """Embedding del testo: dall'archivio se già calcolato, altrimenti dal server (e salvato)."""
+        key = self.key_for(text)
+        with self._lock:
+            row = self._rows.get(key)
+            if row is not None:
+                self.hits += 1
+                return np.array(self._vectors()[row])
+        vector = self._unit(self.client.embed(text, model=self.model))
+        with self._lock:
+            self.misses += 1
+            if key not in self._rows:
+                self._append([text], vector.reshape(1, -1))
+        return vector
+
+    def embed_many(self, texts: Iterable[str]) -> np.ndarray:
+        """
+        Matrice degli embedding dei testi, nell'ordine dell'input: quelli mancanti
+        (senza duplicati) vengono richiesti insieme con client.embed_many e salvati.
+        """
+        texts = list(texts)
+        with self._lock:
+            missing = list(dict.fromkeys(t for t in texts if self.key_for(t) not in self._rows))
+            self.hits += len(texts) - len(missing)
+        if missing:
+            vectors = self._unit(self.client.embed_many(missing, model=self.model))
+            with self._lock:
+                self.misses += len(missing)
+                # Un'altra chiamata concorrente può averne già salvati alcuni
+                fresh = [i for i, text in enumerate(missing) if self.key_for(text) not in self._rows]
+                if fresh:
+                    self._append([missing[i] for i in fresh], vectors[fresh])
+        if not texts:
+            return np.empty((0, self.dim or 0), dtype=np.float32)
+        with self._lock:
+            matrix = self._vectors()
+            return np.asarray(matrix[[self._rows[self.key_for(t)] for t in texts]])
+
+    # --- RICERCA ---
+
+    def _normalized_norms(self, matrix: np.ndarray) -> np.ndarray:
+        if self._norms is None or len(self._norms) != len(matrix):
+            norms = np.empty(len(matrix), dtype=np.float32)
+            for start in range(0, len(matrix), self.SEARCH_BATCH_SIZE):
+                block = matrix[start:start + self.SEARCH_BATCH_SIZE]
+                norms[start:start + len(block)] = np.linalg.norm(block, axis=1)
+            norms[norms == 0] = 1.0
+            self._norms = norms
+        return self._norms
+
+    def _query_vector(self, query: Union[str, Sequence[float]], memoize: bool) -> np.ndarray:
+        if not isinstance(query, str):
+            return np.asarray(query, dtype=np.float32)
+        if memoize:
+            return self.embed(query)
+        vector = self.get(query)
+        if vector is None:
+            vector = np.asarray(self.client.embed(query, model=self.model), dtype=np.float32)
+        return vector
+
+    def search(self, query: Union[str, Sequence[float]], k: int = 5,
+               memoize: bool = False) -> List[Tuple[Optional[str], float]]:
+        """
+        I k embedding più simili a query (testo o vettore) per similarità coseno, come
+        coppie (testo, punteggio) in ordine decrescente. Ricerca esaustiva a blocchi
+        di SEARCH_BATCH_SIZE righe. Un testo di query non viene salvato nell'archivio
+        (altrimenti occuperebbe uno dei k risultati con punteggio 1), salvo memoize=True.
+        """
+        vector = self._query_vector(query, memoize)
+        with self._lock:
+            matrix = self._vectors()
+            if not len(matrix) or k < 1:
+                return []
+            norms = self._normalized_norms(matrix)
+        q = vector / (np.linalg.norm(vector) or 1.0)
+
+        best_rows = np.empty(0, dtype=np.int64)
+        best_scores = np.empty(0, dtype=np.float32)
+        for start in range(0, len(matrix), self.SEARCH_BATCH_SIZE):
+            block = matrix[start:start + self.SEARCH_BATCH_SIZE]
+            scores = (block @ q) / norms[start:start + len(block)]
+            if len(scores) > k:
+                top = np.argpartition(-scores, k - 1)[:k]
+            else:
+                top = np.arange(len(scores))
+            best_rows = np.concatenate([best_rows, top + start])
+            best_scores = np.concatenate([best_scores, scores[top]])
+            if len(best_scores) > k:
+                keep = np.argpartition(-best_scores, k - 1)[:k]
+                best_rows, best_scores = best_rows[keep], best_scores[keep]
+        order = np.argsort(-best_scores, kind="stable")
+        return [(self.texts[best_rows[i]], float(best_scores[i])) for i in order]
+
+    def near_duplicates(self, texts: Iterable[str], threshold: float = 0.95) -> List[Tuple[int, int, float]]:
+        """
+        Coppie (i, j, similarità) di testi quasi duplicati (coseno >= threshold, i < j)
+        tra quelli forniti, es. per scartare record AI ripetuti. La matrice delle
+        similarità è calcolata a blocchi di DUPLICATE_BLOCK_SIZE x DUPLICATE_BLOCK_SIZE,
+        solo sopra la diagonale: la memoria non cresce con il quadrato dei testi.
+        """
+        texts = list(texts)
+        if len(texts) < 2:
+            return []
+        matrix = self.embed_many(texts)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        unit = matrix / norms
+        size = self.DUPLICATE_BLOCK_SIZE
+        pairs = []
+        for row in range(0, len(unit), size):
+            left = unit[row:row + size]
+            for col in range(row, len(unit), size):
+                block = left @ unit[col:col + size].T
+                hits = block >= threshold
+                if col == row:
+                    hits = np.triu(hits, k=1)
+                rows, cols = np.nonzero(hits)
+                pairs.extend(zip((rows + row).tolist(), (cols + col).tolist(), block[rows, cols].tolist()))
+        pairs.sort()
+        return pairs
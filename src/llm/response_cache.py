@@ -0,0 +1,142 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+
+def default_cache_path() -> str:
+    """Percorso di default del database: ~/.cache/mockgen/llm_responses.sqlite3."""
+    return os.path.join(os.path.expanduser("~"), ".cache", "mockgen", "llm_responses.sqlite3")
+
+
+class ResponseCache:
+    """
+    Cache persistente (SQLite) delle risposte Ollama, indicizzata per SHA-256 del
+    corpo JSON canonico della richiesta (endpoint, modello, system, prompt, opzioni
+    incluso il seed): a parità di richiesta la risposta è quella già ottenuta.
+
+    - max_age: secondi di validità di una voce (None: nessuna scadenza);
+    - max_bytes: dimensione massima delle risposte salvate; oltre la soglia vengono
+      rimosse le voci usate meno di recente;
+    - read_only: la cache viene solo letta (es. in CI), le risposte nuove non vengono salvate.
+    Thread-safe: una connessione condivisa protetta da lock.
+    """
+    # Inserimenti tra due controlli della dimensione massima
+    EVICT_EVERY = 100
+
+    def __init__(self, path: Optional[str] = None, max_age: Optional[float] = None,
+                 max_bytes: Optional[int] = None, read_only: bool = False):
+        self.path = path or default_cache_path()
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self.read_only = read_only
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self._lock = threading.Lock()
+
+        if read_only:
+            uri = f"file:{os.path.abspath(self.path)}?mode=ro"
+            self._conn = sqlite3.connect(uri, uri=True, check_same_thread=False) if os.path.exists(self.path) else None
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode = WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, size INTEGER NOT NULL, "
+            "created REAL NOT NULL, accessed REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS responses_accessed ON responses (accessed)")
+
+    @staticmethod
+    def key_for(path: str, body: Dict[str, Any]) -> str:
+        """Chiave della richiesta: SHA-256 di endpoint + corpo JSON con chiavi ordinate."""
+        canonical = json.dumps(body, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+        return hashlib.sha256(f"{path}\n{canonical}".encode("utf-8")).hexdigest()
+
+    def get(self, path: str, body: Dict[str, Any]) -> Optional[Any]:
+        """Risposta salvata per la richiesta, oppure None (conteggiata come miss)."""
+        key = self.key_for(path, body)
+        now = time.time()
+        with self._lock:
+            row = None
+            if self._conn is not None:
+                row = self._conn.execute("SELECT value, created FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None or (self.max_age is not None and now - row[1] > self.max_age):
+                self.misses += 1
+                return None
+            self.hits += 1
+            if not self.read_only:
+                self._conn.execute("UPDATE responses SET accessed = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, path: str, body: Dict[str, Any], response: Any) -> None:
+        """Salva la risposta (ignorato in sola lettura o a cache chiusa)."""
+        if self.read_only:
+            return
+        value = json.dumps(response, ensure_ascii=False)
+        now = time.time()
+        with self._lock:
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (self.key_for(path, body), value, len(value.encode("utf-8")), now, now),
+            )
+            self._puts += 1
+            if self._puts % self.EVICT_EVERY == 0:
+                self._evict(now)
+
+    def evict(self) -> None:
+        """Rimuove le voci scadute e, oltre max_bytes, quelle usate meno di recente."""
+        if self.read_only:
+            return
+        with self._lock:
+            if self._conn is not None:
+                self._evict(time.time())
+
+    def _evict(self, now: float) -> None:
+        if self.max_age is not None:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.max_age,))
+        if self.max_bytes is not None:
+            total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+            if total > self.max_bytes:
+                excess = total - self.max_bytes
+                rows = self._conn.execute("SELECT key, size FROM responses ORDER BY accessed")
+                victims = []
+                for key, size in rows:
+                    if excess <= 0:
+                        break
+                    victims.append((key,))
+                    excess -= size
+                self._conn.executemany("DELETE FROM responses WHERE key = ?", victims)
+
+    def clear(self) -> None:
+        if self.read_only:
+            return
+        with self._lock:
+            if self._conn is not None:
+                self._conn.execute("DELETE FROM responses")
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = 0, 0
+            if self._conn is not None:
+                entries, size = self._conn.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return {
+                "entries": entries, "bytes": size, "hits": self.hits, "misses": self.misses,
+                "read_only": self.read_only, "path": self.path,
+            }
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
@@ -1,30 +1,310 @@
-import os, requests
+import os, threading, time
+from concurrent.futures import CancelledError, Future, ThreadPoolExecutor
+from typing import Iterable, List, Optional
 
-OLLAMA = "http://127.0.0.1:11434"
+import requests
+from requests.adapters import HTTPAdapter
+
+# Supporta sia import relativo (quando usato come modulo) che assoluto (quando eseguito direttamente)
+try:
+    from .response_cache import ResponseCache
+except ImportError:
+    from response_cache import ResponseCache
+
+OLLAMA = os.getenv("OLLAMA_URL", "http://127.0.0.1:11434")
 LLM_MODEL = os.getenv("LLM_MODEL", "llama3")
 EMBED_MODEL = os.getenv("EMBED_MODEL", "nomic-embed-text")
 
+# Timeout (secondi): connessione, e lettura della risposta per generazione ed embedding
+CONNECT_TIMEOUT = float(os.getenv("OLLAMA_CONNECT_TIMEOUT", "5"))
+GENERATE_TIMEOUT = float(os.getenv("OLLAMA_GENERATE_TIMEOUT", "300"))
+EMBED_TIMEOUT = float(os.getenv("OLLAMA_EMBED_TIMEOUT", "60"))
+# Connessioni keep-alive tenute aperte verso il server Ollama
+POOL_SIZE = int(os.getenv("OLLAMA_POOL_SIZE", "10"))
+# Testi per richiesta batch di embedding e finestra (ms) di accorpamento delle chiamate embed():
+# con 0 (default) embed() resta una richiesta singola a /api/embeddings
+EMBED_BATCH_SIZE = int(os.getenv("OLLAMA_EMBED_BATCH_SIZE", "64"))
+EMBED_WINDOW_MS = float(os.getenv("OLLAMA_EMBED_WINDOW_MS", "0"))
+
+
+def cache_from_env() -> Optional[ResponseCache]:
+    """
+    Cache delle risposte per il client condiviso, attiva se OLLAMA_CACHE è impostata
+    (percorso del database, oppure "1" per quello di default). Opzioni:
+    OLLAMA_CACHE_READONLY=1, OLLAMA_CACHE_MAX_AGE (secondi), OLLAMA_CACHE_MAX_BYTES.
+    """
+    path = os.getenv("OLLAMA_CACHE")
+    if not path:
+        return None
+    max_age = os.getenv("OLLAMA_CACHE_MAX_AGE")
+    max_bytes = os.getenv("OLLAMA_CACHE_MAX_BYTES")
+    return ResponseCache(
+        path=None if path == "1" else path,
+        max_age=float(max_age) if max_age else None,
+        max_bytes=int(max_bytes) if max_bytes else None,
+        read_only=os.getenv("OLLAMA_CACHE_READONLY", "") in ("1", "true", "yes"),
+    )
+
+
+class OllamaClient:
+    """
+    Client HTTP per Ollama con una requests.Session condivisa: le connessioni TCP
+    restano aperte (keep-alive) e vengono riusate tra le chiamate, fino a pool_size
+    connessioni contemporanee (le richieste oltre il limite attendono una connessione
+    libera). Thread-safe: può essere usato da più thread (es. richieste Flask).
+    Con una ResponseCache le richieste già eseguite (stesso corpo, seed incluso)
+    vengono servite dalla cache senza contattare il server.
+    """
+    def __init__(self, base_url: Optional[str] = None, connect_timeout: float = CONNECT_TIMEOUT,
+                 generate_timeout: float = GENERATE_TIMEOUT, embed_timeout: float = EMBED_TIMEOUT,
+                 pool_size: int = POOL_SIZE, model: Optional[str] = None, embed_model: Optional[str] = None,
+                 cache: Optional[ResponseCache] = None):
+        if pool_size < 1:
+            raise ValueError(f"Dimensione del pool di connessioni non valida: {pool_size}")
+        self.base_url = (base_url or OLLAMA).rstrip("/")
+        self.connect_timeout = connect_timeout
+        self.generate_timeout = generate_timeout
+        self.embed_timeout = embed_timeout
+        self.pool_size = pool_size
+        self.model = model or LLM_MODEL
+        self.embed_model = embed_model or EMBED_MODEL
+        self.cache = cache
+        # Supporto dell'endpoint batch /api/embed: None finché non è stato provato
+        self.batch_embed = None
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _post(self, path: str, body: dict, read_timeout: float) -> dict:
+        if self.cache is not None:
+            cached = self.cache.get(path, body)
+            if cached is not None:
+                return cached
+        r = self.session.post(f"{self.base_url}{path}", json=body,
+                              timeout=(self.connect_timeout, read_timeout))
+        r.raise_for_status()
+        payload = r.json()
+        if self.cache is not None:
+            self.cache.put(path, body, payload)
+        return payload
+
+    def embed(self, text: str, model: Optional[str] = None, timeout: Optional[float] = None) -> List[float]:
+        body = {"model": model or self.embed_model, "prompt": text}
+        return self._post("/api/embeddings", body, timeout or self.embed_timeout)["embedding"]
+
+    def embed_batch(self, texts: List[str], model: Optional[str] = None,
+                    timeout: Optional[float] = None) -> Optional[List[List[float]]]:
+        """
+        Embedding di più testi con una sola richiesta all'endpoint /api/embed.
+        Restituisce None se il server non lo supporta (versioni di Ollama precedenti):
+        l'esito viene ricordato e le chiamate successive non lo riprovano.
+        Nota: /api/embed restituisce vettori normalizzati (norma 1).
+        """
+        if self.batch_embed is False:
+            return None
+        body = {"model": model or self.embed_model, "input": list(texts)}
+        try:
+            vectors = self._post("/api/embed", body, timeout or self.embed_timeout)["embeddings"]
+        except requests.HTTPError as e:
+            if e.response is not None and e.response.status_code in (404, 405):
+                self.batch_embed = False
+                return None
+            raise
+        self.batch_embed = True
+        return vectors
+
+    def embed_many(self, texts: Iterable[str], model: Optional[str] = None, batch_size: int = EMBED_BATCH_SIZE,
+                   max_in_flight: Optional[int] = None, timeout: Optional[float] = None) -> List[List[float]]:
+        """
+        Embedding di più testi, nello stesso ordine dell'input. I duplicati vengono
+        calcolati una volta sola; i testi distinti sono inviati in richieste batch da
+        batch_size (o, se il server non supporta il batch, in richieste singole),
+        fino a max_in_flight richieste contemporanee (default: pool_size).
+        """
+        texts = list(texts)
+        if batch_size < 1:
+            raise ValueError(f"Dimensione del batch di embedding non valida: {batch_size}")
+        unique = list(dict.fromkeys(texts))
+        if not unique:
+            return []
+        workers = min(max_in_flight or self.pool_size, len(unique))
+
+        # Il primo batch verifica il supporto dell'endpoint batch
+        batches = [unique[i:i + batch_size] for i in range(0, len(unique), batch_size)]
+        first = self.embed_batch(batches[0], model=model, timeout=timeout)
+        if first is not None:
+            vectors = list(first)
+            with ThreadPoolExecutor(max_workers=min(workers, max(1, len(batches) - 1))) as pool:
+                for result in pool.map(lambda batch: self.embed_batch(batch, model=model, timeout=timeout),
+                                       batches[1:]):
+                    vectors.extend(result)
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                vectors = list(pool.map(lambda text: self.embed(text, model=model, timeout=timeout), unique))
+
+        by_text = dict(zip(unique, vectors))
+        return [by_text[text] for text in texts]
+
+    def generate(self, system: str, prompt: str, temperature: float = 0.7, model: Optional[str] = None,
+                 timeout: Optional[float] = None) -> str:
+        body = {
+            "model": model or self.model,
+            "system": system,
+            "prompt": prompt,
+            "options": {
+                "temperature": temperature,
+                "top_p": 0.9,
+                "num_ctx": 2048,
+                "seed": 7
+            },
+            "stream": False
+        }
+        return self._post("/api/generate", body, timeout or self.generate_timeout)["response"]
+
+    def close(self) -> None:
+        """Chiude le connessioni del pool (e la cache delle risposte, se presente)."""
+        self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+    def __enter__(self) -> "OllamaClient":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+_client: Optional[OllamaClient] = None
+_client_lock = threading.Lock()
+
+def get_client() -> OllamaClient:
+    """Client condiviso del processo (creato al primo utilizzo con la configurazione da env)."""
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = OllamaClient(cache=cache_from_env())
+    return _client
+
+def set_client(client: Optional[OllamaClient]) -> None:
+    """Sostituisce il client condiviso (None: verrà ricreato al prossimo utilizzo)."""
+    global _client
+    with _client_lock:
+        previous, _client = _client, client
+    if previous is not None and previous is not client:
+        previous.close()
+
+class EmbedCoalescer:
+    """
+    Accorpa le chiamate embed() concorrenti (es. da richieste Flask diverse) in un'unica
+    chiamata embed_many: il primo testo in arrivo apre una finestra di window secondi,
+    allo scadere (o al raggiungimento di max_batch testi) il gruppo viene inviato insieme
+    e ogni chiamante riceve il proprio vettore. Da attivare esplicitamente
+    (OLLAMA_EMBED_WINDOW_MS > 0): un chiamante isolato attende comunque l'intera finestra
+    e il batch passa da /api/embed, che restituisce vettori normalizzati (norma 1).
+    """
+    def __init__(self, client: Optional[OllamaClient] = None, window: float = EMBED_WINDOW_MS / 1000,
+                 max_batch: int = EMBED_BATCH_SIZE, model: Optional[str] = None):
+        self.client = client
+        self.window = window
+        self.max_batch = max_batch
+        self.model = model
+        self.batches = 0
+        self._pending = []
+        self._lock = threading.Lock()
+
+    def embed(self, text: str) -> List[float]:
+        future = Future()
+        with self._lock:
+            self._pending.append((text, future))
+            leader = len(self._pending) == 1
+            full = len(self._pending) >= self.max_batch
+        if full:
+            self._flush()
+        elif leader:
+            time.sleep(self.window)
+            self._flush()
+        return future.result()
+
+    def _flush(self) -> None:
+        with self._lock:
+            batch, self._pending = self._pending, []
+            if batch:
+                self.batches += 1
+        if not batch:
+            return
+        try:
+            client = self.client or get_client()
+            vectors = client.embed_many([text for text, _ in batch], model=self.model)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), vector in zip(batch, vectors):
+            future.set_result(vector)
+
+
+_coalescer = EmbedCoalescer()
+
 def embed(text: str):
-    r = requests.post(f"{OLLAMA}/api/embeddings",
-                      json={"model": EMBED_MODEL, "prompt": text}, timeout=60)
-    r.raise_for_status()
-    return r.json()["embedding"]
+    # Con la finestra a 0 (default) ogni chiamata va direttamente al server via /api/embeddings
+    if _coalescer.window <= 0:
+        return get_client().embed(text)
+    return _coalescer.embed(text)
+
+def embed_many(texts: Iterable[str], **kwargs) -> List[List[float]]:
+    """Embedding di più testi con il client condiviso (vedi OllamaClient.embed_many)."""
+    return get_client().embed_many(texts, **kwargs)
 
 def generateMock(system: str, prompt: str, temperature: float = 0.7) -> str:
-    body = {
-        "model": LLM_MODEL,
-        "system": system,
-        "prompt": prompt,
-        "options": {
-            "temperature": temperature,
-            "top_p": 0.9,
-            "num_ctx": 2048,
-            "seed": 7
-        },
-        "stream": False
-    }
-    r = requests.post(f"{OLLAMA}/api/generate", json=body, timeout=300)
-    r.raise_for_status()
-    return r.json()["response"]
+    return get_client().generate(system, prompt, temperature)
+
+def generate_many(system: str, prompts: Iterable[str], temperature: float = 0.7, max_in_flight: Optional[int] = None,
+                  timeout: Optional[float] = None, cancel: Optional[threading.Event] = None,
+                  return_exceptions: bool = False, client: Optional[OllamaClient] = None,
+                  model: Optional[str] = None) -> list:
+    """
+    Invia più prompt indipendenti in parallelo (thread pool) e restituisce le risposte
+    nello stesso ordine dei prompt, qualunque sia l'ordine di completamento.
+
+    - max_in_flight: richieste contemporanee (default: pool_size del client);
+    - timeout: timeout di lettura di ogni singola richiesta;
+    - cancel: threading.Event; una volta impostato i prompt non ancora inviati non
+      partono più e risultano annullati (CancelledError);
+    - return_exceptions: se False il primo errore (in ordine di prompt) annulla i
+      prompt rimanenti e viene rilanciato; se True l'eccezione prende il posto della risposta.
+    """
+    client = client or get_client()
+    prompts = list(prompts)
+    max_in_flight = max_in_flight or client.pool_size
+    if max_in_flight < 1:
+        raise ValueError(f"Numero di richieste contemporanee non valido: {max_in_flight}")
+    if not prompts:
+        return []
+    stop = threading.Event()
 
+    def task(prompt: str) -> str:
+        if stop.is_set() or (cancel is not None and cancel.is_set()):
+            raise CancelledError()
+        return client.generate(system, prompt, temperature, model=model, timeout=timeout)
 
+    results = []
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(prompts)), thread_name_prefix="ollama") as pool:
+        futures = [pool.submit(task, prompt) for prompt in prompts]
+        try:
+            for future in futures:
+                try:
+                    results.append(future.result())
+                except Exception as e:
+                    if not return_exceptions:
+                        raise
+                    results.append(e)
+        finally:
+            # Errore o interruzione: i prompt ancora in coda non vengono inviati
+            if len(results) < len(futures):
+                stop.set()
+                for future in futures:
+                    future.cancel()
+    return results
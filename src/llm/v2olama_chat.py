@@ -13,16 +13,23 @@ except ImportError:
 class V2OlamaChat:
     
 
-    def __init__(self, model: Optional[str] = None, system: Optional[str] = None):
+    def __init__(self, model: Optional[str] = None, system: Optional[str] = None,
+                 client: Optional["v2Olama.OllamaClient"] = None, embeddings=None):
         """
         Inizializza la sessione di chat.
         
         Args:
             model: Nome del modello (se None, usa il default da v2Olama).
             system: Prompt di sistema iniziale.
+            client: OllamaClient da usare (se None, il client condiviso di v2Olama,
+                    con il pool di connessioni comune a tutte le sessioni).
+            embeddings: EmbeddingStore opzionale: gli embedding già calcolati
+                        vengono riletti dall'archivio invece di richiederli al server.
         """
         self.model = model or v2Olama.LLM_MODEL
         self.system = system or ""
+        self.client = client
+        self.embeddings = embeddings
         self.history: List[tuple[str, str]] = []  # (role, text) - role in {"user", "assistant"}
 
     def set_system(self, system_text: str) -> None:
@@ -49,17 +56,45 @@ class V2OlamaChat:
         # Aggiungi il messaggio utente alla cronologia
         self.history.append(("user", user_message))
 
-        # Richiama generateMock di v2Olama con system prompt e user message
-        response = v2Olama.generateMock(
-            system=self.system,
-            prompt=user_message,
-            temperature=temperature
-        )
+        # Richiama generateMock di v2Olama (o il client dedicato) con system prompt e user message
+        if self.client is not None:
+            response = self.client.generate(self.system, user_message, temperature, model=self.model)
+        else:
+            response = v2Olama.generateMock(
+                system=self.system,
+                prompt=user_message,
+                temperature=temperature
+            )
 
         # Aggiungi la risposta dell'assistente alla cronologia
         self.history.append(("assistant", response))
         return response
 
+    def send_many(self, messages: List[str], temperature: float = 0.7, max_in_flight: Optional[int] = None,
+                  timeout: Optional[float] = None) -> List[str]:
+        """
+        Invia più messaggi indipendenti in parallelo (vedi v2Olama.generate_many), con il
+        prompt di sistema della sessione. Le risposte, e le coppie aggiunte alla cronologia,
+        seguono l'ordine dei messaggi.
+        
+        Args:
+            messages: Messaggi da inviare (ognuno senza il contesto degli altri).
+            temperature: Temperatura per la generazione (default 0.7).
+            max_in_flight: Richieste contemporanee (default: pool di connessioni del client).
+            timeout: Timeout di lettura di ogni richiesta, in secondi.
+        
+        Returns:
+            Le risposte del modello, una per messaggio.
+        """
+        responses = v2Olama.generate_many(
+            self.system, messages, temperature=temperature, max_in_flight=max_in_flight,
+            timeout=timeout, client=self.client, model=self.model if self.client is not None else None
+        )
+        for message, response in zip(messages, responses):
+            self.history.append(("user", message))
+            self.history.append(("assistant", response))
+        return responses
+
     def get_history(self) -> List[tuple[str, str]]:
         """Ritorna la cronologia completa del dialogo."""
         return self.history.copy()
@@ -74,6 +109,10 @@ class V2OlamaChat:
         Returns:
             L'embedding come lista di float.
         """
+        if self.embeddings is not None:
+            return self.embeddings.embed(text).tolist()
+        if self.client is not None:
+            return self.client.embed(text)
         return v2Olama.embed(text)
 
 
@@ -1,7 +1,7 @@
 import os
 import json
 import io
-from flask import Flask, render_template, request, jsonify, send_file, session
+from flask import Flask, Response, render_template, request, jsonify, send_file, session, stream_with_context
 import sys
 
 # Aggiungi il percorso src al PYTHONPATH
@@ -10,6 +10,8 @@ sys.path.insert(0, os.path.dirname(__file__))
 from llm.v2olama_chat import V2OlamaChat
 from static_generator.engine import MockEngine
 from static_generator.exporter import DataExporter
+from static_generator.schema_cache import SchemaCache
+from static_generator.schema_parser import SchemaError
 
 
 DEFAULT_SYSTEM_PROMPT = (
@@ -36,9 +38,18 @@ app.secret_key = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
 UPLOAD_DIR = os.path.join(base_dir, "uploaded_schemas")
 os.makedirs(UPLOAD_DIR, exist_ok=True)
 
+# Schemi già validati e compilati, indicizzati per SHA-256 del contenuto
+schema_cache = SchemaCache(max_size=int(os.getenv("SCHEMA_CACHE_SIZE", "64")))
+
+# Streaming: tipi MIME per formato e dimensione minima di ogni chunk HTTP
+STREAM_MIMETYPES = {"json": "application/json", "ndjson": "application/x-ndjson", "csv": "text/csv", "sql": "text/plain"}
+STREAM_CHUNK_BYTES = 64 * 1024
+
 # -----------------------------------------------------------------
 # GESTIONE SESSIONI CHAT
 # -----------------------------------------------------------------
+# Tutte le sessioni passano dal client Ollama condiviso di v2Olama: un solo pool di
+# connessioni keep-alive (OLLAMA_URL, OLLAMA_POOL_SIZE, OLLAMA_*_TIMEOUT)
 chat_sessions = {}  # {session_id: V2OlamaChat}
 
 
@@ -90,6 +101,33 @@ def upload_schema():
     return jsonify({"success": True, "path": target_path}), 200
 
 
+def _load_schema_content(filename, content):
+    """Restituisce il contenuto inline o quello dello schema caricato (None se assente)."""
+    if content:
+        return content
+    safe_name = os.path.basename(filename) or "input.json"
+    if not safe_name.endswith(".json"):
+        safe_name += ".json"
+    schema_path = os.path.join(UPLOAD_DIR, safe_name)
+    if not os.path.exists(schema_path):
+        return None
+    with open(schema_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def _coalesce_chunks(chunks, min_size=STREAM_CHUNK_BYTES):
+    """Accorpa i chunk prodotti dall'exporter in chunk HTTP di almeno min_size caratteri."""
+    buffer, size = [], 0
+    for chunk in chunks:
+        buffer.append(chunk)
+        size += len(chunk)
+        if size >= min_size:
+            yield "".join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer)
+
+
 @app.route("/api/schema/generate", methods=["POST"])
 def generate_from_schema():
     """Genera dati mock usando uno schema già caricato."""
@@ -101,22 +139,14 @@ def generate_from_schema():
     format_type = payload.get("format", "json")
     table_name = payload.get("table_name", "my_table")
 
-    # Usa contenuto inline (niente fetch dal server) se fornito
-    if content:
-        import tempfile
-        with tempfile.NamedTemporaryFile(mode="w", suffix=".json", delete=False, encoding="utf-8") as tmp:
-            tmp.write(content)
-            schema_path = tmp.name
-    else:
-        safe_name = os.path.basename(filename) or "input.json"
-        if not safe_name.endswith(".json"):
-            safe_name += ".json"
-        schema_path = os.path.join(UPLOAD_DIR, safe_name)
-        if not os.path.exists(schema_path):
-            return jsonify({"success": False, "error": "Schema non trovato. Fornisci 'content' o carica il file."}), 404
+    # Usa contenuto inline (niente fetch dal server) se fornito, senza passare dal disco
+    content = _load_schema_content(filename, content)
+    if content is None:
+        return jsonify({"success": False, "error": "Schema non trovato. Fornisci 'content' o carica il file."}), 404
 
     try:
-        engine = MockEngine(schema_path=schema_path, seed=seed)
+        # Parsing, validazione e compilazione solo al primo utilizzo di ogni schema
+        engine = schema_cache.engine(content, seed=seed)
         data = engine.generate(n=count)
 
         # Esporta nel formato richiesto su buffer in memoria
@@ -126,6 +156,7 @@ def generate_from_schema():
             format_type=format_type,
             output_stream=buf,
             table_name=table_name,
+            fields=engine.fields,
         )
         text_out = buf.getvalue()
         ext_map = {"json": "json", "csv": "csv", "ndjson": "ndjson", "sql": "sql"}
@@ -141,6 +172,66 @@ def generate_from_schema():
     except Exception as exc:  # noqa: BLE001
         return jsonify({"success": False, "error": str(exc)}), 500
 
+@app.route("/api/schema/cache", methods=["GET"])
+def schema_cache_stats():
+    """Metriche della cache degli schemi compilati."""
+    return jsonify({"success": True, "cache": schema_cache.stats()}), 200
+
+@app.route("/api/schema/stream", methods=["POST"])
+def stream_from_schema():
+    """
+    Genera dati mock in streaming (Transfer-Encoding: chunked): i record vengono
+    generati ed esportati man mano, con memoria costante anche per milioni di righe.
+    Stesso payload di /api/schema/generate; la risposta è il file nel formato richiesto.
+    """
+    payload = request.get_json(silent=True) or {}
+    filename = payload.get("filename", "input.json")
+    seed = payload.get("seed")
+    format_type = payload.get("format", "ndjson")
+    table_name = payload.get("table_name", "my_table")
+    try:
+        count = int(payload.get("count", 3) or 3)
+    except (TypeError, ValueError):
+        return jsonify({"success": False, "error": "'count' deve essere un intero."}), 400
+    if count < 0:
+        return jsonify({"success": False, "error": "'count' non può essere negativo."}), 400
+    sql_batch_size = payload.get("sql_batch_size")
+    if sql_batch_size is not None:
+        try:
+            sql_batch_size = int(sql_batch_size)
+        except (TypeError, ValueError):
+            return jsonify({"success": False, "error": "'sql_batch_size' deve essere un intero."}), 400
+    if format_type not in STREAM_MIMETYPES:
+        return jsonify({"success": False, "error": f"Formato non supportato: {format_type}"}), 400
+
+    content = _load_schema_content(filename, payload.get("content", ""))
+    if content is None:
+        return jsonify({"success": False, "error": "Schema non trovato. Fornisci 'content' o carica il file."}), 404
+
+    try:
+        # Gli errori di schema e di opzioni emergono qui, prima di inviare gli header della risposta
+        engine = schema_cache.engine(content, seed=seed)
+        chunks = DataExporter.iter_export(
+            engine.iter_records(n=count),
+            format_type,
+            table_name=table_name,
+            sql_mode=payload.get("sql_mode"),
+            sql_batch_size=sql_batch_size,
+            fields=engine.fields,
+            csv_arrays=payload.get("csv_arrays"),
+        )
+    except (SchemaError, ValueError) as exc:
+        # Schema malformato o non valido (JSON non valido è un ValueError), opzioni non valide
+        return jsonify({"success": False, "error": str(exc)}), 400
+    except Exception as exc:  # noqa: BLE001
+        return jsonify({"success": False, "error": str(exc)}), 500
+
+    response = Response(stream_with_context(_coalesce_chunks(chunks)), mimetype=STREAM_MIMETYPES[format_type])
+    response.headers["Content-Disposition"] = f"attachment; filename=mock.{format_type}"
+    # Evita che eventuali reverse proxy accumulino la risposta in memoria
+    response.headers["X-Accel-Buffering"] = "no"
+    return response
+
 #   route per chat
 # -----------------------------------------------------------------
 @app.route("/ai", methods=["POST"])
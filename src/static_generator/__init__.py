@@ -1,5 +1,23 @@
-from .engine import MockEngine
-from .algorithmic import get_generator
-from .schema_parser import SchemaParser, SchemaError
+import importlib
 
-__all__ = ["MockEngine", "get_generator", "SchemaParser", "SchemaError"]
\ No newline at end of file
+__all__ = ["MockEngine", "get_generator", "SchemaParser", "SchemaError"]
+
+# Gli export vengono importati al primo accesso (PEP 562): importare un singolo
+# sottomodulo (es. cli_parser) non carica engine, Faker e jsonschema
+_EXPORTS = {
+    "MockEngine": ".engine",
+    "get_generator": ".algorithmic",
+    "SchemaParser": ".schema_parser",
+    "SchemaError": ".schema_parser",
+}
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module, __name__), name)
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
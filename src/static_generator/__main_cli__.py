@@ -16,7 +16,15 @@ if project_root not in sys.path:
 
 # Import dei nuovi moduli modulari
 from src.static_generator.cli_parser import parse_arguments
-from src.static_generator.controller import run_generation_process
+
+
+def run_generation_process(args):
+    """
+    Il controller (e con lui engine, Faker e jsonschema) viene importato solo quando
+    c'è davvero qualcosa da generare: --help e gli errori di parsing restano rapidi.
+    """
+    from src.static_generator.controller import run_generation_process as _run_generation_process
+    return _run_generation_process(args)
 
 
 def main():
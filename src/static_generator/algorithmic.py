@@ -1,124 +1,443 @@
-from faker import Faker
-import uuid
-import random
-from typing import Any, Dict
+import inspect
+import time
+from typing import Any, Dict, Optional
 from .base import FieldGenerator
+from .rng import RandomSource, DEFAULT_LOCALE
+from .uniqueness import (DEFAULT_CAPACITY, DEFAULT_ERROR_RATE, DEFAULT_MAX_RETRIES, UniqueSet,
+                         UniquenessError, check_options, value_key)
 
-fake = Faker('it_IT')
+_default_source = None
+
+def default_source() -> RandomSource:
+    """
+    Sorgente usata quando un generatore viene invocato senza rng esplicito
+    (uso diretto dei generatori): è collegata all'istanza globale `fake`.
+    """
+    global _default_source
+    if _default_source is None:
+        _default_source = RandomSource(locale=DEFAULT_LOCALE)
+    return _default_source
+
+def __getattr__(name: str) -> Any:
+    # L'istanza globale `fake` viene creata al primo accesso: importare il modulo
+    # non costa l'import di faker né la costruzione del locale
+    if name == "fake":
+        return default_source().fake
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+# Maschere dei bit di versione e variante (RFC 9562) sull'intero a 128 bit
+_UUID_VERSION_MASK = ~(0xF000 << 64) & ((1 << 128) - 1)
+_UUID_VARIANT_MASK = ~(0xC000 << 48) & ((1 << 128) - 1)
+_UUID_V4_BITS = (4 << 76) | (0x8000 << 48)
+_UUID_V7_BITS = (7 << 76) | (0x8000 << 48)
+
+def _format_uuid(value: int) -> str:
+    """Forma canonica 8-4-4-4-12 di un UUID dato come intero a 128 bit."""
+    h = "%032x" % value
+    return f"{h[:8]}-{h[8:12]}-{h[12:16]}-{h[16:20]}-{h[20:]}"
 
 class UUIDGenerator(FieldGenerator):
-    """Generatore per UUID."""
-    def generate(self) -> str:
-        #return str(uuid.uuid4())
-        return fake.uuid4()
+    """
+    Generatore per UUID, direttamente dai bit della sorgente casuale (niente proxy Faker).
+    - version 4 (default): 122 bit casuali, stessi valori di fake.uuid4() a parità di seed;
+    - version 7: prefisso di 48 bit con il timestamp Unix in millisecondi seguito da un
+      contatore di 12 bit, quindi crescenti nell'ordine di generazione (indicizzano meglio
+      come chiavi primarie). Il prefisso dipende dall'orologio: solo i 62 bit finali
+      sono riproducibili con il seed.
+    """
+    VERSIONS = (4, 7)
+
+    def __init__(self, field_name: str, field_props: dict):
+        super().__init__(field_name, field_props)
+        self.version = field_props.get("version", 4)
+        if self.version not in self.VERSIONS:
+            raise ValueError(f"Versione UUID non supportata: {self.version}")
+        # Prossima posizione libera del clock v7: (millisecondi << 12) | contatore
+        self._clock = 0
+
+    def _claim(self, k: int) -> int:
+        """Riserva k posizioni consecutive del clock v7 e restituisce la prima."""
+        start = max(self._clock, (time.time_ns() // 1_000_000) << 12)
+        self._clock = start + k
+        return start
+
+    def generate(self, rng: Optional[RandomSource] = None) -> str:
+        rng = rng or default_source()
+        if self.version == 4:
+            value = rng.getrandbits(128) & _UUID_VERSION_MASK & _UUID_VARIANT_MASK
+            return _format_uuid(value | _UUID_V4_BITS)
+        position = self._claim(1)
+        value = ((position >> 12) << 80) | ((position & 0xFFF) << 64) | rng.getrandbits(62)
+        return _format_uuid(value | _UUID_V7_BITS)
+
+    def generate_column(self, n: int, np_rng, rng: Optional[RandomSource] = None) -> list:
+        import numpy as np
+        if n <= 0:
+            return []
+        # 16 byte casuali per valore, poi versione e variante mascherate sull'intero blocco
+        raw = np.frombuffer(np_rng.bytes(16 * n), dtype=np.uint8).reshape(n, 16).copy()
+        raw[:, 6] = (raw[:, 6] & 0x0F) | (self.version << 4)
+        raw[:, 8] = (raw[:, 8] & 0x3F) | 0x80
+        if self.version == 7:
+            positions = self._claim(n) + np.arange(n, dtype=np.uint64)
+            millis = positions >> np.uint64(12)
+            for i in range(6):
+                raw[:, i] = (millis >> np.uint64(8 * (5 - i))) & np.uint64(0xFF)
+            raw[:, 6] = (raw[:, 6] & 0xF0) | ((positions >> np.uint64(8)) & np.uint64(0x0F))
+            raw[:, 7] = positions & np.uint64(0xFF)
+        h = raw.tobytes().hex()
+        return [f"{h[i:i + 8]}-{h[i + 8:i + 12]}-{h[i + 12:i + 16]}-{h[i + 16:i + 20]}-{h[i + 20:i + 32]}"
+                for i in range(0, 32 * n, 32)]
+
+class AliasTable:
+    """
+    Tabella alias (metodo di Vose) per l'estrazione pesata: costruita una volta dai pesi,
+    ogni estrazione costa O(1) e consuma un solo numero casuale.
+    Le opzioni con peso nullo sono escluse e non vengono mai estratte.
+    """
+    __slots__ = ("values", "prob", "alias")
+
+    def __init__(self, values: list, weights: Optional[list] = None):
+        values = list(values)
+        if weights is None:
+            weights = [1] * len(values)
+        if len(weights) != len(values):
+            raise ValueError(f"Numero di pesi ({len(weights)}) diverso dal numero di opzioni ({len(values)}).")
+        if any(w < 0 for w in weights):
+            raise ValueError("I pesi non possono essere negativi.")
+        kept = [(v, float(w)) for v, w in zip(values, weights) if w > 0]
+        if values and not kept:
+            raise ValueError("Almeno un peso deve essere maggiore di zero.")
+
+        n = len(kept)
+        total = sum(w for _, w in kept)
+        scaled = [w * n / total for _, w in kept]
+        prob = [1.0] * n
+        alias = list(range(n))
+        small = [i for i, p in enumerate(scaled) if p < 1.0]
+        large = [i for i, p in enumerate(scaled) if p >= 1.0]
+        while small and large:
+            s, l = small.pop(), large.pop()
+            prob[s], alias[s] = scaled[s], l
+            scaled[l] += scaled[s] - 1.0
+            (small if scaled[l] < 1.0 else large).append(l)
+        # Gli indici rimasti (solo per errori di arrotondamento) tengono probabilità 1
+
+        self.values = [v for v, _ in kept]
+        self.prob = prob
+        self.alias = alias
+
+    def sample(self, rng) -> Any:
+        u = rng.random() * len(self.values)
+        i = int(u)
+        return self.values[i] if u - i < self.prob[i] else self.values[self.alias[i]]
+
+    def sample_many(self, k: int, rng) -> list:
+        values, prob, alias, random = self.values, self.prob, self.alias, rng.random
+        n = len(values)
+        out = []
+        append = out.append
+        for _ in range(k):
+            u = random() * n
+            i = int(u)
+            append(values[i] if u - i < prob[i] else values[alias[i]])
+        return out
+
+    def sample_column(self, k: int, np_rng) -> list:
+        import numpy as np
+        n = len(self.values)
+        u = np_rng.random(k) * n
+        idx = np.minimum(u.astype(np.int64), n - 1)
+        idx = np.where(u - idx < np.asarray(self.prob)[idx], idx, np.asarray(self.alias)[idx])
+        values = self.values
+        return [values[i] for i in idx.tolist()]
 
 class ChoiceGenerator(FieldGenerator):
-    """Generatore per scelta casuale da una lista di opzioni."""
-    def generate(self) -> Any:
-        options = self.props.get("options", [])
-        if not options:
+    """
+    Generatore per scelta casuale da una lista di opzioni.
+    I pesi (opzionali) sono preelaborati alla costruzione in una AliasTable.
+    """
+    def __init__(self, field_name: str, field_props: dict):
+        super().__init__(field_name, field_props)
+        self.options = list(field_props.get("options", []))
+        self.weights = field_props.get("weights")
+        self.table = AliasTable(self.options, self.weights) if self.options else None
+
+    def generate(self, rng: Optional[RandomSource] = None) -> Any:
+        if self.table is None:
             return None
-        weights = self.props.get("weights", [1] * len(options))
-        return random.choices(options, weights=weights, k=1)[0]
+        return self.table.sample(rng or default_source())
+
+    def generate_many(self, k: int, rng: Optional[RandomSource] = None) -> list:
+        """k valori in un colpo solo, identici a k chiamate successive di generate(rng)."""
+        if self.table is None:
+            return [None] * k
+        return self.table.sample_many(k, rng or default_source())
+
+    def generate_column(self, n: int, np_rng, rng: Optional[RandomSource] = None) -> list:
+        if self.table is None:
+            return [None] * n
+        return self.table.sample_column(n, np_rng)
 
 class FloatGenerator(FieldGenerator):
     """Generatore per numeri float."""
-    def generate(self) -> float:
-        min_v = self.props.get("min_value", 0.0)
-        max_v = self.props.get("max_value", 1.0)
-        dec = self.props.get("decimal_places", 2)
-        value = random.uniform(min_v, max_v)
-        return round(value, dec)
+    def __init__(self, field_name: str, field_props: dict):
+        super().__init__(field_name, field_props)
+        self.min_v = field_props.get("min_value", 0.0)
+        self.max_v = field_props.get("max_value", 1.0)
+        self.dec = field_props.get("decimal_places", 2)
+
+    def generate(self, rng: Optional[RandomSource] = None) -> float:
+        rng = rng or default_source()
+        value = rng.uniform(self.min_v, self.max_v)
+        return round(value, self.dec)
+
+    def generate_column(self, n: int, np_rng, rng: Optional[RandomSource] = None) -> list:
+        return np_rng.uniform(self.min_v, self.max_v, size=n).round(self.dec).tolist()
+
+# Metodo Faker usato quando il formato richiesto non è disponibile
+FALLBACK_METHOD = "word"
+
+def resolve_faker_method(method_name: Optional[str]) -> Optional[str]:
+    """
+    Verifica una sola volta (alla compilazione) che method_name sia un metodo di un
+    provider Faker invocabile senza argomenti. Restituisce il nome se valido, altrimenti None.
+    Il metodo non viene chiamato: metodi di Faker come seed_instance modificherebbero
+    l'istanza condivisa, quindi si accettano solo i metodi dei provider, dalla firma.
+    """
+    if not method_name or method_name.startswith("_"):
+        return None
+    from faker.providers import BaseProvider
+    try:
+        faker_func = getattr(default_source().fake, method_name, None)
+    except Exception:
+        # Alcuni attributi di Faker sollevano errore all'accesso (es. seed)
+        return None
+    if not callable(faker_func) or not isinstance(getattr(faker_func, "__self__", None), BaseProvider):
+        return None
+    try:
+        parameters = inspect.signature(faker_func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    required = (inspect.Parameter.POSITIONAL_ONLY, inspect.Parameter.POSITIONAL_OR_KEYWORD,
+                inspect.Parameter.KEYWORD_ONLY)
+    if any(p.kind in required and p.default is inspect.Parameter.empty for p in parameters):
+        # Il metodo esiste ma non è invocabile così com'è (argomenti obbligatori)
+        return None
+    return method_name
 
 class StringGenerator(FieldGenerator):
     """
     Generatore per stringhe, con supporto dinamico completo a Faker.
     Supporta sia i formati standard JSON Schema che i metodi diretti di Faker.
+    Il metodo viene risolto alla costruzione: i formati sconosciuti o non invocabili
+    ricadono esplicitamente su FALLBACK_METHOD (fallback=True).
+    Se la sorgente porta un pool di valori precalcolati per il metodo, i valori
+    vengono estratti dal pool invece di invocare Faker.
     """
-    def generate(self) -> str:
-        # 1. Recupera la chiave di formato
-        method_name = self.props.get("faker") or self.props.get("format") or self.props.get("generator")
+    def __init__(self, field_name: str, field_props: dict):
+        super().__init__(field_name, field_props)
+        # 1. Chiave di formato richiesta dallo schema
+        self.method_name = field_props.get("faker") or field_props.get("format") or field_props.get("generator")
+        # 2. Metodo Faker effettivamente usato
+        resolved = resolve_faker_method(self.method_name)
+        self.faker_method = resolved or FALLBACK_METHOD
+        self.fallback = bool(self.method_name) and resolved is None
+        # Metodo già legato all'ultima istanza Faker vista: (faker, callable)
+        self._bound = None
 
-        # Fallback rapido se nullo
-        if not method_name:
-            return fake.word()
+    def generate(self, rng: Optional[RandomSource] = None) -> str:
+        rng = rng or default_source()
+        pool = rng.pools.get(self.faker_method)
+        if pool is not None:
+            return pool.sample(rng)
 
-        # 2. Dispatch Dinamico
-        if hasattr(fake, method_name):
-            try:
-                faker_func = getattr(fake, method_name)
-                return str(faker_func())
-            except Exception:
-                # Fallback se il metodo Faker fallisce (es. argomenti mancanti)
-                return fake.word()
+        # Nessuna reflection per valore: il callable viene ricalcolato solo
+        # quando cambia l'istanza Faker (cioè l'engine/sorgente)
+        bound = self._bound
+        if bound is None or bound[0] is not rng.fake:
+            bound = self._bound = (rng.fake, getattr(rng.fake, self.faker_method))
+        try:
+            return str(bound[1]())
+        except Exception:
+            # Fallback se il metodo Faker fallisce su un valore specifico
+            return rng.fake.word()
 
-        # 3. Fallback finale (metodo non trovato)
-        return fake.word()
+    def generate_column(self, n: int, np_rng, rng: Optional[RandomSource] = None) -> list:
+        rng = rng or default_source()
+        pool = rng.pools.get(self.faker_method)
+        if pool is not None:
+            # Estrazione vettorizzata degli indici dal pool
+            return pool.sample_column(n, np_rng)
+        return super().generate_column(n, np_rng, rng)
 
 class ObjectGenerator(FieldGenerator):
-    """Generatore per oggetti annidati."""
-    def generate(self) -> Dict[str, Any]:
-        fields = self.props.get("fields", {})
-        result = {}
-        for fname, fprops in fields.items():
-            gen = get_generator(fname, fprops)
-            result[fname] = gen.generate()
-        return result
+    """
+    Generatore per oggetti annidati.
+    I generatori dei sotto-campi vengono compilati una sola volta alla costruzione.
+    """
+    def __init__(self, field_name: str, field_props: dict):
+        super().__init__(field_name, field_props)
+        fields = field_props.get("fields", {})
+        self.children = tuple(
+            (fname, get_generator(fname, fprops)) for fname, fprops in fields.items()
+        )
+
+    def generate(self, rng: Optional[RandomSource] = None) -> Dict[str, Any]:
+        rng = rng or default_source()
+        return {fname: gen.generate(rng) for fname, gen in self.children}
+
+    def generate_column(self, n: int, np_rng, rng: Optional[RandomSource] = None) -> list:
+        if not self.children:
+            return [{} for _ in range(n)]
+        names = [fname for fname, _ in self.children]
+        columns = [gen.generate_column(n, np_rng, rng) for _, gen in self.children]
+        return [dict(zip(names, row)) for row in zip(*columns)]
 
 class ArrayGenerator(FieldGenerator):
     """Generatore per array di elementi."""
-    def generate(self) -> list:
-        min_items = self.props.get("min_items", 1)
-        max_items = self.props.get("max_items", 5)
+    def __init__(self, field_name: str, field_props: dict):
+        super().__init__(field_name, field_props)
+        self.min_items = field_props.get("min_items", 1)
+        self.max_items = field_props.get("max_items", 5)
 
         # Assicura che max non sia minore di min
-        if max_items < min_items:
-            max_items = min_items
-
-        n = random.randint(min_items, max_items)
-        item_type = self.props.get("item_type")
-        item_options = self.props.get("item_options", [])
-        result = []
-        if item_type == "string" and item_options:
-            result = random.sample(item_options, k=n)
-        # Caso generico: Usiamo la factory per creare gli item
+        if self.max_items < self.min_items:
+            self.max_items = self.min_items
+
+        item_type = field_props.get("item_type")
+        self.item_options = field_props.get("item_options", [])
+        self.sample_options = item_type == "string" and bool(self.item_options)
+        # Caso generico: Usiamo la factory per creare il generatore degli item
         # Questo è molto più potente: permette array di oggetti, di interi, etc.
-        elif item_type:
+        self.item_generator = None
+        if item_type and not self.sample_options:
             # Creiamo una "property" fittizia per l'item
-            item_props = {"type": item_type}
-            # Passiamo eventuali altre proprietà dell'item se presenti nello schema
+            self.item_generator = get_generator("item", {"type": item_type})
+        # Elementi distinti all'interno di ogni array (rng.sample lo garantisce già per item_options)
+        self.unique_items = bool(field_props.get("unique_items", field_props.get("uniqueItems", False)))
+
+    def _item(self, rng: RandomSource) -> Any:
+        if self.item_generator is not None:
+            return self.item_generator.generate(rng)
+        return rng.fake.word()
 
-            generator = get_generator("item", item_props)
-            for _ in range(n):
-                result.append(generator.generate())
-        else:
-            for _ in range(n):
-                result.append(fake.word())
-        return result
+    def generate(self, rng: Optional[RandomSource] = None) -> list:
+        rng = rng or default_source()
+        n = rng.randint(self.min_items, self.max_items)
+        if self.sample_options:
+            return rng.sample(self.item_options, k=n)
+        if not self.unique_items:
+            return [self._item(rng) for _ in range(n)]
+
+        items, seen, retries = [], set(), 0
+        while len(items) < n:
+            value = self._item(rng)
+            key = value_key(value)
+            if key not in seen:
+                seen.add(key)
+                items.append(value)
+            elif retries == DEFAULT_MAX_RETRIES:
+                raise UniquenessError(
+                    f"Campo '{self.name}': impossibile ottenere {n} elementi distinti "
+                    f"({len(items)} trovati in {DEFAULT_MAX_RETRIES} tentativi extra).")
+            else:
+                retries += 1
+        return items
 
 class IntegerGenerator(FieldGenerator):
     """Generatore per numeri interi."""
-    def generate(self) -> int:
-        min_v = self.props.get("min_value", 0)
-        max_v = self.props.get("max_value", 100)
-        return random.randint(min_v, max_v)
+    def __init__(self, field_name: str, field_props: dict):
+        super().__init__(field_name, field_props)
+        self.min_v = field_props.get("min_value", 0)
+        self.max_v = field_props.get("max_value", 100)
+
+    def generate(self, rng: Optional[RandomSource] = None) -> int:
+        rng = rng or default_source()
+        return rng.randint(self.min_v, self.max_v)
+
+    def generate_column(self, n: int, np_rng, rng: Optional[RandomSource] = None) -> list:
+        return np_rng.integers(self.min_v, self.max_v, size=n, endpoint=True).tolist()
+
+class NullGenerator(FieldGenerator):
+    """
+    Generatore segnaposto per i campi che non è stato possibile compilare
+    (es. tipo non supportato): produce sempre None.
+    """
+    def generate(self, rng: Optional[RandomSource] = None) -> None:
+        return None
+
+    def generate_column(self, n: int, np_rng, rng: Optional[RandomSource] = None) -> list:
+        return [None] * n
+
+class UniqueGenerator(FieldGenerator):
+    """
+    Vincolo di unicità (chiave "unique" del campo) attorno a un altro generatore:
+    i duplicati vengono rigenerati fino a max_retries volte, poi si solleva UniquenessError.
+    "unique" può essere true oppure un oggetto con mode (auto, exact, bloom), capacity,
+    error_rate e max_retries (vedi UniqueSet). I valori già emessi sono tenuti nella
+    sorgente casuale (rng.unique), quindi l'unicità vale per singolo engine.
+    """
+    def __init__(self, field_name: str, field_props: dict, inner: FieldGenerator):
+        super().__init__(field_name, field_props)
+        options = field_props.get("unique")
+        options = options if isinstance(options, dict) else {}
+        self.inner = inner
+        self.mode = options.get("mode", "auto")
+        self.capacity = options.get("capacity", DEFAULT_CAPACITY)
+        self.error_rate = options.get("error_rate", DEFAULT_ERROR_RATE)
+        self.max_retries = options.get("max_retries", DEFAULT_MAX_RETRIES)
+        check_options(self.mode, self.capacity, self.error_rate)
+
+    def _seen(self, rng: RandomSource) -> UniqueSet:
+        seen = rng.unique.get(self)
+        if seen is None:
+            seen = rng.unique[self] = UniqueSet(self.mode, self.capacity, self.error_rate)
+        return seen
+
+    def _retry(self, rng: RandomSource, seen: UniqueSet) -> Any:
+        for _ in range(self.max_retries):
+            value = self.inner.generate(rng)
+            if seen.add(value):
+                return value
+        raise UniquenessError(
+            f"Campo '{self.name}': nessun valore nuovo in {self.max_retries} tentativi dopo "
+            f"{len(seen)} valori univoci (spazio dei valori esaurito?).")
+
+    def generate(self, rng: Optional[RandomSource] = None) -> Any:
+        rng = rng or default_source()
+        seen = self._seen(rng)
+        value = self.inner.generate(rng)
+        return value if seen.add(value) else self._retry(rng, seen)
+
+    def generate_column(self, n: int, np_rng, rng: Optional[RandomSource] = None) -> list:
+        rng = rng or default_source()
+        seen = self._seen(rng)
+        column = self.inner.generate_column(n, np_rng, rng)
+        for i, value in enumerate(column):
+            if not seen.add(value):
+                column[i] = self._retry(rng, seen)
+        return column
+
+# Mapping diretto tipo -> classe generatore
+GENERATORS_MAP = {
+    "uuid": UUIDGenerator,
+    "choice": ChoiceGenerator,
+    "float": FloatGenerator,
+    "integer": IntegerGenerator,
+    "string": StringGenerator,
+    "object": ObjectGenerator,
+    "array": ArrayGenerator
+}
 
 def get_generator(field_name: str, field_props: dict) -> FieldGenerator:
     """Factory per ottenere il generatore corretto in base al tipo di campo."""
     t = field_props.get("type")
-    # Mapping diretto
-    generators_map = {
-        "uuid": UUIDGenerator,
-        "choice": ChoiceGenerator,
-        "float": FloatGenerator,
-        "integer": IntegerGenerator,
-        "string": StringGenerator,
-        "object": ObjectGenerator,
-        "array": ArrayGenerator
-    }
-    gen_class = generators_map.get(t)
+    gen_class = GENERATORS_MAP.get(t)
     if gen_class:
-        return gen_class(field_name, field_props)
+        gen = gen_class(field_name, field_props)
+        if field_props.get("unique"):
+            return UniqueGenerator(field_name, field_props, gen)
+        return gen
 
     raise ValueError(f"Tipo non supportato: {t}")
-
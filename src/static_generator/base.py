@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 
 class BaseGenerator(ABC):
     """
@@ -25,5 +25,19 @@ class FieldGenerator(BaseGenerator):
         self.name = field_name
         self.props = field_props
 
-    def generate(self, schema: Dict[str, Any] = None, context: Optional[str] = None) -> Any:
-        raise NotImplementedError("Implementare il metodo generate.")
\ No newline at end of file
+    def generate(self, rng=None) -> Any:
+        """
+        Genera un valore per il campo.
+        Args:
+            rng: (Opzionale) Sorgente di casualità (RandomSource) con l'istanza Faker collegata.
+                 Se assente, i generatori usano la sorgente di default del modulo.
+        """
+        raise NotImplementedError("Implementare il metodo generate.")
+
+    def generate_column(self, n: int, np_rng, rng=None) -> List[Any]:
+        """
+        Genera n valori in un colpo solo (modalità colonnare).
+        Implementazione di default: un valore alla volta tramite generate().
+        I generatori vettorizzabili la sovrascrivono usando np_rng (numpy.random.Generator).
+        """
+        return [self.generate(rng) for _ in range(n)]
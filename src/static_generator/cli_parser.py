@@ -1,4 +1,22 @@
 import argparse
+import re
+
+# Moltiplicatori per --shard-size espresso in byte
+_SIZE_UNITS = {"B": 1, "KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def parse_shard_size(value):
+    """
+    Tipo argparse per --shard-size: "N" = N record per shard, "N[B|KB|MB|GB]" = byte.
+    Restituisce la coppia (unità, quantità) con unità 'records' o 'bytes'.
+    """
+    match = re.fullmatch(r"\s*(\d+)\s*([KMG]?B)?\s*", str(value), re.IGNORECASE)
+    if not match or int(match.group(1)) < 1:
+        raise argparse.ArgumentTypeError(f"invalid shard size: {value!r} (use N records or N[B|KB|MB|GB])")
+    amount, unit = int(match.group(1)), match.group(2)
+    if unit is None:
+        return ("records", amount)
+    return ("bytes", amount * _SIZE_UNITS[unit.upper()])
 
 
 def parse_arguments(argv=None):
@@ -21,16 +39,43 @@ def parse_arguments(argv=None):
                         help="Number of records to generate")
     parser.add_argument('--seed', type=int, default=None,
                         help="Seed for deterministic generation")
+    parser.add_argument('--columnar', action='store_true',
+                        help="Generate whole columns at once with NumPy (faster for large counts)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Generate in parallel on N processes (same output as serial generation for a given --seed)")
+    parser.add_argument('--faker-pool', type=int, default=None, metavar='N',
+                        help="Sample string values from pools of N precomputed Faker values (cached on disk)")
+    parser.add_argument('--pool-cache', type=str, default=None, metavar='DIR',
+                        help="Directory for the Faker value pool cache (default: $MOCKGEN_POOL_CACHE or ~/.cache/mockgen/pools)")
 
     # Configurazione output
     parser.add_argument('--out', type=str, default=None,
-                        help="Output file path (default: stdout)")
+                        help="Output file path (default: stdout; required by the sqlite and parquet formats)")
+    parser.add_argument('--shard-size', type=parse_shard_size, default=None, metavar='N[UNIT]',
+                        help="Split --out into numbered shard files of N records (or N B/KB/MB/GB) "
+                             "plus a JSON manifest; byte-sized SQL shards write one row per INSERT")
+    parser.add_argument('--compress-workers', type=int, default=None, metavar='N',
+                        help="Compress .gz output on N threads as a multi-member gzip "
+                             "(.gz/.bz2/.xz output is always compressed on a background thread)")
     parser.add_argument('--format',
-                        type=str, choices=['json', 'csv', 'ndjson', 'sql'],
+                        type=str, choices=['json', 'csv', 'ndjson', 'sql', 'sqlite', 'parquet'],
                         default='json',
                         help="Output format")
+    parser.add_argument('--compact', action='store_true',
+                        help="Compact JSON/NDJSON output (no indentation or spaces)")
+    parser.add_argument('--json-backend', type=str, choices=['auto', 'stdlib', 'orjson'], default='stdlib',
+                        help="JSON serializer: stdlib (default, identical to json.dump), orjson "
+                             "when installed (auto) or orjson (faster; floats may be written differently)")
+    parser.add_argument('--csv-arrays', type=str, choices=['json', 'join'], default='json',
+                        help="How arrays are written in CSV cells: as JSON or joined with '|' (only for CSV format)")
     parser.add_argument('--table-name', type=str, default='my_table',
-                        help="Target table name (only for SQL format)")
+                        help="Target table name (only for SQL and SQLite formats)")
+    parser.add_argument('--sql-mode', type=str, choices=['insert', 'multi', 'copy', 'sqlite'],
+                        default='insert',
+                        help="SQL output style: one INSERT per row, multi-row INSERTs, PostgreSQL COPY, "
+                             "or multi-row INSERTs in a single transaction (only for SQL format)")
+    parser.add_argument('--sql-batch', type=int, default=None, metavar='N',
+                        help="Rows per INSERT statement in 'multi' and 'sqlite' modes (default: 500)")
 
     parser.add_argument('--verbose', action='store_true',
                         help="Enable verbose logging")
@@ -0,0 +1,142 @@
+import bz2
+import gzip
+import io
+import lzma
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+# Estensione del file di output -> algoritmo di compressione
+COMPRESSION_SUFFIXES = {".gz": "gzip", ".bz2": "bz2", ".xz": "xz"}
+
+
+def compression_for(path: str) -> Optional[str]:
+    """Restituisce l'algoritmo di compressione dedotto dall'estensione di path (None se assente)."""
+    return COMPRESSION_SUFFIXES.get(os.path.splitext(path)[1].lower())
+
+
+class CompressedTextWriter(io.TextIOBase):
+    """
+    Stream di testo che scrive un file compresso (gzip, bz2 o xz).
+    Il testo viene accumulato in blocchi da BLOCK_SIZE caratteri e passato, tramite
+    una coda limitata, a un thread in background che comprime e scrive su disco:
+    generazione e compressione procedono in parallelo con memoria costante.
+
+    Con workers > 1 (solo gzip) i blocchi vengono compressi in parallelo come membri
+    gzip indipendenti e concatenati in ordine: il file resta un gzip valido.
+    """
+    # Caratteri per blocco passato al thread di compressione
+    BLOCK_SIZE = 1 << 20
+    # Blocchi in attesa nella coda (limite alla memoria usata)
+    QUEUE_SIZE = 8
+
+    def __init__(self, path: str, method: str, workers: int = None, level: int = None, encoding: str = "utf-8"):
+        if method not in COMPRESSION_SUFFIXES.values():
+            raise ValueError(f"Compressione non supportata: {method}")
+        super().__init__()
+        self.path = path
+        self.method = method
+        self.workers = workers if method == "gzip" and workers and workers > 1 else None
+        self.level = level
+        self._encoding = encoding
+        self._pending = []
+        self._pending_size = 0
+        self._error = None
+        self._raw = open(path, "wb")
+        self._queue = queue.Queue(maxsize=self.QUEUE_SIZE)
+        self._thread = threading.Thread(target=self._run, name="mockgen-compressor", daemon=True)
+        self._thread.start()
+
+    @property
+    def encoding(self) -> str:
+        return self._encoding
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, text: str) -> int:
+        if self.closed:
+            raise ValueError("Scrittura su uno stream chiuso.")
+        self._check_error()
+        self._pending.append(text)
+        self._pending_size += len(text)
+        if self._pending_size >= self.BLOCK_SIZE:
+            self._submit_pending()
+        return len(text)
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._submit_pending()
+            self._put(None)
+            self._thread.join()
+        finally:
+            self._raw.close()
+            super().close()
+        self._check_error()
+
+    # --- HELPER PRIVATI ---
+
+    def _submit_pending(self) -> None:
+        if not self._pending:
+            return
+        block = "".join(self._pending).encode(self._encoding)
+        self._pending = []
+        self._pending_size = 0
+        self._put(block)
+
+    def _put(self, item) -> None:
+        # Attesa a intervalli: se il thread muore per un errore la coda non si svuota più
+        while True:
+            try:
+                self._queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                self._check_error()
+
+    def _check_error(self) -> None:
+        if self._error is not None:
+            raise self._error
+
+    def _blocks(self):
+        while True:
+            block = self._queue.get()
+            if block is None:
+                return
+            yield block
+
+    def _open_compressor(self):
+        if self.method == "gzip":
+            # mtime fisso: a parità di seed il file compresso è identico
+            return gzip.GzipFile(filename="", fileobj=self._raw, mode="wb",
+                                 compresslevel=self.level or 6, mtime=0)
+        if self.method == "bz2":
+            return bz2.BZ2File(self._raw, mode="wb", compresslevel=self.level or 9)
+        return lzma.LZMAFile(self._raw, mode="wb", preset=self.level)
+
+    def _run(self) -> None:
+        """Corpo del thread di compressione."""
+        try:
+            if self.workers:
+                self._run_parallel_gzip()
+            else:
+                with self._open_compressor() as compressor:
+                    for block in self._blocks():
+                        compressor.write(block)
+        except BaseException as e:
+            self._error = e
+
+    def _run_parallel_gzip(self) -> None:
+        level = self.level or 6
+        with ThreadPoolExecutor(max_workers=self.workers) as pool:
+            pending = deque()
+            for block in self._blocks():
+                pending.append(pool.submit(gzip.compress, block, level, mtime=0))
+                if len(pending) >= self.workers * 2:
+                    self._raw.write(pending.popleft().result())
+            while pending:
+                self._raw.write(pending.popleft().result())
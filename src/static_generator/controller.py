@@ -3,6 +3,8 @@ import os
 import logging
 from .engine import MockEngine
 from .exporter import DataExporter
+from .compression import CompressedTextWriter, compression_for
+from .sharding import manifest_path, write_sharded
 
 # Otteniamo il logger configurato nel main
 logger = logging.getLogger(__name__)
@@ -18,17 +20,90 @@ def run_generation_process(args):
     logger.info(f"Caricamento schema da: {args.schema}")
 
     try:
-        engine = MockEngine(schema_path=args.schema, seed=args.seed)
+        engine = MockEngine(
+            schema_path=args.schema,
+            seed=args.seed,
+            pool_size=args.faker_pool,
+            pool_cache_dir=args.pool_cache
+        )
         logger.debug(f"Engine inizializzato. Seed: {args.seed}")
 
+        # Formati Faker non risolti: segnalati una volta sola, non a ogni valore
+        fallbacks = engine.faker_fallbacks
+        if fallbacks:
+            details = ", ".join(f"{path} ({fmt})" for path, fmt in fallbacks.items())
+            logger.warning(f"{len(fallbacks)} campi con formato Faker non valido, verrà usato 'word': {details}")
+
+        # I record vengono generati in streaming durante l'export: nessuna lista in memoria
         logger.info(f"Generazione di {args.count} record...")
-        data = engine.generate(n=args.count)
-        logger.debug(f"Generazione completata. {len(data)} record creati in memoria.")
+        if args.shard_size:
+            # Con l'output a shard ogni shard genera il proprio intervallo di record
+            data = None
+        elif args.workers:
+            logger.debug(f"Generazione parallela su {args.workers} processi")
+            data = engine.iter_parallel(n=args.count, workers=args.workers, columnar=args.columnar)
+        else:
+            data = engine.iter_records(n=args.count, columnar=args.columnar)
 
     except Exception as e:
         logger.error(f"Errore durante la generazione: {e}")
         raise e
 
+    # Output suddiviso in shard numerati + manifest
+    if args.shard_size:
+        if not args.out:
+            raise ValueError("--shard-size richiede --out con il percorso base degli shard.")
+        unit, size = args.shard_size
+        try:
+            logger.debug(f"Scrittura a shard da {size} {unit}: {args.out}")
+            manifest = write_sharded(
+                engine,
+                n=args.count,
+                path=args.out,
+                format_type=args.format,
+                shard_records=size if unit == "records" else None,
+                shard_bytes=size if unit == "bytes" else None,
+                workers=args.workers,
+                columnar=args.columnar,
+                compress_workers=args.compress_workers,
+                table_name=args.table_name,
+                sql_mode=args.sql_mode,
+                sql_batch_size=args.sql_batch,
+                compact=args.compact,
+                json_backend=args.json_backend,
+                csv_arrays=args.csv_arrays
+            )
+            logger.info(f"Esportazione completata con successo: {len(manifest['shards'])} shard, "
+                        f"manifest in {manifest_path(args.out)}.")
+        except Exception as e:
+            logger.error(f"Errore durante l'export: {e}")
+            raise e
+        return
+
+    # Export diretto su database SQLite o file Parquet: nessuno stream di testo
+    if args.format in ("sqlite", "parquet"):
+        if not args.out:
+            raise ValueError(f"Il formato {args.format} richiede --out con il percorso di destinazione.")
+        output_dir = os.path.dirname(args.out)
+        if output_dir:
+            os.makedirs(output_dir, exist_ok=True)
+        try:
+            logger.debug(f"Scrittura diretta in formato {args.format}: {args.out}")
+            if args.format == "sqlite":
+                rows = DataExporter.export_sqlite(
+                    data=data,
+                    db_path=args.out,
+                    table_name=args.table_name,
+                    fields=engine.fields
+                )
+            else:
+                rows = DataExporter.export_parquet(data=data, path=args.out, fields=engine.fields)
+            logger.info(f"Esportazione completata con successo: {rows} record in {args.out}.")
+        except Exception as e:
+            logger.error(f"Errore durante l'export: {e}")
+            raise e
+        return
+
     # 2. Gestione Stream di Output
     output_stream = sys.stdout
     file_handle = None
@@ -39,9 +114,15 @@ def run_generation_process(args):
         if output_dir:  # Se args.out è "file.json", output_dir è "", quindi salta l'IF e non crasha
             os.makedirs(output_dir, exist_ok=True)
 
-        logger.debug(f"Apertura file di output: {args.out}")
       #  os.makedirs(os.path.dirname(args.out), exist_ok=True)
-        file_handle = open(args.out, "w", encoding='utf-8', newline='')
+        compression = compression_for(args.out)
+        if compression:
+            # .gz/.bz2/.xz: compressione su thread in background
+            logger.debug(f"Apertura file di output compresso ({compression}): {args.out}")
+            file_handle = CompressedTextWriter(args.out, compression, workers=args.compress_workers)
+        else:
+            logger.debug(f"Apertura file di output: {args.out}")
+            file_handle = open(args.out, "w", encoding='utf-8', newline='')
         output_stream = file_handle
     else:
         logger.debug("Output diretto su STDOUT")
@@ -53,7 +134,13 @@ def run_generation_process(args):
             data=data,
             format_type=args.format,
             output_stream=output_stream,
-            table_name=args.table_name
+            table_name=args.table_name,
+            sql_mode=args.sql_mode,
+            sql_batch_size=args.sql_batch,
+            compact=args.compact,
+            json_backend=args.json_backend,
+            fields=engine.fields,
+            csv_arrays=args.csv_arrays
         )
         logger.info("Esportazione completata con successo.")
     except Exception as e:
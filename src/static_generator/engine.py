@@ -1,46 +1,389 @@
-from typing import Any, Dict, List
-from .schema_parser import SchemaParser
-from .algorithmic import get_generator, fake
-from faker import Faker
+import os
 import random
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, NamedTuple, Tuple
+from .schema_parser import SchemaParser
+from .algorithmic import (get_generator, NullGenerator, ObjectGenerator, ArrayGenerator, StringGenerator,
+                          UniqueGenerator)
+from .base import FieldGenerator
+from .rng import CounterRandom, derive_seed, stream_key
+from .uniqueness import UniquenessError
+from .value_pool import ValuePoolCache
+
+
+class CompiledSchema(NamedTuple):
+    """
+    Schema già validato e compilato: può essere condiviso tra più engine
+    (i generatori non hanno stato legato a un engine, la casualità arriva da rng).
+    """
+    parser: SchemaParser
+    fields: Dict[str, Any]
+    plan: Tuple[Tuple[str, FieldGenerator], ...]
+
+
+def _generate_shard(schema: dict, seed: int, start: int, stop: int, columnar: bool,
+                    pool_size: int = None, pool_cache_dir: str = None) -> List[Dict[str, Any]]:
+    """
+    Task eseguito nei processi worker: genera i record [start, stop) con un engine
+    dedicato. Grazie agli stream counter-based lo shard non dipende dagli altri.
+    Deve restare una funzione di modulo per poter essere serializzata dal pool.
+    """
+    engine = MockEngine(schema=schema, seed=seed, pool_size=pool_size, pool_cache_dir=pool_cache_dir)
+    return engine.generate_range(start, stop, columnar=columnar)
+
 
 class MockEngine:
     """
     Motore per la generazione di dati mock a partire da uno schema JSON.
+
+    Ogni valore è estratto da uno stream casuale counter-based identificato da
+    (seed, indice del record, percorso del campo): il record i dipende solo da questi
+    e può essere generato direttamente con record_at(i), senza generare i precedenti.
     """
-    def __init__(self, schema_path: str, seed: int = None):
-        # 1. Gestione del Seed: Se presente, rendiamo deterministici random e Faker
-        # Se l'utente (o il test) ci passa un numero come seed...
-        if seed is not None:
-            # 1. Blocchiamo il generatore nativo di Python
-            random.seed(seed)
+    # Numero di record generati per ogni blocco colonnare in iter_records(columnar=True)
+    STREAM_CHUNK_SIZE = 10_000
+    # Record per shard nella generazione parallela
+    PARALLEL_SHARD_SIZE = 10_000
 
-            # 2. Blocchiamo il generatore della libreria Faker
-            Faker.seed(seed)
+    def __init__(self, schema_path: str = None, seed: int = None, schema: dict = None,
+                 pool_size: int = None, pool_cache_dir: str = None, compiled: CompiledSchema = None):
+        # 1. Gestione del Seed: ogni engine ha la propria sorgente di casualità
+        # (random + Faker collegati allo stesso stato), senza toccare lo stato globale.
+        # Senza seed ne viene estratto uno casuale: l'output resta coerente tra
+        # record_at, generate_range e generazione parallela della stessa istanza.
+        self.seed = seed
+        self.master_seed = seed if seed is not None else random.SystemRandom().getrandbits(64)
+        self.rng = CounterRandom(self.master_seed)
+        # Indice del prossimo record prodotto da generate_record()/iter_records()
+        self._cursor = 0
+        # Ultimo blocco colonnare allineato generato: ((indice del blocco, dimensione), colonne)
+        self._column_block = None
 
-            # 3. Blocca l'istanza specifica usata in algorithmic.py
-            fake.seed_instance(seed)
+        # 2. Lo schema può arrivare da file, direttamente come dict oppure già
+        # compilato (es. dalla SchemaCache): in quest'ultimo caso niente parsing né validazione
+        if compiled is None:
+            compiled = self.compile_schema(schema_path=schema_path, schema=schema)
+        self.parser, self.fields, self.plan = compiled
+        # 3. Chiave base dello stream di ciascun campo del piano compilato
+        self._field_keys = tuple(derive_seed(self.master_seed, fname) for fname, _ in self.plan)
+        # Con campi univoci i valori dipendono dai record già generati: indice del
+        # prossimo record della sequenza (None se lo schema non ha vincoli di unicità)
+        self._unique_next = 0 if self.has_unique else None
 
-        self.parser = SchemaParser(schema_path)
-        self.fields = self.parser.get_fields()
+        # 4. Pool di valori Faker (opzionale): un pool per ogni metodo usato dallo schema
+        self.pool_size = pool_size
+        self.pool_cache_dir = pool_cache_dir
+        if pool_size:
+            self._load_pools(pool_size, pool_cache_dir)
 
-    def generate_record(self) -> Dict[str, Any]:
+    @classmethod
+    def compile_schema(cls, schema_path: str = None, schema: dict = None) -> CompiledSchema:
         """
-        Genera un singolo record mock.
+        Carica, valida e compila uno schema (da file o da dict) in un CompiledSchema
+        riutilizzabile per costruire più engine.
         """
-        record = {}
-        for fname, fprops in self.fields.items():
+        parser = SchemaParser(schema_path=schema_path, schema=schema)
+        fields = parser.get_fields()
+        return CompiledSchema(parser, fields, cls.compile(fields))
+
+    @staticmethod
+    def compile(fields: Dict[str, Any]) -> Tuple[Tuple[str, FieldGenerator], ...]:
+        """
+        Compila le proprietà dello schema in un piano di generazione immutabile:
+        una tupla di coppie (nome campo, generatore già costruito).
+        Oggetti annidati e item degli array vengono compilati ricorsivamente dai
+        rispettivi generatori. I campi non compilabili producono sempre None.
+        """
+        plan = []
+        for fname, fprops in fields.items():
             try:
                 gen = get_generator(fname, fprops)
-                record[fname] = gen.generate()
+            except Exception:
+                gen = NullGenerator(fname, fprops)
+            plan.append((fname, gen))
+        return tuple(plan)
+
+    @staticmethod
+    def _walk_generators(generators, prefix: str = ""):
+        """
+        Percorre ricorsivamente il piano (oggetti annidati, item degli array e
+        generatori avvolti da un vincolo di unicità) restituendo le coppie
+        (percorso del campo, generatore).
+        """
+        for fname, gen in generators:
+            path = f"{prefix}{fname}"
+            yield path, gen
+            if isinstance(gen, UniqueGenerator):
+                gen = gen.inner
+                yield path, gen
+            if isinstance(gen, ObjectGenerator):
+                yield from MockEngine._walk_generators(gen.children, f"{path}.")
+            elif isinstance(gen, ArrayGenerator) and gen.item_generator is not None:
+                yield from MockEngine._walk_generators([("[]", gen.item_generator)], path)
+
+    @staticmethod
+    def _string_generators(generators, prefix: str = ""):
+        """Coppie (percorso del campo, StringGenerator) del piano."""
+        for path, gen in MockEngine._walk_generators(generators, prefix):
+            if isinstance(gen, StringGenerator):
+                yield path, gen
+
+    @property
+    def has_unique(self) -> bool:
+        """
+        True se lo schema contiene campi con vincolo di unicità: i valori dipendono da
+        quelli già generati, quindi la generazione resta seriale in un unico engine.
+        """
+        return any(isinstance(gen, UniqueGenerator) for _, gen in self._walk_generators(self.plan))
+
+    @property
+    def faker_fallbacks(self) -> Dict[str, str]:
+        """
+        Campi stringa il cui formato non è un metodo Faker valido (percorso -> formato):
+        producono valori con FALLBACK_METHOD. Calcolato dal piano compilato, senza
+        alcun costo durante la generazione.
+        """
+        return {
+            path: gen.method_name
+            for path, gen in self._string_generators(self.plan)
+            if gen.fallback
+        }
+
+    def _load_pools(self, size: int, cache_dir: str = None) -> None:
+        """
+        Prepara i pool di valori (da cache su disco o generandoli) per i metodi Faker
+        dello schema (già risolti in compilazione, fallback compreso). I pool dipendono
+        solo da locale, metodo, seed e dimensione: esecuzioni ripetute con lo stesso
+        schema riusano i file in cache.
+        """
+        cache = ValuePoolCache(cache_dir)
+        pool_seed = self.seed if self.seed is not None else 0
+        methods = {gen.faker_method for _, gen in self._string_generators(self.plan)}
+        for method in sorted(methods):
+            try:
+                self.rng.pools[method] = cache.get(self.rng.locale, method, pool_seed, size)
+            except Exception:
+                continue
+
+    def generate_record(self, index: int = None) -> Dict[str, Any]:
+        """
+        Genera un singolo record mock eseguendo il piano compilato.
+        Senza index produce il prossimo record della sequenza dell'engine.
+        """
+        sequential = index is None
+        if sequential:
+            index = self._cursor
+        self._advance_unique(index, 1)
+        if sequential:
+            self._cursor += 1
+        rng = self.rng
+        record = {}
+        for (fname, gen), key in zip(self.plan, self._field_keys):
+            rng.seek(stream_key(key, index))
+            try:
+                record[fname] = gen.generate(rng)
+            except UniquenessError:
+                raise
             except Exception as e:
                 record[fname] = None
         return record
 
+    def _advance_unique(self, start: int, n: int) -> None:
+        """
+        Con campi univoci i record si possono generare solo in sequenza, una volta sola:
+        ValueError se [start, start + n) non prosegue quelli già generati da questo engine.
+        """
+        if self._unique_next is None:
+            return
+        if start != self._unique_next:
+            raise ValueError(
+                f"Lo schema ha campi univoci: i record vanno generati in sequenza senza ripetizioni "
+                f"(richiesto l'indice {start}, atteso {self._unique_next}). Usare un nuovo engine.")
+        self._unique_next += n
+
+    def record_at(self, index: int) -> Dict[str, Any]:
+        """
+        Restituisce il record in posizione index (a partire da 0) in tempo O(1):
+        è identico all'index-esimo record prodotto da generate() con lo stesso seed.
+        Con campi univoci (has_unique) l'accesso diretto non è possibile: è ammesso
+        solo l'indice successivo all'ultimo record generato, altrimenti ValueError.
+        """
+        if index < 0:
+            raise ValueError(f"Indice record non valido: {index}")
+        return self.generate_record(index)
+
+    def iter_range(self, start: int, stop: int, columnar: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Generatore dei record con indice in [start, stop). Ogni intervallo è
+        indipendente dagli altri: utile per paginazione, job ripresi e sharding.
+        Con columnar=True i record vengono prodotti a blocchi di STREAM_CHUNK_SIZE
+        tramite la generazione colonnare: i blocchi sono allineati ai multipli di
+        STREAM_CHUNK_SIZE, quindi anche qui il record i dipende solo da seed e indice.
+        Con campi univoci l'intervallo deve proseguire la sequenza già generata (vedi record_at).
+        """
+        if columnar:
+            size = self.STREAM_CHUNK_SIZE
+            index = start
+            while index < stop:
+                end = min(stop, (index // size + 1) * size)
+                yield from self._batch_records(index, end - index)
+                index = end
+            return
+        for index in range(start, stop):
+            yield self.generate_record(index)
+
+    def generate_range(self, start: int, stop: int, columnar: bool = False) -> List[Dict[str, Any]]:
+        """
+        Genera la lista dei record con indice in [start, stop).
+        """
+        return list(self.iter_range(start, stop, columnar=columnar))
+
+    def reserve(self, n: int) -> range:
+        """
+        Riserva i prossimi n indici della sequenza dell'engine (facendo avanzare il
+        cursore) e li restituisce: chi li genera (anche in altri processi) produce
+        esattamente i record che avrebbe prodotto la generazione seriale.
+        """
+        start = self._cursor
+        indices = range(start, start + n)
+        self._cursor = max(start, indices.stop)
+        return indices
+
+    def iter_records(self, n: int = 1, columnar: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Generatore di record mock: produce un record alla volta, così l'occupazione
+        di memoria resta costante qualunque sia n. Prosegue la sequenza dell'engine:
+        i record prodotti sono quelli con indice [cursore, cursore + n).
+        """
+        indices = self.reserve(n)
+        yield from self.iter_range(indices.start, indices.stop, columnar=columnar)
+
     def generate(self, n: int = 1) -> List[Dict[str, Any]]:
         """
         Genera una lista di record mock.
         """
-        return [self.generate_record() for _ in range(n)]
+        return list(self.iter_records(n))
 
+    def iter_parallel(self, n: int, workers: int = None, columnar: bool = False) -> Iterator[Dict[str, Any]]:
+        """
+        Genera n record (proseguendo la sequenza dell'engine) distribuendo il lavoro
+        su un pool di processi. Il conteggio viene diviso in shard da
+        PARALLEL_SHARD_SIZE record generati con generate_range: l'output è identico
+        a quello seriale, qualunque sia il numero di worker. I record arrivano in
+        ordine e solo un numero limitato di shard è in volo (memoria costante).
+        Con campi a valori univoci (has_unique) la generazione avviene in questo engine.
+        """
+        workers = workers or os.cpu_count() or 1
+        indices = self.reserve(n)
+        if self.has_unique:
+            yield from self.iter_range(indices.start, indices.stop, columnar=columnar)
+            return
+        schema = self.parser.schema
+        size = self.PARALLEL_SHARD_SIZE
+        shards = (
+            (schema, self.master_seed, first, min(first + size, indices.stop), columnar,
+             self.pool_size, self.pool_cache_dir)
+            for first in range(indices.start, indices.stop, size)
+        )
+
+        if workers == 1:
+            for shard in shards:
+                yield from _generate_shard(*shard)
+            return
 
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            pending = deque()
+            try:
+                for shard in shards:
+                    pending.append(pool.submit(_generate_shard, *shard))
+                    if len(pending) >= workers * 2:
+                        yield from pending.popleft().result()
+                while pending:
+                    yield from pending.popleft().result()
+            finally:
+                # Se il consumatore si interrompe, gli shard non ancora avviati vengono annullati
+                for future in pending:
+                    future.cancel()
+
+    def generate_parallel(self, n: int, workers: int = None, columnar: bool = False) -> List[Dict[str, Any]]:
+        """
+        Genera una lista di n record in parallelo (vedi iter_parallel).
+        """
+        return list(self.iter_parallel(n, workers=workers, columnar=columnar))
+
+    def generate_columns(self, n: int, start: int = None) -> Dict[str, List[Any]]:
+        """
+        Genera n valori per ogni campo in modalità colonnare.
+        Interi, float e scelte vengono prodotti con una singola chiamata vettorizzata NumPy;
+        gli altri tipi ricadono sulla generazione valore per valore.
+        I valori sono quelli dei record [start, start + n) (start di default è il
+        cursore dell'engine, che viene fatto avanzare), estratti dai blocchi allineati
+        di STREAM_CHUNK_SIZE record che li contengono: a parità di seed il valore del
+        record i non dipende da come l'intervallo viene suddiviso.
+        Con campi univoci le colonne vengono dai record generati in sequenza (generate_record).
+        """
+        try:
+            import numpy as np
+        except ImportError as e:
+            raise ImportError("La generazione colonnare richiede NumPy (pip install numpy).") from e
+        if n < 0:
+            n = 0
+        sequential = start is None
+        if sequential:
+            start = self._cursor
+        if self._unique_next is not None:
+            # I valori univoci dipendono da quelli già emessi: niente blocchi anticipati
+            rows = [self.generate_record(index) for index in range(start, start + n)]
+            if sequential:
+                self._cursor += n
+            return {fname: [row[fname] for row in rows] for fname, _ in self.plan}
+        if sequential:
+            self._cursor += n
+        columns = {fname: [] for fname, _ in self.plan}
+        size = self.STREAM_CHUNK_SIZE
+        stop = start + n
+        for block in range(start // size, -(-stop // size)):
+            first = block * size
+            lo, hi = max(start, first) - first, min(stop, first + size) - first
+            for fname, values in self._block_columns(block, size, np).items():
+                columns[fname].extend(values[lo:hi])
+        return columns
+
+    def _block_columns(self, block: int, size: int, np) -> Dict[str, List[Any]]:
+        """
+        Colonne del blocco allineato [block * size, (block + 1) * size): lo stream di
+        ogni campo è identificato dall'indice del primo record del blocco.
+        L'ultimo blocco generato viene riutilizzato (intervalli contigui nello stesso blocco).
+        """
+        cached = self._column_block
+        if cached is not None and cached[0] == (block, size):
+            return cached[1]
+        start = block * size
+        rng = self.rng
+        columns = {}
+        for (fname, gen), key in zip(self.plan, self._field_keys):
+            block_key = stream_key(key, start)
+            rng.seek(block_key)
+            try:
+                columns[fname] = gen.generate_column(size, np.random.default_rng(block_key), rng)
+            except Exception:
+                columns[fname] = [None] * size
+        self._column_block = ((block, size), columns)
+        return columns
+
+    def _batch_records(self, start: int, n: int) -> List[Dict[str, Any]]:
+        """Genera il blocco colonnare [start, start + n) e lo riassembla in dizionari."""
+        columns = self.generate_columns(n, start=start)
+        names = list(columns.keys())
+        return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+    def generate_batch(self, n: int) -> List[Dict[str, Any]]:
+        """
+        Genera n record in modalità colonnare e li riassembla in dizionari.
+        """
+        if n < 0:
+            n = 0
+        start = self._cursor
+        self._cursor += n
+        return self._batch_records(start, n)
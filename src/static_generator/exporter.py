@@ -1,12 +1,136 @@
 import csv
+import io
+import itertools
 import json
+import os
 import sys
+from typing import Any, Iterable, Iterator
+
+
+class _StdlibJSON:
+    """
+    Backend JSON della libreria standard, con encoder costruiti una volta sola
+    (json.dumps con argomenti ne ricrea uno a ogni chiamata).
+    """
+    name = 'stdlib'
+
+    def __init__(self):
+        self.dumps = json.JSONEncoder(ensure_ascii=False).encode
+        self.dumps_compact = json.JSONEncoder(ensure_ascii=False, separators=(",", ":")).encode
+        self.dumps_indent = json.JSONEncoder(ensure_ascii=False, indent=2).encode
+
+
+class _OrjsonJSON(_StdlibJSON):
+    """
+    Backend orjson per l'output compatto e indentato. L'NDJSON non compatto resta
+    alla libreria standard (orjson non produce separatori con spazio).
+    I valori che orjson rifiuta (es. interi oltre 64 bit) passano alla libreria standard.
+    """
+    name = 'orjson'
+
+    def __init__(self, orjson):
+        super().__init__()
+        self.dumps_compact = self._with_fallback(orjson, 0, self.dumps_compact)
+        self.dumps_indent = self._with_fallback(orjson, orjson.OPT_INDENT_2, self.dumps_indent)
+
+    @staticmethod
+    def _with_fallback(orjson, option, fallback):
+        orjson_dumps = orjson.dumps
+
+        def dumps(obj):
+            try:
+                return orjson_dumps(obj, option=option).decode("utf-8")
+            except TypeError:
+                return fallback(obj)
+        return dumps
 
 
 class DataExporter:
 
+    # Modalità di export SQL (kwarg 'sql_mode')
+    SQL_MODES = ('insert', 'multi', 'copy', 'sqlite')
+    # Righe per statement nelle modalità 'multi' e 'sqlite' (kwarg 'sql_batch_size')
+    SQL_BATCH_SIZE = 500
+
+    # Export diretto su SQLite: tipi di colonna per tipo di campo dello schema
+    SQLITE_TYPES = {
+        'integer': 'INTEGER', 'float': 'REAL', 'number': 'REAL', 'boolean': 'INTEGER',
+        'string': 'TEXT', 'uuid': 'TEXT', 'choice': 'TEXT', 'object': 'TEXT', 'array': 'TEXT',
+    }
+    # Righe per transazione (executemany) nell'export SQLite
+    SQLITE_BATCH_SIZE = 50_000
+    # Pragma per il caricamento massivo: il database è un artefatto rigenerabile
+    SQLITE_PRAGMAS = (
+        "PRAGMA journal_mode = MEMORY",
+        "PRAGMA synchronous = OFF",
+        "PRAGMA temp_store = MEMORY",
+        "PRAGMA cache_size = -65536",
+    )
+
+    # Righe per row group nell'export Parquet
+    PARQUET_ROW_GROUP_SIZE = 100_000
+
+    # Backend JSON (kwarg 'json_backend'): di default la libreria standard, l'unica con
+    # output identico a json.dump; 'auto' usa orjson se installato, 'orjson' lo richiede
+    JSON_BACKENDS = ('auto', 'stdlib', 'orjson')
+    # Pezzi di output accorpati in ogni chunk restituito da iter_export (una write per chunk)
+    WRITE_BATCH_SIZE = 1000
+
+    # Resa degli array nelle celle CSV (kwarg 'csv_arrays'): JSON o valori uniti da separatore
+    CSV_ARRAY_POLICIES = ('json', 'join')
+    CSV_ARRAY_SEPARATOR = '|'
+
+    _json_backends = {}
+
     # --- HELPER PRIVATI ---
 
+    @staticmethod
+    def _json_backend(name=None):
+        """
+        Restituisce (e memorizza) il backend JSON richiesto (default 'stdlib').
+        Con stdlib l'output è identico byte per byte a json.dump, qualunque siano i
+        pacchetti installati; orjson differisce nella notazione di alcuni float
+        (es. 0.00001 invece di 1e-05, 1.5e16 invece di 1.5e+16).
+        """
+        name = name or 'stdlib'
+        if name not in DataExporter.JSON_BACKENDS:
+            raise ValueError(f"Backend JSON non supportato: {name}")
+        backend = DataExporter._json_backends.get(name)
+        if backend is None:
+            if name == 'stdlib':
+                backend = _StdlibJSON()
+            else:
+                try:
+                    import orjson
+                    backend = _OrjsonJSON(orjson)
+                except ImportError:
+                    if name == 'orjson':
+                        raise ImportError("Il backend JSON 'orjson' richiede orjson (pip install orjson).")
+                    backend = DataExporter._json_backend('stdlib')
+            DataExporter._json_backends[name] = backend
+        return backend
+
+    @staticmethod
+    def _batched(pieces: Iterable[str], size: int) -> Iterator[str]:
+        """
+        Accorpa i pezzi di testo in chunk da size elementi. Se la produzione fallisce,
+        il chunk parziale viene emesso prima di propagare l'errore: i dati validi
+        già prodotti arrivano comunque in output.
+        """
+        batch = []
+        try:
+            for piece in pieces:
+                batch.append(piece)
+                if len(batch) >= size:
+                    yield "".join(batch)
+                    batch = []
+        except Exception:
+            if batch:
+                yield "".join(batch)
+            raise
+        if batch:
+            yield "".join(batch)
+
     @staticmethod
     def _format_sql_value(value):
         """Helper per formattare i valori SQL."""
@@ -21,49 +145,298 @@ class DataExporter:
             return f"'{safe_value}'"
         return f"'{json.dumps(value)}'"
 
+    @staticmethod
+    def _to_sql_param(value):
+        """
+        Helper: stessa mappatura di _format_sql_value, ma verso parametri nativi
+        di sqlite3 (nessuna serializzazione testuale né escaping).
+        """
+        if value is None or isinstance(value, (str, int, float)): return value
+        return json.dumps(value)
+
+    @staticmethod
+    def _quote_identifier(name):
+        """Helper per racchiudere nomi di tabella/colonna tra doppi apici."""
+        safe_name = str(name).replace('"', '""')
+        return f'"{safe_name}"'
+
+    @staticmethod
+    def _sqlite_column_type(key, value, fields):
+        """Tipo della colonna: dal tipo del campo nello schema, altrimenti dal primo valore."""
+        field_type = (fields or {}).get(key, {}).get('type')
+        if field_type in DataExporter.SQLITE_TYPES:
+            return DataExporter.SQLITE_TYPES[field_type]
+        if isinstance(value, (bool, int)): return 'INTEGER'
+        if isinstance(value, float): return 'REAL'
+        return 'TEXT'
+
+    @staticmethod
+    def _arrow_type(props, pa):
+        """
+        Tipo Arrow di un campo dello schema (None se va dedotto dai dati):
+        choice diventa una colonna dictionary-encoded, object una struct.
+        """
+        field_type = (props or {}).get('type')
+        if field_type == 'integer': return pa.int64()
+        if field_type in ('float', 'number'): return pa.float64()
+        if field_type in ('string', 'uuid'): return pa.string()
+        if field_type == 'choice':
+            options = props.get('options', [])
+            if options and all(isinstance(o, str) for o in options):
+                return pa.dictionary(pa.int32(), pa.string())
+            if options and all(isinstance(o, int) and not isinstance(o, bool) for o in options):
+                return pa.dictionary(pa.int32(), pa.int64())
+            return None
+        if field_type == 'object':
+            children = [(name, DataExporter._arrow_type(child, pa)) for name, child in props.get('fields', {}).items()]
+            if not children or any(child_type is None for _, child_type in children):
+                return None
+            return pa.struct(children)
+        if field_type == 'array':
+            item_type = props.get('item_type')
+            if not item_type or props.get('item_options'):
+                return pa.list_(pa.string())
+            child_type = DataExporter._arrow_type({'type': item_type}, pa)
+            return pa.list_(child_type) if child_type is not None else None
+        return None
+
+    @staticmethod
+    def csv_columns(fields: dict = None, record: dict = None) -> list:
+        """
+        Percorsi delle colonne CSV (tuple di chiavi). I campi object con 'fields' sono
+        appiattiti ricorsivamente e l'intestazione usa il percorso puntato (es. anagrafica.nome).
+        Senza schema la struttura si ricava dal record di esempio.
+        """
+        def walk(fields, record, prefix):
+            if fields:
+                for name, props in fields.items():
+                    children = props.get('fields') if props.get('type') == 'object' else None
+                    if children:
+                        yield from walk(children, None, prefix + (name,))
+                    else:
+                        yield prefix + (name,)
+            else:
+                for name, value in record.items():
+                    if isinstance(value, dict) and value:
+                        yield from walk(None, value, prefix + (name,))
+                    else:
+                        yield prefix + (name,)
+
+        return list(walk(fields, record or {}, ()))
+
+    @staticmethod
+    def _csv_row_builder(paths, array_policy):
+        """
+        Funzione record -> lista di celle secondo il piano di colonne. Le chiavi mancanti
+        diventano celle vuote; array e oggetti non appiattiti vengono serializzati.
+        """
+        if array_policy not in DataExporter.CSV_ARRAY_POLICIES:
+            raise ValueError(f"Politica CSV per gli array non supportata: {array_policy}")
+        dumps = DataExporter._json_backend('stdlib').dumps
+        separator = DataExporter.CSV_ARRAY_SEPARATOR
+
+        def cell(value):
+            if type(value) is list:
+                if array_policy == 'join':
+                    return separator.join(v if type(v) is str else dumps(v) for v in value)
+                return dumps(value)
+            if type(value) is dict:
+                return dumps(value)
+            return value
+
+        # Piano raggruppato per chiave di primo livello: (chiave, sotto-percorsi o None)
+        plan = []
+        for path in paths:
+            if plan and len(path) > 1 and plan[-1][0] == path[0]:
+                plan[-1][1].append(path[1:])
+            else:
+                plan.append((path[0], [path[1:]] if len(path) > 1 else None))
+        top_keys = {key for key, _ in plan}
+
+        def build(row):
+            if not row.keys() <= top_keys:
+                extra = ", ".join(repr(k) for k in row.keys() - top_keys)
+                raise ValueError(f"Il record contiene campi non presenti nell'intestazione CSV: {extra}")
+            values = []
+            for key, subpaths in plan:
+                value = row.get(key, "")
+                if subpaths is None:
+                    values.append(cell(value))
+                    continue
+                for subpath in subpaths:
+                    nested = value
+                    for part in subpath:
+                        nested = nested.get(part, "") if type(nested) is dict else ""
+                    values.append(cell(nested))
+            return values
+        return build
+
+    @staticmethod
+    def _format_copy_value(value):
+        """Helper per formattare i valori nel formato testo di COPY (PostgreSQL)."""
+        if value is None: return "\\N"
+        if isinstance(value, bool): return "t" if value else "f"
+        if isinstance(value, (int, float)): return str(value)
+        if not isinstance(value, str):
+            value = json.dumps(value)
+        # Escape dei caratteri speciali del formato testo
+        return (value.replace("\\", "\\\\").replace("\t", "\\t")
+                .replace("\n", "\\n").replace("\r", "\\r"))
+
+    @staticmethod
+    def _peek(data: Iterable[Any]):
+        """
+        Helper per gestire sia liste che generatori: restituisce un iteratore
+        equivalente a data, oppure None se non contiene alcun elemento.
+        """
+        items = iter(data)
+        for first in items:
+            return itertools.chain((first,), items)
+        return None
+
     # --- IMPLEMENTAZIONI SPECIFICHE ---
+    # Ogni strategia consuma un iterabile di record e restituisce il testo a pezzi,
+    # così nessun formato ha bisogno di tenere l'intero dataset in memoria.
 
     @staticmethod
-    def _to_json(data, stream, **kwargs):
-        json.dump(data, stream, indent=2, ensure_ascii=False)
-        stream.write("\n")
+    def _to_json(data, **kwargs):
+        backend = DataExporter._json_backend(kwargs.get('json_backend'))
+        if kwargs.get('compact'):
+            # Array su una sola riga, senza spazi
+            dumps = backend.dumps_compact
+            separator = "["
+            for item in data:
+                yield separator + dumps(item)
+                separator = ","
+            yield "]\n"
+            return
+
+        # Equivalente byte per byte a json.dump(data, indent=2) + "\n", ma un record alla volta
+        dumps = backend.dumps_indent
+        separator = "[\n"
+        for item in data:
+            yield separator + "  " + dumps(item).replace("\n", "\n  ")
+            separator = ",\n"
+        yield "\n]\n"
 
     @staticmethod
-    def _to_ndjson(data, stream, **kwargs):
+    def _to_ndjson(data, **kwargs):
+        backend = DataExporter._json_backend(kwargs.get('json_backend'))
+        dumps = backend.dumps_compact if kwargs.get('compact') else backend.dumps
         for item in data:
-            stream.write(json.dumps(item, ensure_ascii=False) + "\n")
+            yield dumps(item) + "\n"
 
     @staticmethod
-    def _to_csv(data, stream, **kwargs):
-        keys = data[0].keys()
+    def _to_csv(data, **kwargs):
+        """
+        Colonne ricavate una volta sola dallo schema (kwarg 'fields') o, in sua assenza,
+        dal primo record; le righe sono scritte come liste con writerows, write_batch_size
+        righe per chunk.
+        """
+        batch_size = kwargs.get('write_batch_size') or DataExporter.WRITE_BATCH_SIZE
+        rows = iter(data)
+        first = next(rows, None)
+        if first is None:
+            return
+        paths = DataExporter.csv_columns(kwargs.get('fields'), first)
+        build = DataExporter._csv_row_builder(paths, kwargs.get('csv_arrays') or 'json')
+
+        buffer = io.StringIO()
         # IMPORTANTE: lineterminator='\n' risolve il bug delle righe vuote su Windows
-        writer = csv.DictWriter(stream, fieldnames=keys, lineterminator='\n')
-        writer.writeheader()
-        writer.writerows(data)
+        writer = csv.writer(buffer, lineterminator='\n')
+        writer.writerow([".".join(path) for path in paths])
+        rows = itertools.chain((first,), rows)
+        while True:
+            chunk = []
+            try:
+                for row in itertools.islice(rows, batch_size):
+                    chunk.append(build(row))
+            except Exception:
+                # Le righe valide già prodotte vanno comunque in output
+                writer.writerows(chunk)
+                yield buffer.getvalue()
+                raise
+            if not chunk:
+                break
+            writer.writerows(chunk)
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate(0)
 
     @staticmethod
-    def _to_sql(data, stream, **kwargs):
+    def _to_sql(data, **kwargs):
+        """
+        Modalità (kwarg sql_mode):
+        - 'insert': un INSERT per riga (default);
+        - 'multi': INSERT multi-riga da sql_batch_size righe;
+        - 'copy': blocco COPY ... FROM stdin in formato testo PostgreSQL;
+        - 'sqlite': INSERT multi-riga racchiusi in un'unica transazione.
+        """
         table_name = kwargs.get('table_name', 'my_table')
-        columns = ", ".join(data[0].keys())
+        mode = kwargs.get('sql_mode') or 'insert'
+        batch_size = kwargs.get('sql_batch_size') or DataExporter.SQL_BATCH_SIZE
+        if mode not in DataExporter.SQL_MODES:
+            raise ValueError(f"Modalità SQL non supportata: {mode}")
+        if batch_size < 1:
+            raise ValueError(f"Dimensione del batch SQL non valida: {batch_size}")
 
-        # Scrive un blocco di insert.
-        # Nota: Ho mantenuto la tua logica row-by-row che è sicura e chiara.
-        for row in data:
-            values = [DataExporter._format_sql_value(row[col]) for col in data[0].keys()]
-            vals_str = ", ".join(values)
-            stream.write(f"INSERT INTO {table_name} ({columns}) VALUES ({vals_str});\n")
-
-    # --- METODO PUBBLICO PRINCIPALE ---
+        if mode == 'copy':
+            yield from DataExporter._to_sql_copy(data, table_name)
+        elif mode == 'insert':
+            yield from DataExporter._to_sql_insert(data, table_name)
+        elif mode == 'multi':
+            yield from DataExporter._to_sql_multi(data, table_name, batch_size)
+        else:
+            yield "BEGIN TRANSACTION;\n"
+            yield from DataExporter._to_sql_multi(data, table_name, batch_size)
+            yield "COMMIT;\n"
 
     @staticmethod
-    def export(data: list, format_type: str, output_stream=sys.stdout, **kwargs):
+    def _sql_rows(data, format_value):
         """
-        Entry point unico.
-        kwargs raccoglie argomenti extra come 'table_name'.
+        Restituisce (colonne, iteratore delle righe già formattate come liste di valori).
+        Le chiavi vengono lette una sola volta, dal primo record.
         """
-        if not data:
+        items = DataExporter._peek(data)
+        if items is None:
+            return None, iter(())
+        first = next(items)
+        keys = list(first.keys())
+        rows = itertools.chain((first,), items)
+        return ", ".join(keys), ([format_value(row[col]) for col in keys] for row in rows)
+
+    @staticmethod
+    def _to_sql_insert(data, table_name):
+        columns, rows = DataExporter._sql_rows(data, DataExporter._format_sql_value)
+        prefix = f"INSERT INTO {table_name} ({columns}) VALUES ("
+        for values in rows:
+            yield prefix + ", ".join(values) + ");\n"
+
+    @staticmethod
+    def _to_sql_multi(data, table_name, batch_size):
+        columns, rows = DataExporter._sql_rows(data, DataExporter._format_sql_value)
+        header = f"INSERT INTO {table_name} ({columns}) VALUES\n"
+        while True:
+            batch = [f"({', '.join(values)})" for values in itertools.islice(rows, batch_size)]
+            if not batch:
+                return
+            yield header + ",\n".join(batch) + ";\n"
+
+    @staticmethod
+    def _to_sql_copy(data, table_name):
+        columns, rows = DataExporter._sql_rows(data, DataExporter._format_copy_value)
+        if columns is None:
             return
+        yield f"COPY {table_name} ({columns}) FROM stdin;\n"
+        for values in rows:
+            yield "\t".join(values) + "\n"
+        yield "\\.\n"
 
+    # --- METODI PUBBLICI ---
+
+    @staticmethod
+    def _strategy(format_type: str):
+        """Strategia di export del formato (ValueError se non supportato)."""
         # MAPPING (Il "Dispatcher")
         strategies = {
             'json': DataExporter._to_json,
@@ -76,9 +449,191 @@ class DataExporter:
 
         if not exporter_func:
             raise ValueError(f"Formato non supportato: {format_type}")
+        return exporter_func
+
+    @staticmethod
+    def _check_options(format_type: str, kwargs: dict) -> None:
+        """
+        Valida le opzioni del formato prima di iniziare l'export: le strategie sono
+        generatori, e un errore al loro interno emergerebbe solo a output già iniziato.
+        """
+        for name in ('write_batch_size', 'sql_batch_size'):
+            value = kwargs.get(name)
+            if value is not None and (type(value) is not int or value < 1):
+                raise ValueError(f"'{name}' deve essere un intero positivo: {value!r}")
+        if format_type in ('json', 'ndjson'):
+            DataExporter._json_backend(kwargs.get('json_backend'))
+        elif format_type == 'csv':
+            policy = kwargs.get('csv_arrays') or 'json'
+            if policy not in DataExporter.CSV_ARRAY_POLICIES:
+                raise ValueError(f"Politica CSV per gli array non supportata: {policy}")
+        elif format_type == 'sql':
+            mode = kwargs.get('sql_mode') or 'insert'
+            if mode not in DataExporter.SQL_MODES:
+                raise ValueError(f"Modalità SQL non supportata: {mode}")
+
+    @staticmethod
+    def iter_export(data: Iterable[Any], format_type: str, **kwargs) -> Iterator[str]:
+        """
+        Restituisce l'output del formato richiesto come sequenza di pezzi di testo,
+        consumando data (lista o generatore di record) in modo incrementale.
+        I pezzi sono accorpati in chunk da WRITE_BATCH_SIZE (kwarg 'write_batch_size').
+        Formato e opzioni vengono validati subito (ValueError), prima di consumare data.
+        """
+        exporter_func = DataExporter._strategy(format_type)
+        DataExporter._check_options(format_type, kwargs)
+
+        items = DataExporter._peek(data)
+        if items is None:
+            return iter(())
+
+        batch_size = kwargs.pop('write_batch_size', None) or DataExporter.WRITE_BATCH_SIZE
+        if format_type == 'csv':
+            # Il CSV scrive già le righe a blocchi con writerows
+            return exporter_func(items, write_batch_size=batch_size, **kwargs)
+        return DataExporter._batched(exporter_func(items, **kwargs), batch_size)
+
+    @staticmethod
+    def export_sqlite(data: Iterable[Any], db_path: str, table_name: str = 'my_table',
+                      fields: dict = None, batch_size: int = None) -> int:
+        """
+        Scrive i record direttamente in una tabella di un database SQLite, con i tipi
+        ricavati da fields (le proprietà dello schema). Una tabella con lo stesso nome già
+        presente viene sostituita: rieseguire lo stesso export produce lo stesso database.
+        Le righe vengono caricate in una tabella di appoggio (statement preparato con
+        executemany, una transazione ogni batch_size righe) che a fine caricamento prende
+        il posto della tabella esistente in un'unica transazione: se l'export fallisce la
+        tabella precedente resta intatta. I pragma di caricamento massivo (SQLITE_PRAGMAS)
+        si applicano solo ai database creati dall'export. Restituisce il numero di righe scritte.
+        """
+        import sqlite3
+
+        items = DataExporter._peek(data)
+        if items is None:
+            if os.path.exists(db_path):
+                conn = sqlite3.connect(db_path, isolation_level=None)
+                try:
+                    conn.execute(f"DROP TABLE IF EXISTS {DataExporter._quote_identifier(table_name)}")
+                finally:
+                    conn.close()
+            return 0
+        batch_size = batch_size or DataExporter.SQLITE_BATCH_SIZE
+        if batch_size < 1:
+            raise ValueError(f"Dimensione del batch SQLite non valida: {batch_size}")
+
+        first = next(items)
+        keys = list(first.keys())
+        rows = itertools.chain((first,), items)
+        table = DataExporter._quote_identifier(table_name)
+        loading = DataExporter._quote_identifier(f"{table_name}__loading")
+        columns = ", ".join(
+            f"{DataExporter._quote_identifier(key)} {DataExporter._sqlite_column_type(key, first[key], fields)}"
+            for key in keys
+        )
+        placeholders = ", ".join("?" for _ in keys)
+        insert = f"INSERT INTO {loading} ({', '.join(map(DataExporter._quote_identifier, keys))}) VALUES ({placeholders})"
+        to_param = DataExporter._to_sql_param
+
+        written = 0
+        new_database = not os.path.exists(db_path) or os.path.getsize(db_path) == 0
+        conn = sqlite3.connect(db_path, isolation_level=None)
+        try:
+            if new_database:
+                for pragma in DataExporter.SQLITE_PRAGMAS:
+                    conn.execute(pragma)
+            conn.execute(f"DROP TABLE IF EXISTS {loading}")
+            conn.execute(f"CREATE TABLE {loading} ({columns})")
+            while True:
+                batch = [tuple(to_param(row[key]) for key in keys) for row in itertools.islice(rows, batch_size)]
+                if not batch:
+                    break
+                conn.execute("BEGIN")
+                try:
+                    conn.executemany(insert, batch)
+                    conn.execute("COMMIT")
+                except Exception:
+                    conn.execute("ROLLBACK")
+                    raise
+                written += len(batch)
+            # Sostituzione atomica della tabella precedente
+            conn.execute("BEGIN")
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+                conn.execute(f"ALTER TABLE {loading} RENAME TO {table}")
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        except Exception as e:
+            try:
+                conn.execute(f"DROP TABLE IF EXISTS {loading}")
+            except sqlite3.Error:
+                pass
+            raise RuntimeError(f"Errore durante l'export in sqlite: {e}")
+        finally:
+            conn.close()
+        return written
+
+    @staticmethod
+    def export_parquet(data: Iterable[Any], path, fields: dict = None, row_group_size: int = None,
+                       compression: str = 'snappy') -> int:
+        """
+        Scrive i record in un file Parquet (path o file binario) un row group alla volta,
+        consumando data in modo incrementale. I tipi delle colonne vengono dallo schema
+        (fields); quelli non ricavabili sono dedotti dal primo row group.
+        Restituisce il numero di righe scritte.
+        """
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("L'export Parquet richiede PyArrow (pip install pyarrow).") from e
+
+        items = DataExporter._peek(data)
+        if items is None:
+            return 0
+        row_group_size = row_group_size or DataExporter.PARQUET_ROW_GROUP_SIZE
+        if row_group_size < 1:
+            raise ValueError(f"Dimensione del row group non valida: {row_group_size}")
+
+        written = 0
+        writer = None
+        schema = None
+        try:
+            while True:
+                batch = list(itertools.islice(items, row_group_size))
+                if not batch:
+                    break
+                if schema is None:
+                    # Schema Arrow fissato dal primo row group: tipi dello schema JSON
+                    # dove disponibili, altrimenti quelli dedotti da PyArrow
+                    inferred = pa.Table.from_pylist(batch).schema
+                    schema = pa.schema([
+                        (name, DataExporter._arrow_type((fields or {}).get(name), pa) or inferred.field(name).type)
+                        for name in batch[0].keys()
+                    ])
+                    writer = pq.ParquetWriter(path, schema, compression=compression)
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema), row_group_size=row_group_size)
+                written += len(batch)
+        except Exception as e:
+            raise RuntimeError(f"Errore durante l'export in parquet: {e}")
+        finally:
+            if writer is not None:
+                writer.close()
+        return written
+
+    @staticmethod
+    def export(data: Iterable[Any], format_type: str, output_stream=sys.stdout, **kwargs):
+        """
+        Entry point unico.
+        data può essere una lista o un generatore di record (es. MockEngine.iter_records):
+        l'output viene scritto man mano, senza materializzare il dataset.
+        kwargs raccoglie argomenti extra come 'table_name'.
+        """
+        DataExporter._strategy(format_type)
 
         try:
-            # Chiamata dinamica alla funzione giusta
-            exporter_func(data, output_stream, **kwargs)
+            for chunk in DataExporter.iter_export(data, format_type, **kwargs):
+                output_stream.write(chunk)
         except Exception as e:
-            raise RuntimeError(f"Errore durante l'export in {format_type}: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Errore durante l'export in {format_type}: {e}")
@@ -0,0 +1,122 @@
+import hashlib
+import os
+import random
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from faker import Faker
+
+# Locale usato da tutte le istanze Faker del generatore
+DEFAULT_LOCALE = "it_IT"
+
+
+class RandomSource(random.Random):
+    """
+    Sorgente di casualità passata ai generatori di campo.
+    È un random.Random con un'istanza Faker collegata allo stesso stato interno:
+    un solo seed governa sia i valori numerici che quelli prodotti da Faker, e ogni
+    engine (o processo worker) ha la propria sorgente indipendente, senza stato globale.
+    Porta con sé anche gli eventuali pool di valori precalcolati (metodo Faker -> ValuePool)
+    usati dai generatori di stringhe e gli insiemi dei valori già emessi dai campi con
+    vincolo di unicità (generatore -> UniqueSet), così l'unicità vale per engine.
+    L'istanza Faker (e l'import stesso di faker) viene creata solo al primo utilizzo.
+    """
+    def __init__(self, seed: Optional[int] = None, faker: Optional["Faker"] = None, locale: str = DEFAULT_LOCALE):
+        super().__init__(seed)
+        self.locale = locale
+        self._fake = None
+        if faker is not None:
+            self.fake = faker
+        self.pools = {}
+        self.unique = {}
+
+    @property
+    def fake(self) -> "Faker":
+        if self._fake is None:
+            from faker import Faker
+            self.fake = Faker(self.locale)
+        return self._fake
+
+    @fake.setter
+    def fake(self, faker: "Faker") -> None:
+        self._fake = faker
+        faker.random = self
+
+
+def derive_seed(seed: int, *keys: Any) -> int:
+    """
+    Deriva in modo deterministico un seed a 64 bit da un seed principale e da una o più
+    chiavi (es. indice dello shard). Seed derivati da chiavi diverse sono indipendenti.
+    """
+    material = repr((seed,) + keys).encode("utf-8")
+    return int.from_bytes(hashlib.blake2b(material, digest_size=8).digest(), "big")
+
+
+# --- STREAM COUNTER-BASED (SplitMix64) ---
+
+_MASK64 = (1 << 64) - 1
+# Incremento del contatore all'interno di uno stream (costante "golden ratio" di SplitMix64)
+_GAMMA = 0x9E3779B97F4A7C15
+# Costante dispari usata per spaziare le chiavi dei record di uno stesso campo
+_INDEX_GAMMA = 0xD1B54A32D192ED03
+_TWO_POW_MINUS_53 = 1.0 / (1 << 53)
+
+
+def _mix64(z: int) -> int:
+    """Funzione di mixing finale di SplitMix64 (biiettiva su 64 bit)."""
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+    return z ^ (z >> 31)
+
+
+def stream_key(base_key: int, index: int) -> int:
+    """
+    Chiave dello stream del record `index` per un campo con chiave base `base_key`
+    (a sua volta derivata da seed e percorso del campo con derive_seed).
+    """
+    return _mix64((base_key + index * _INDEX_GAMMA) & _MASK64)
+
+
+class CounterRandom(RandomSource):
+    """
+    RandomSource counter-based: l'n-esimo valore dello stream con chiave K è
+    mix64(K + n * gamma). Non c'è stato da far avanzare: posizionarsi su un altro
+    stream (seek) costa O(1), quindi ogni coppia (record, campo) può avere il proprio
+    stream indipendente e il record i si genera senza generare i precedenti.
+    Tutti i metodi di random.Random (randint, choices, sample, ...) e Faker
+    funzionano sopra random() e getrandbits().
+    """
+    def seed(self, a=None, version=2):
+        if a is None:
+            a = int.from_bytes(os.urandom(8), "big")
+        self._key = derive_seed(a)
+        self._counter = 0
+        self.gauss_next = None
+
+    def seek(self, key: int) -> None:
+        """Si posiziona all'inizio dello stream con chiave `key`."""
+        self._key = key
+        self._counter = 0
+
+    def random(self) -> float:
+        self._counter += 1
+        z = (self._key + self._counter * _GAMMA) & _MASK64
+        z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & _MASK64
+        z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & _MASK64
+        return ((z ^ (z >> 31)) >> 11) * _TWO_POW_MINUS_53
+
+    def getrandbits(self, k: int) -> int:
+        if k < 0:
+            raise ValueError("number of bits must be non-negative")
+        words = (k + 63) // 64
+        value = 0
+        for _ in range(words):
+            self._counter += 1
+            value = (value << 64) | _mix64((self._key + self._counter * _GAMMA) & _MASK64)
+        return value >> (words * 64 - k)
+
+    def getstate(self):
+        return self._key, self._counter
+
+    def setstate(self, state):
+        self._key, self._counter = state
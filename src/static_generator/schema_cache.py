@@ -0,0 +1,89 @@
+import copy
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Union
+
+from .engine import CompiledSchema, MockEngine
+
+# Numero di schemi compilati mantenuti di default
+DEFAULT_MAX_SIZE = 64
+
+
+class SchemaCache:
+    """
+    Cache LRU in memoria degli schemi già validati e compilati, indicizzata
+    dallo SHA-256 del contenuto. Pensata per i servizi che ricevono più volte lo
+    stesso schema: parsing, validazione jsonschema e compilazione avvengono una volta
+    sola per contenuto. Thread-safe.
+    """
+    def __init__(self, max_size: int = DEFAULT_MAX_SIZE):
+        if max_size < 1:
+            raise ValueError("max_size deve essere almeno 1.")
+        self.max_size = max_size
+        self._entries: "OrderedDict[str, CompiledSchema]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def key_for(content: Union[str, bytes, dict]) -> str:
+        """SHA-256 del contenuto; i dict vengono serializzati in forma canonica."""
+        if isinstance(content, dict):
+            content = json.dumps(content, sort_keys=True, separators=(",", ":"))
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return hashlib.sha256(content).hexdigest()
+
+    def get(self, content: Union[str, bytes, dict]) -> CompiledSchema:
+        """
+        Restituisce lo schema compilato per `content` (testo JSON o dict),
+        compilandolo e memorizzandolo se non è in cache.
+        Gli errori di parsing/validazione vengono propagati e non finiscono in cache.
+        """
+        key = self.key_for(content)
+        with self._lock:
+            compiled = self._entries.get(key)
+            if compiled is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return compiled
+            self.misses += 1
+
+        # La compilazione avviene fuori dal lock: richieste concorrenti sullo stesso
+        # schema nuovo possono compilarlo due volte, ma senza bloccare le altre
+        # (i dict vengono copiati: modifiche successive del chiamante non toccano la cache)
+        schema = copy.deepcopy(content) if isinstance(content, dict) else json.loads(content)
+        compiled = MockEngine.compile_schema(schema=schema)
+
+        with self._lock:
+            self._entries[key] = compiled
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return compiled
+
+    def engine(self, content: Union[str, bytes, dict], **kwargs: Any) -> MockEngine:
+        """Costruisce un MockEngine dallo schema in cache (kwargs: seed, pool_size, ...)."""
+        return MockEngine(compiled=self.get(content), **kwargs)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Metriche della cache (dimensione, hit, miss, evizioni)."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -5,8 +5,6 @@ import json
 import os
 import copy
 from typing import Any, Dict
-from jsonschema import validate, ValidationError
-from jsonschema.validators import validator_for
 
 
 
@@ -51,7 +49,9 @@ class SchemaParser:
             raise SchemaError("Lo schema deve avere una proprietà 'properties' di tipo oggetto.")
         if "required" in schema and not isinstance(schema["required"], list):
             raise SchemaError("La proprietà 'required' deve essere una lista.")
-        # Validazione secondo specifica JSON Schema
+        # Validazione secondo specifica JSON Schema (jsonschema importato solo qui)
+        from jsonschema import ValidationError
+        from jsonschema.validators import validator_for
         try:
             clean_schema = cls._sanitize_schema(schema)
             validator_cls = validator_for(clean_schema)
@@ -110,6 +110,7 @@ class SchemaParser:
                 data = json.load(f)
         except json.JSONDecodeError as e:
             raise SchemaError(f"File JSON non valido: {e}")
+        from jsonschema import validate, ValidationError
         try:
             validate(instance=data, schema=self.schema)
         except ValidationError as e:
@@ -0,0 +1,260 @@
+import hashlib
+import itertools
+import json
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from .compression import CompressedTextWriter, compression_for
+from .engine import MockEngine
+from .exporter import DataExporter
+
+# Formati che supportano l'output a shard (sqlite scrive in un unico database)
+SHARDABLE_FORMATS = ('json', 'ndjson', 'csv', 'sql', 'parquet')
+# Cifre dell'indice nel nome degli shard (data-00000.ndjson)
+SHARD_INDEX_DIGITS = 5
+
+
+def split_output_path(path: str) -> Tuple[str, str]:
+    """
+    Divide il percorso di output in (radice, estensione completa):
+    "out/data.ndjson.gz" -> ("out/data", ".ndjson.gz").
+    """
+    root, ext = os.path.splitext(path)
+    if compression_for(path):
+        root, inner_ext = os.path.splitext(root)
+        ext = inner_ext + ext
+    return root, ext
+
+
+def shard_path(path: str, index: int) -> str:
+    """Percorso dello shard index-esimo: "out/data.ndjson" -> "out/data-00000.ndjson"."""
+    root, ext = split_output_path(path)
+    return f"{root}-{index:0{SHARD_INDEX_DIGITS}d}{ext}"
+
+
+def manifest_path(path: str) -> str:
+    """Percorso del manifest: "out/data.ndjson" -> "out/data.manifest.json"."""
+    return f"{split_output_path(path)[0]}.manifest.json"
+
+
+class _CountingStream:
+    """Proxy di uno stream di testo che conta i byte (UTF-8, non compressi) scritti."""
+    def __init__(self, stream):
+        self.stream = stream
+        self.bytes = 0
+
+    def write(self, text: str) -> int:
+        self.bytes += len(text.encode("utf-8"))
+        return self.stream.write(text)
+
+
+class _PushbackIterator:
+    """Iteratore con restituzione di un elemento: push(item) lo fa riemergere al prossimo next()."""
+    def __init__(self, iterable: Iterable[Any]):
+        self._it = iter(iterable)
+        self._pending = []
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._pending:
+            return self._pending.pop()
+        return next(self._it)
+
+    def push(self, item: Any) -> None:
+        self._pending.append(item)
+
+
+def _until_bytes(records: Iterator[Dict[str, Any]], stream: _CountingStream, max_bytes: int):
+    """Estrae il prossimo record solo finché lo shard è sotto la soglia in byte."""
+    while stream.bytes < max_bytes:
+        record = next(records, None)
+        if record is None:
+            return
+        yield record
+
+
+def _file_digest(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def write_shard(records: Iterable[Dict[str, Any]], path: str, format_type: str, fields: dict = None,
+                compress_workers: int = None, max_bytes: int = None, **export_kwargs) -> Dict[str, Any]:
+    """
+    Scrive un singolo shard e ne restituisce la voce del manifest (senza l'intervallo
+    di record). Con max_bytes lo shard si chiude appena l'output supera la soglia:
+    i record non consumati restano nell'iteratore per lo shard successivo. Perché la
+    soglia valga record per record, in SQL ogni INSERT contiene una sola riga
+    (sql_batch_size=1 nelle modalità 'multi' e 'sqlite').
+    """
+    count = 0
+
+    def counted(source):
+        nonlocal count
+        for record in source:
+            count += 1
+            yield record
+
+    if format_type == 'parquet':
+        if max_bytes is not None:
+            raise ValueError("Il formato parquet supporta solo shard a numero di record.")
+        DataExporter.export_parquet(counted(records), path, fields=fields)
+    else:
+        compression = compression_for(path)
+        if compression:
+            handle = CompressedTextWriter(path, compression, workers=compress_workers)
+        else:
+            handle = open(path, "w", encoding="utf-8", newline="")
+        try:
+            stream = _CountingStream(handle)
+            if max_bytes is None:
+                DataExporter.export(counted(records), format_type, stream, fields=fields, **export_kwargs)
+            else:
+                # Un record per chunk: la soglia viene verificata dopo ogni record scritto.
+                # Gli INSERT multi-riga leggerebbero sql_batch_size record prima di scrivere
+                if format_type == 'sql':
+                    export_kwargs = {**export_kwargs, 'sql_batch_size': 1}
+                source = _until_bytes(iter(records), stream, max_bytes)
+                DataExporter.export(counted(source), format_type, stream, write_batch_size=1, fields=fields,
+                                    **export_kwargs)
+        finally:
+            handle.close()
+
+    return {
+        "file": os.path.basename(path),
+        "records": count,
+        "bytes": os.path.getsize(path),
+        "sha256": _file_digest(path),
+    }
+
+
+def _write_range_shard(schema: dict, seed: int, start: int, stop: int, path: str, format_type: str,
+                       columnar: bool, pool_size: Optional[int], pool_cache_dir: Optional[str],
+                       compress_workers: Optional[int], export_kwargs: dict) -> Dict[str, Any]:
+    """
+    Task eseguito nei processi worker: genera i record [start, stop) con un engine
+    dedicato e li scrive nel proprio file, senza passare da uno stream condiviso.
+    """
+    engine = MockEngine(schema=schema, seed=seed, pool_size=pool_size, pool_cache_dir=pool_cache_dir)
+    records = engine.iter_range(start, stop, columnar=columnar)
+    return write_shard(records, path, format_type, fields=engine.fields,
+                       compress_workers=compress_workers, **export_kwargs)
+
+
+def write_sharded(engine: MockEngine, n: int, path: str, format_type: str, shard_records: int = None,
+                  shard_bytes: int = None, workers: int = None, columnar: bool = False,
+                  compress_workers: int = None, **export_kwargs) -> Dict[str, Any]:
+    """
+    Genera n record (proseguendo la sequenza dell'engine) scrivendoli in più file
+    (shard) accanto a path, più un manifest JSON con intervallo di record, dimensione
+    e SHA-256 di ogni shard. Restituisce il manifest.
+
+    - shard_records: ogni shard contiene esattamente quel numero di record; con
+      workers ogni processo genera e scrive i propri shard in modo indipendente.
+    - shard_bytes: un nuovo shard inizia quando l'output (non compresso) supera la
+      soglia; la generazione è seriale.
+    """
+    if format_type not in SHARDABLE_FORMATS:
+        raise ValueError(f"Formato non supportato per l'output a shard: {format_type}")
+    if (shard_records is None) == (shard_bytes is None):
+        raise ValueError("Specificare esattamente uno tra shard_records e shard_bytes.")
+    if (shard_records if shard_records is not None else shard_bytes) < 1:
+        raise ValueError("La dimensione degli shard deve essere positiva.")
+    if shard_bytes is not None and workers and workers > 1:
+        raise ValueError("Gli shard a dimensione in byte non supportano la generazione parallela.")
+
+    output_dir = os.path.dirname(path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    indices = engine.reserve(n)
+    if shard_records is not None:
+        shards = _write_record_shards(engine, indices, path, format_type, shard_records, workers,
+                                      columnar, compress_workers, export_kwargs)
+    else:
+        shards = _write_byte_shards(engine, indices, path, format_type, shard_bytes,
+                                    columnar, compress_workers, export_kwargs)
+
+    manifest = {
+        "format": format_type,
+        "seed": engine.seed,
+        "master_seed": engine.master_seed,
+        "count": len(indices),
+        "shard_size": {"records": shard_records} if shard_records is not None else {"bytes": shard_bytes},
+        "shards": shards,
+    }
+    target = manifest_path(path)
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+        f.write("\n")
+    os.replace(tmp_path, target)
+    return manifest
+
+
+def _write_record_shards(engine, indices, path, format_type, size, workers, columnar,
+                         compress_workers, export_kwargs) -> List[Dict[str, Any]]:
+    ranges = [
+        (index, first, min(first + size, indices.stop))
+        for index, first in enumerate(range(indices.start, indices.stop, size))
+    ]
+
+    def entry(index, start, stop, info):
+        return {"index": index, "start": start, "stop": stop, **info}
+
+    # Con campi univoci gli shard si generano in sequenza nello stesso engine
+    if not workers or workers == 1 or engine.has_unique:
+        return [
+            entry(index, start, stop, write_shard(
+                engine.iter_range(start, stop, columnar=columnar), shard_path(path, index), format_type,
+                fields=engine.fields, compress_workers=compress_workers, **export_kwargs))
+            for index, start, stop in ranges
+        ]
+
+    shards = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = deque()
+        try:
+            for index, start, stop in ranges:
+                future = pool.submit(
+                    _write_range_shard, engine.parser.schema, engine.master_seed, start, stop,
+                    shard_path(path, index), format_type, columnar, engine.pool_size,
+                    engine.pool_cache_dir, compress_workers, export_kwargs,
+                )
+                pending.append((index, start, stop, future))
+                if len(pending) >= workers * 2:
+                    index, start, stop, done = pending.popleft()
+                    shards.append(entry(index, start, stop, done.result()))
+            while pending:
+                index, start, stop, done = pending.popleft()
+                shards.append(entry(index, start, stop, done.result()))
+        finally:
+            for *_, future in pending:
+                future.cancel()
+    return shards
+
+
+def _write_byte_shards(engine, indices, path, format_type, max_bytes, columnar,
+                       compress_workers, export_kwargs) -> List[Dict[str, Any]]:
+    # Un solo iteratore per tutti gli shard: il record usato per verificare che ne
+    # restino altri viene restituito, senza annidare un nuovo chain a ogni shard
+    records = _PushbackIterator(engine.iter_range(indices.start, indices.stop, columnar=columnar))
+    shards = []
+    start = indices.start
+    for index in itertools.count():
+        first = next(records, None)
+        if first is None:
+            break
+        records.push(first)
+        info = write_shard(records, shard_path(path, index), format_type, fields=engine.fields,
+                           compress_workers=compress_workers, max_bytes=max_bytes, **export_kwargs)
+        shards.append({"index": index, "start": start, "stop": start + info["records"], **info})
+        start += info["records"]
+    return shards
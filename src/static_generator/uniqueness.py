@@ -0,0 +1,120 @@
+import hashlib
+import json
+import math
+from typing import Any, Hashable
+
+# Modalità del vincolo di unicità (chiave "mode" di "unique")
+UNIQUE_MODES = ("auto", "exact", "bloom")
+# Tentativi di rigenerazione per valore prima di dichiarare esaurito lo spazio dei valori
+DEFAULT_MAX_RETRIES = 100
+# Probabilità di falso positivo del Bloom filter e numero di valori per cui è dimensionato
+DEFAULT_ERROR_RATE = 0.001
+DEFAULT_CAPACITY = 10_000_000
+# In modalità auto: valori tenuti nel set esatto prima del passaggio al Bloom filter
+EXACT_LIMIT = 1_000_000
+
+
+class UniquenessError(RuntimeError):
+    """Nessun valore nuovo ottenuto entro il numero massimo di tentativi."""
+
+
+def check_options(mode: str, capacity: int, error_rate: float) -> None:
+    """Valida la configurazione di un vincolo di unicità (ValueError se non valida)."""
+    if mode not in UNIQUE_MODES:
+        raise ValueError(f"Modalità di unicità non supportata: {mode}")
+    if capacity < 1:
+        raise ValueError(f"Capacità del Bloom filter non valida: {capacity}")
+    if not 0 < error_rate < 1:
+        raise ValueError(f"Probabilità di falso positivo non valida: {error_rate}")
+
+
+def value_key(value: Any) -> Hashable:
+    """Chiave confrontabile di un valore generato (oggetti e liste in JSON canonico)."""
+    if isinstance(value, (dict, list)):
+        return json.dumps(value, sort_keys=True, ensure_ascii=False, default=str)
+    return value
+
+
+class BloomFilter:
+    """
+    Bloom filter a memoria fissa: m bit e k hash ricavati con doppio hashing da un
+    unico digest BLAKE2b. Non dà mai falsi negativi: un valore già visto viene sempre
+    riconosciuto; un valore nuovo viene scartato per errore con probabilità ~error_rate
+    (finché gli inserimenti restano entro capacity).
+    """
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, error_rate: float = DEFAULT_ERROR_RATE):
+        check_options("bloom", capacity, error_rate)
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+        self.count = 0
+
+    def _positions(self, key: Hashable):
+        data = key.encode("utf-8") if isinstance(key, str) else repr(key).encode("utf-8")
+        digest = hashlib.blake2b(data, digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        size = self.size
+        return [(h1 + i * h2) % size for i in range(self.hashes)]
+
+    def __contains__(self, key: Hashable) -> bool:
+        bits = self.bits
+        return all(bits[p >> 3] & (1 << (p & 7)) for p in self._positions(key))
+
+    def add(self, key: Hashable) -> bool:
+        """Inserisce key; restituisce False se era (probabilmente) già presente."""
+        bits = self.bits
+        new = False
+        for p in self._positions(key):
+            mask = 1 << (p & 7)
+            if not bits[p >> 3] & mask:
+                bits[p >> 3] |= mask
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bits)
+
+
+class UniqueSet:
+    """
+    Insieme dei valori già generati per un campo con vincolo di unicità.
+    - exact: set Python, nessun falso positivo, memoria proporzionale ai valori;
+    - bloom: BloomFilter a memoria fissa (capacity, error_rate);
+    - auto: set esatto fino a EXACT_LIMIT valori, poi migrazione nel Bloom filter.
+    In ogni modalità un duplicato non viene mai accettato.
+    """
+    def __init__(self, mode: str = "auto", capacity: int = DEFAULT_CAPACITY,
+                 error_rate: float = DEFAULT_ERROR_RATE):
+        check_options(mode, capacity, error_rate)
+        self.mode = mode
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.exact = set() if mode != "bloom" else None
+        self.bloom = BloomFilter(capacity, error_rate) if mode == "bloom" else None
+
+    def add(self, value: Any) -> bool:
+        """Registra value; restituisce False se è un duplicato (da rigenerare)."""
+        key = value_key(value)
+        if self.exact is None:
+            return self.bloom.add(key)
+        if key in self.exact:
+            return False
+        self.exact.add(key)
+        if self.mode == "auto" and len(self.exact) > EXACT_LIMIT:
+            self._to_bloom()
+        return True
+
+    def _to_bloom(self) -> None:
+        bloom = BloomFilter(max(self.capacity, 2 * len(self.exact)), self.error_rate)
+        for key in self.exact:
+            bloom.add(key)
+        self.bloom, self.exact = bloom, None
+
+    def __len__(self) -> int:
+        return len(self.exact) if self.exact is not None else self.bloom.count
@@ -0,0 +1,132 @@
+import hashlib
+import os
+import struct
+from array import array
+from typing import Dict, List, Optional
+
+from .rng import RandomSource
+
+# Intestazione dei file di cache: magic + versione del formato
+_MAGIC = b"MGPOOL1\n"
+# Dimensione di default di un pool (valori distinti precalcolati per metodo)
+DEFAULT_POOL_SIZE = 10_000
+
+
+def default_cache_dir() -> str:
+    """Cartella di cache dei pool: $MOCKGEN_POOL_CACHE oppure ~/.cache/mockgen/pools."""
+    return os.environ.get("MOCKGEN_POOL_CACHE") or os.path.join(os.path.expanduser("~"), ".cache", "mockgen", "pools")
+
+
+class ValuePool:
+    """
+    Pool di valori precalcolati per un metodo Faker.
+    I valori vengono estratti con un indice casuale invece di invocare Faker.
+    """
+    def __init__(self, values: List[str]):
+        if not values:
+            raise ValueError("Un pool di valori non può essere vuoto.")
+        self.values = values
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def sample(self, rng: RandomSource) -> str:
+        """Estrae un valore usando lo stream corrente di rng."""
+        return self.values[int(rng.random() * len(self.values))]
+
+    def sample_column(self, n: int, np_rng) -> List[str]:
+        """Estrae n valori con un'unica estrazione vettorizzata degli indici."""
+        values = self.values
+        return [values[i] for i in np_rng.integers(0, len(values), size=n).tolist()]
+
+    # --- SERIALIZZAZIONE BINARIA ---
+    # Formato: MAGIC | count (uint32) | count+1 offset (uint32) | blob UTF-8 concatenato
+
+    def to_bytes(self) -> bytes:
+        encoded = [value.encode("utf-8") for value in self.values]
+        offsets = array("I", [0])
+        for chunk in encoded:
+            offsets.append(offsets[-1] + len(chunk))
+        if struct.pack("<H", 1) != struct.pack("=H", 1):
+            offsets.byteswap()
+        return _MAGIC + struct.pack("<I", len(encoded)) + offsets.tobytes() + b"".join(encoded)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "ValuePool":
+        if not data.startswith(_MAGIC):
+            raise ValueError("File di pool non riconosciuto.")
+        pos = len(_MAGIC)
+        (count,) = struct.unpack_from("<I", data, pos)
+        pos += 4
+        offsets = array("I")
+        offsets.frombytes(data[pos:pos + 4 * (count + 1)])
+        if struct.pack("<H", 1) != struct.pack("=H", 1):
+            offsets.byteswap()
+        blob = memoryview(data)[pos + 4 * (count + 1):]
+        if len(offsets) != count + 1 or len(blob) != offsets[-1]:
+            raise ValueError("File di pool troncato o corrotto.")
+        return cls([bytes(blob[offsets[i]:offsets[i + 1]]).decode("utf-8") for i in range(count)])
+
+
+def build_pool(locale: str, method: str, seed: int, size: int = DEFAULT_POOL_SIZE) -> ValuePool:
+    """
+    Genera in modo deterministico un pool di `size` valori invocando il metodo Faker
+    `method` con una sorgente dedicata, inizializzata da (locale, metodo, seed).
+    """
+    rng = RandomSource(seed=f"{locale}:{method}:{seed}", locale=locale)
+    faker_func = getattr(rng.fake, method)
+    return ValuePool([str(faker_func()) for _ in range(size)])
+
+
+class ValuePoolCache:
+    """
+    Cache dei pool su disco (più una copia in memoria per processo).
+    Ogni pool è identificato da (locale, metodo, seed, dimensione, versione di Faker):
+    le esecuzioni successive con lo stesso schema leggono il file invece di invocare Faker.
+    """
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or default_cache_dir()
+        self._memory: Dict[str, ValuePool] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _key(self, locale: str, method: str, seed: int, size: int) -> str:
+        import faker
+        material = f"{faker.VERSION}|{locale}|{method}|{seed}|{size}".encode("utf-8")
+        return hashlib.sha256(material).hexdigest()[:32]
+
+    def path_for(self, locale: str, method: str, seed: int, size: int) -> str:
+        return os.path.join(self.cache_dir, f"{method}-{self._key(locale, method, seed, size)}.pool")
+
+    def get(self, locale: str, method: str, seed: int, size: int = DEFAULT_POOL_SIZE) -> ValuePool:
+        """Restituisce il pool richiesto, caricandolo dalla cache o generandolo (e salvandolo)."""
+        key = self._key(locale, method, seed, size)
+        pool = self._memory.get(key)
+        if pool is not None:
+            return pool
+
+        path = self.path_for(locale, method, seed, size)
+        try:
+            with open(path, "rb") as f:
+                pool = ValuePool.from_bytes(f.read())
+            self.hits += 1
+        except (OSError, ValueError):
+            self.misses += 1
+            pool = build_pool(locale, method, seed, size)
+            self._store(path, pool)
+
+        self._memory[key] = pool
+        return pool
+
+    @staticmethod
+    def _store(path: str, pool: ValuePool) -> None:
+        """Scrittura atomica (file temporaneo + rename): la cache non resta mai a metà."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(pool.to_bytes())
+            os.replace(tmp_path, path)
+        except OSError:
+            # Cache non scrivibile: il pool resta comunque valido in memoria
+            pass
@@ -0,0 +1,166 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+# Ensure project root is on path (serve per importare "src.*")
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import src.llm.v2olama_chat as v2chat
+from src.llm.embedding_store import EmbeddingStore
+
+
+class FakeEmbedClient:
+    """Embedding finto: conteggio delle lettere a-z (testi simili -> vettori simili)."""
+    embed_model = "fake-embed:latest"
+
+    def __init__(self):
+        self.calls = []
+
+    def embed(self, text, model=None, timeout=None):
+        self.calls.append((text, model))
+        vector = [0.0] * 26
+        for ch in text.lower():
+            if "a" <= ch <= "z":
+                vector[ord(ch) - ord("a")] += 1.0
+        return vector
+
+    def embed_many(self, texts, model=None):
+        self.batches = getattr(self, "batches", 0) + 1
+        return [self.embed(text, model=model) for text in texts]
+
+
+def test_unit_store_memoizes_and_persists(tmp_path):
+    client = FakeEmbedClient()
+    store = EmbeddingStore(str(tmp_path), client=client)
+    first = store.embed("ciao mondo")
+    again = store.embed("ciao mondo")
+    store.embed("altro testo")
+
+    assert np.array_equal(first, again)
+    assert [text for text, _ in client.calls] == ["ciao mondo", "altro testo"]
+    assert client.calls[0][1] == "fake-embed:latest"
+    assert (store.hits, store.misses, len(store)) == (1, 2, 2)
+    assert sorted(os.listdir(tmp_path)) == [
+        "fake-embed_latest.f32", "fake-embed_latest.json", "fake-embed_latest.keys", "fake-embed_latest.texts"]
+
+    reopened_client = FakeEmbedClient()
+    reopened = EmbeddingStore(str(tmp_path), client=reopened_client)
+    assert isinstance(reopened.vectors, np.memmap)
+    assert reopened.vectors.shape == (2, 26) and reopened.vectors.dtype == np.float32
+    assert np.array_equal(reopened.embed("ciao mondo"), first)
+    assert "altro testo" in reopened and reopened.get("mai visto") is None
+    assert reopened_client.calls == []
+
+
+def test_unit_store_recovers_interrupted_write(tmp_path):
+    store = EmbeddingStore(str(tmp_path), client=FakeEmbedClient())
+    for text in ("uno", "due", "tre"):
+        store.embed(text)
+    # Simula una scrittura interrotta: ultima riga della matrice troncata
+    matrix_path = os.path.join(str(tmp_path), "fake-embed_latest.f32")
+    with open(matrix_path, "r+b") as f:
+        f.truncate(os.path.getsize(matrix_path) - 10)
+
+    recovered = EmbeddingStore(str(tmp_path), client=FakeEmbedClient())
+    assert len(recovered) == 2 and "tre" not in recovered
+    recovered.embed("quattro")
+    assert len(EmbeddingStore(str(tmp_path), client=FakeEmbedClient())) == 3
+
+
+def test_unit_store_search_and_near_duplicates(tmp_path, monkeypatch):
+    client = FakeEmbedClient()
+    store = EmbeddingStore(str(tmp_path), client=client)
+    texts = ["spedizione in ritardo", "spedizione in ritardo!", "prodotto ottimo", "consegna veloce",
+             "pessimo servizio clienti", "ottimo prodotto", "rimborso mai arrivato"]
+    for text in texts:
+        store.embed(text)
+    monkeypatch.setattr(EmbeddingStore, "SEARCH_BATCH_SIZE", 3)
+
+    query = np.asarray(client.embed("prodotto ottimo"), dtype=np.float32)
+    results = store.search(query, k=3)
+    matrix = np.asarray(store.vectors)
+    expected = (matrix @ query) / (np.linalg.norm(matrix, axis=1) * np.linalg.norm(query))
+    assert [score for _, score in results] == pytest.approx(sorted(expected, reverse=True)[:3], rel=1e-5)
+    assert {text for text, _ in results[:2]} == {"prodotto ottimo", "ottimo prodotto"}
+    assert store.search(query, k=0) == []
+
+    # Un testo di query non viene aggiunto all'archivio (salvo memoize=True)
+    results = store.search("servizio pessimo", k=2)
+    assert results[0][0] == "pessimo servizio clienti" and "servizio pessimo" not in store
+    store.search("servizio pessimo", k=2, memoize=True)
+    assert "servizio pessimo" in store
+
+    pairs = store.near_duplicates(texts, threshold=0.99)
+    assert {(i, j) for i, j, _ in pairs} == {(0, 1), (2, 5)}
+
+
+def test_unit_store_near_duplicates_tiled(tmp_path, monkeypatch):
+    store = EmbeddingStore(str(tmp_path), client=FakeEmbedClient())
+    texts = [f"record {'ab' * (i % 7)} {'xyz'[i % 3] * (i % 5)}" for i in range(40)]
+    monkeypatch.setattr(EmbeddingStore, "DUPLICATE_BLOCK_SIZE", 6)
+
+    pairs = store.near_duplicates(texts, threshold=0.98)
+
+    matrix = store.embed_many(texts)
+    unit = matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+    full = unit @ unit.T
+    expected = [(i, j) for i in range(40) for j in range(i + 1, 40) if full[i, j] >= 0.98]
+    assert [(i, j) for i, j, _ in pairs] == expected
+    assert [score for *_, score in pairs] == pytest.approx([full[i, j] for i, j in expected], rel=1e-5)
+
+
+def test_unit_store_texts_persist_and_legacy_store(tmp_path):
+    store = EmbeddingStore(str(tmp_path), client=FakeEmbedClient())
+    store.embed_many(["riga uno", "riga\ndue"])
+    assert EmbeddingStore(str(tmp_path), client=FakeEmbedClient()).texts == ["riga uno", "riga\ndue"]
+
+    # Archivio creato senza file dei testi: la ricerca restituisce None per quelle righe
+    os.remove(os.path.join(str(tmp_path), "fake-embed_latest.texts"))
+    legacy = EmbeddingStore(str(tmp_path), client=FakeEmbedClient())
+    legacy.embed("riga tre")
+    assert legacy.texts == [None, None, "riga tre"]
+    assert EmbeddingStore(str(tmp_path), client=FakeEmbedClient()).search("riga tre", k=1)[0][0] == "riga tre"
+
+
+def test_unit_chat_embed_message_uses_store(tmp_path):
+    client = FakeEmbedClient()
+    chat = v2chat.V2OlamaChat(system="S", embeddings=EmbeddingStore(str(tmp_path), client=client))
+    assert chat.embed_message("abc") == chat.embed_message("abc")
+    assert isinstance(chat.embed_message("abc"), list)
+    assert len(client.calls) == 1
+
+
+def test_unit_store_embed_many_single_batch(tmp_path):
+    client = FakeEmbedClient()
+    store = EmbeddingStore(str(tmp_path), client=client)
+    store.embed("uno")
+
+    matrix = store.embed_many(["uno", "due", "tre", "due"])
+
+    assert matrix.shape == (4, 26)
+    assert np.array_equal(matrix[1], matrix[3])
+    assert client.batches == 1
+    assert [text for text, _ in client.calls] == ["uno", "due", "tre"]
+    assert store.embed_many([]).shape == (0, 26)
+
+
+def test_unit_store_normalizes_both_endpoints(tmp_path):
+    class ScaledBatchClient(FakeEmbedClient):
+        """Come /api/embed: il batch restituisce vettori normalizzati, il singolo no."""
+        def embed_many(self, texts, model=None):
+            return [list(np.asarray(v) / np.linalg.norm(v)) for v in super().embed_many(texts, model=model)]
+
+    single = EmbeddingStore(str(tmp_path / "single"), client=ScaledBatchClient())
+    batch = EmbeddingStore(str(tmp_path / "batch"), client=ScaledBatchClient())
+
+    from_single = single.embed("testo ripetuto")
+    from_batch = batch.embed_many(["testo ripetuto"])[0]
+
+    assert np.allclose(from_single, from_batch)
+    assert np.linalg.norm(from_single) == pytest.approx(1.0)
+    assert np.allclose(single.get("testo ripetuto"), batch.get("testo ripetuto"))
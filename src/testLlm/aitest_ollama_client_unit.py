@@ -0,0 +1,261 @@
+import os
+import sys
+import json
+import threading
+import time
+from concurrent.futures import CancelledError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+# Ensure project root is on path (serve per importare "src.*")
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import src.llm.v2Olama as v2Olama
+import src.llm.v2olama_chat as v2chat
+
+
+class FakeOllamaHandler(BaseHTTPRequestHandler):
+    """Server Ollama finto: HTTP/1.1 keep-alive, registra la porta client di ogni richiesta."""
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((self.client_address[1], self.path, body))
+        with self.server.lock:
+            self.server.in_flight += 1
+            self.server.peak = max(self.server.peak, self.server.in_flight)
+        # Prompt "sleep:<secondi>:..." -> risposta ritardata; "fail:..." -> errore 500
+        if body.get("prompt", "").startswith("sleep:"):
+            time.sleep(float(body["prompt"].split(":")[1]))
+        with self.server.lock:
+            self.server.in_flight -= 1
+        if body.get("prompt", "").startswith("fail:"):
+            self.send_response(500)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/api/embed" and not self.server.batch:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/api/generate":
+            payload = {"response": f"echo:{body['prompt']}"}
+        elif self.path == "/api/embed":
+            payload = {"embeddings": [[float(len(text)), 1.0] for text in body["input"]]}
+        else:
+            payload = {"embedding": [float(len(body["prompt"])), 0.5]}
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def fake_ollama():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), FakeOllamaHandler)
+    server.requests = []
+    server.lock = threading.Lock()
+    server.in_flight = server.peak = 0
+    server.batch = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_unit_client_reuses_connection(fake_ollama):
+    url = f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+    with v2Olama.OllamaClient(base_url=url + "/", model="m1", embed_model="e1") as client:
+        assert client.generate("SYS", "p1") == "echo:p1"
+        assert client.generate("SYS", "p2", temperature=0.1, model="m2") == "echo:p2"
+        assert client.embed("abc") == [3.0, 0.5]
+
+    ports = {port for port, _, _ in fake_ollama.requests}
+    assert len(ports) == 1  # una sola connessione TCP per tre chiamate
+    bodies = [body for _, _, body in fake_ollama.requests]
+    assert bodies[0]["model"] == "m1" and bodies[0]["system"] == "SYS"
+    assert bodies[1]["model"] == "m2" and bodies[1]["options"]["temperature"] == 0.1
+    assert bodies[2] == {"model": "e1", "prompt": "abc"}
+
+
+def test_unit_client_timeouts_and_pool(monkeypatch):
+    client = v2Olama.OllamaClient(base_url="http://ollama:1234", connect_timeout=2,
+                                  generate_timeout=30, embed_timeout=9, pool_size=4)
+    calls = []
+
+    class FakeResponse:
+        def __init__(self, payload):
+            self.payload = payload
+
+        def raise_for_status(self):
+            pass
+
+        def json(self):
+            return self.payload
+
+    def fake_post(url, json, timeout):
+        calls.append((url, timeout))
+        return FakeResponse({"response": "ok", "embedding": [1.0]})
+
+    monkeypatch.setattr(client.session, "post", fake_post)
+    client.generate("s", "p")
+    client.embed("t")
+
+    assert calls == [("http://ollama:1234/api/generate", (2, 30)), ("http://ollama:1234/api/embeddings", (2, 9))]
+    adapter = client.session.get_adapter("http://ollama:1234")
+    assert adapter._pool_maxsize == 4 and adapter._pool_block is True
+    with pytest.raises(ValueError):
+        v2Olama.OllamaClient(pool_size=0)
+
+
+def test_unit_shared_client_used_by_chat(fake_ollama):
+    url = f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+    v2Olama.set_client(v2Olama.OllamaClient(base_url=url))
+    try:
+        assert v2Olama.get_client() is v2Olama.get_client()
+        first = v2chat.V2OlamaChat(system="A")
+        second = v2chat.V2OlamaChat(system="B")
+        assert first.send_message("x") == "echo:x"
+        assert second.send_message("y") == "echo:y"
+        assert len({port for port, _, _ in fake_ollama.requests}) == 1
+    finally:
+        v2Olama.set_client(None)
+
+    dedicated = v2Olama.OllamaClient(base_url=url)
+    chat = v2chat.V2OlamaChat(model="custom", system="C", client=dedicated)
+    assert chat.send_message("z") == "echo:z"
+    assert fake_ollama.requests[-1][2]["model"] == "custom"
+    dedicated.close()
+
+
+def test_unit_generate_many_ordered_and_bounded(fake_ollama):
+    url = f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+    client = v2Olama.OllamaClient(base_url=url, pool_size=8)
+    # I primi prompt sono i più lenti: terminano dopo quelli successivi
+    prompts = [f"sleep:{0.01 * (12 - i)}:{i}" for i in range(12)]
+
+    results = v2Olama.generate_many("SYS", prompts, max_in_flight=4, client=client)
+
+    assert results == [f"echo:{p}" for p in prompts]
+    assert 1 < fake_ollama.peak <= 4
+    assert v2Olama.generate_many("SYS", [], client=client) == []
+    with pytest.raises(ValueError):
+        v2Olama.generate_many("SYS", ["x"], max_in_flight=-1, client=client)
+    client.close()
+
+
+def test_unit_generate_many_errors_and_cancel(fake_ollama):
+    import requests
+    url = f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+    client = v2Olama.OllamaClient(base_url=url)
+
+    mixed = v2Olama.generate_many("SYS", ["a", "fail:b", "c"], return_exceptions=True, client=client)
+    assert mixed[0] == "echo:a" and mixed[2] == "echo:c"
+    assert isinstance(mixed[1], requests.HTTPError)
+    with pytest.raises(requests.HTTPError):
+        v2Olama.generate_many("SYS", ["a", "fail:b", "c"], client=client)
+
+    # Timeout per singola richiesta
+    slow = v2Olama.generate_many("SYS", ["sleep:0.5:x"], timeout=0.05, return_exceptions=True, client=client)
+    assert isinstance(slow[0], requests.Timeout)
+
+    # Annullamento: con una sola richiesta alla volta i prompt in coda non partono
+    cancel = threading.Event()
+    threading.Timer(0.05, cancel.set).start()
+    sent_before = len(fake_ollama.requests)
+    results = v2Olama.generate_many("SYS", [f"sleep:0.1:{i}" for i in range(10)], max_in_flight=1,
+                                    cancel=cancel, return_exceptions=True, client=client)
+    assert results[0] == "echo:sleep:0.1:0"
+    assert all(isinstance(r, CancelledError) for r in results[1:])
+    assert len(fake_ollama.requests) - sent_before == 1
+    client.close()
+
+
+def test_unit_chat_send_many(monkeypatch):
+    class FakeClient:
+        pool_size = 3
+
+        def generate(self, system, prompt, temperature=0.7, model=None, timeout=None):
+            time.sleep(0.01 * (3 - int(prompt)))
+            return f"{system}:{prompt}:{model}"
+
+    chat = v2chat.V2OlamaChat(model="m", system="S", client=FakeClient())
+    assert chat.send_many(["0", "1", "2"]) == ["S:0:m", "S:1:m", "S:2:m"]
+    assert chat.history == [("user", "0"), ("assistant", "S:0:m"), ("user", "1"), ("assistant", "S:1:m"),
+                            ("user", "2"), ("assistant", "S:2:m")]
+
+
+def test_unit_embed_many_batches_and_dedupes(fake_ollama):
+    url = f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+    client = v2Olama.OllamaClient(base_url=url)
+    texts = ["a", "bb", "a", "ccc", "dddd", "bb", "eeeee"]
+
+    vectors = client.embed_many(texts, batch_size=2)
+
+    assert vectors == [[float(len(t)), 1.0] for t in texts]
+    batches = [body["input"] for _, path, body in fake_ollama.requests if path == "/api/embed"]
+    assert sorted(batches) == [["a", "bb"], ["ccc", "dddd"], ["eeeee"]]
+    assert client.batch_embed is True and client.embed_many([]) == []
+    client.close()
+
+
+def test_unit_embed_many_falls_back_to_single_requests(fake_ollama):
+    fake_ollama.batch = False
+    url = f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+    client = v2Olama.OllamaClient(base_url=url)
+
+    assert client.embed_many(["xy", "xy", "z"]) == [[2.0, 0.5], [2.0, 0.5], [1.0, 0.5]]
+    assert client.embed_many(["uvw"]) == [[3.0, 0.5]]
+    paths = [path for _, path, _ in fake_ollama.requests]
+    assert paths.count("/api/embed") == 1  # il mancato supporto viene ricordato
+    assert paths.count("/api/embeddings") == 3
+    assert client.batch_embed is False
+    client.close()
+
+
+def test_unit_coalescer_merges_concurrent_embeds(fake_ollama):
+    url = f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+    client = v2Olama.OllamaClient(base_url=url)
+    coalescer = v2Olama.EmbedCoalescer(client, window=0.1, max_batch=100)
+    texts = ["t" * (i + 1) for i in range(20)]
+    results = [None] * len(texts)
+
+    def worker(i):
+        results[i] = coalescer.embed(texts[i])
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(len(texts))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results == [[float(len(t)), 1.0] for t in texts]
+    assert coalescer.batches < 5
+    assert len([1 for _, path, _ in fake_ollama.requests if path == "/api/embed"]) == coalescer.batches
+    client.close()
+
+
+def test_unit_module_embed_uses_legacy_endpoint_by_default(fake_ollama):
+    url = f"http://127.0.0.1:{fake_ollama.server_address[1]}"
+    if "OLLAMA_EMBED_WINDOW_MS" in os.environ:
+        pytest.skip("accorpamento delle embed() attivato da OLLAMA_EMBED_WINDOW_MS")
+    assert v2Olama._coalescer.window == 0
+    client = v2Olama.OllamaClient(base_url=url)
+    v2Olama.set_client(client)
+    try:
+        start = time.perf_counter()
+        assert v2Olama.embed("abc") == [3.0, 0.5]
+        assert time.perf_counter() - start < 1
+    finally:
+        v2Olama.set_client(None)
+    assert [path for _, path, _ in fake_ollama.requests] == ["/api/embeddings"]
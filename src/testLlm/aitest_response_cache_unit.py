@@ -0,0 +1,104 @@
+import os
+import sys
+from unittest.mock import patch
+
+import pytest
+
+# Ensure project root is on path (serve per importare "src.*")
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import src.llm.v2Olama as v2Olama
+from src.llm.response_cache import ResponseCache
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self.payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self.payload
+
+
+@pytest.fixture
+def counting_client(tmp_path, monkeypatch):
+    def make(**cache_kwargs):
+        client = v2Olama.OllamaClient(base_url="http://ollama",
+                                      cache=ResponseCache(str(tmp_path / "llm.sqlite3"), **cache_kwargs))
+        client.calls = []
+
+        def fake_post(url, json, timeout):
+            client.calls.append(json)
+            return FakeResponse({"response": f"r:{json.get('prompt')}", "embedding": [0.1, 0.2]})
+
+        monkeypatch.setattr(client.session, "post", fake_post)
+        return client
+    return make
+
+
+def test_unit_cache_hits_identical_requests(counting_client):
+    client = counting_client()
+    assert client.generate("S", "p") == "r:p"
+    assert client.generate("S", "p") == "r:p"
+    assert client.generate("S", "p", temperature=0.2) == "r:p"
+    assert client.embed("p") == [0.1, 0.2]
+    assert client.embed("p") == [0.1, 0.2]
+
+    assert len(client.calls) == 3  # generate, generate (altra temperatura), embed
+    stats = client.cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (2, 3, 3)
+    client.close()
+
+
+def test_unit_cache_persistent_and_read_only(counting_client):
+    first = counting_client()
+    first.generate("S", "saved")
+    first.close()
+
+    ci = counting_client(read_only=True)
+    assert ci.generate("S", "saved") == "r:saved"
+    assert ci.generate("S", "new") == "r:new"
+    assert ci.generate("S", "new") == "r:new"
+    assert len(ci.calls) == 2  # le risposte nuove non vengono salvate
+    assert ci.cache.stats()["entries"] == 1
+    ci.close()
+
+    empty = ResponseCache("missing/dir/llm.sqlite3", read_only=True)
+    assert empty.get("/api/generate", {"prompt": "x"}) is None
+    assert not os.path.exists("missing")
+
+
+def test_unit_cache_eviction_by_age_and_size(tmp_path):
+    cache = ResponseCache(str(tmp_path / "c.sqlite3"), max_age=60, max_bytes=100)
+    with patch("src.llm.response_cache.time.time", return_value=1000.0):
+        cache.put("/api/generate", {"prompt": "old"}, {"response": "x" * 30})
+    with patch("src.llm.response_cache.time.time", return_value=1050.0):
+        cache.put("/api/generate", {"prompt": "a"}, {"response": "a" * 30})
+        cache.put("/api/generate", {"prompt": "b"}, {"response": "b" * 30})
+    with patch("src.llm.response_cache.time.time", return_value=1070.0):
+        assert cache.get("/api/generate", {"prompt": "old"}) is None  # scaduta
+        assert cache.get("/api/generate", {"prompt": "a"}) is not None  # ora la più recente
+        cache.put("/api/generate", {"prompt": "c"}, {"response": "c" * 30})
+        cache.evict()
+        remaining = {p for p in "abc" if cache.get("/api/generate", {"prompt": p}) is not None}
+
+    assert remaining == {"a", "c"}  # "old" scaduta, "b" la meno usata oltre max_bytes
+    assert cache.stats()["bytes"] <= 100
+    cache.close()
+
+
+def test_unit_cache_closed_is_noop(counting_client):
+    client = counting_client()
+    client.cache.close()
+
+    # Cache chiusa (es. client sostituito con set_client mentre un altro thread lo usa)
+    assert client.generate("S", "p") == "r:p"
+    client.cache.evict()
+    client.cache.clear()
+    client.cache.close()
+    assert client.cache.stats()["entries"] == 0
+    assert len(client.calls) == 1
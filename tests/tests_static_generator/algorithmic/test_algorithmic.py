@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 from src.static_generator.algorithmic import get_generator, fake
 
 # ==============================================================================
@@ -222,12 +222,16 @@ def test_string_generator_formats_extended():
 # (Sostituisce il vecchio test ridondante su metodo non esistente)
 # ==============================================================================
 def test_string_generator_exception_handling():
-    with patch.object(fake, 'first_name', side_effect=Exception("Boom!")):
-        props = {"type": "string", "format": "first_name"}
-        gen = get_generator("test_crash", props)
-        value = gen.generate()
-        assert isinstance(value, str)
-        assert len(value) > 0
+    props = {"type": "string", "format": "first_name"}
+    gen = get_generator("test_crash", props)
+    assert (gen.faker_method, gen.fallback) == ("first_name", False)
+    # Il metodo risolto alla costruzione fallisce alla chiamata: si ricade su word()
+    crash = MagicMock(side_effect=Exception("Boom!"))
+    gen._bound = (fake, crash)
+    value = gen.generate()
+    crash.assert_called_once_with()
+    assert isinstance(value, str)
+    assert len(value) > 0
 
 # ==============================================================================
 # TC-023: White Box (Robustness) - Array Min/Max invertiti
@@ -260,4 +264,129 @@ def test_array_generator_default_fallback():
     value = gen.generate()
     assert isinstance(value, list)
     assert len(value) == 3
-    assert isinstance(value[0], str)
\ No newline at end of file
+    assert isinstance(value[0], str)
+
+# ==============================================================================
+# TC-026: White Box (Compilazione) - Oggetti annidati precompilati
+# Verifica che i generatori dei sotto-campi siano costruiti una sola volta e riusati.
+# ==============================================================================
+def test_object_generator_children_precompiled():
+    props = {"type": "object", "fields": {"id": {"type": "integer"}, "tags": {"type": "array", "item_type": "integer"}}}
+    gen = get_generator("obj", props)
+    children = gen.children
+
+    first = gen.generate()
+    second = gen.generate()
+
+    assert gen.children is children
+    assert [name for name, _ in children] == ["id", "tags"]
+    assert set(first) == set(second) == {"id", "tags"}
+    assert gen.children[1][1].item_generator is not None
+
+# ==============================================================================
+# TC-027: BVA (Modalità Colonnare) - Interi, Float e Scelte vettorizzati
+# Verifica limiti, arrotondamento e pesi nulli nella generazione a colonne NumPy.
+# ==============================================================================
+def test_generate_column_vectorized_bounds():
+    np = pytest.importorskip("numpy")
+    np_rng = np.random.default_rng(0)
+
+    ints = get_generator("n", {"type": "integer", "min_value": 1, "max_value": 3}).generate_column(500, np_rng)
+    floats = get_generator("f", {"type": "float", "min_value": -1.0, "max_value": 1.0, "decimal_places": 1}).generate_column(500, np_rng)
+    choices = get_generator("c", {"type": "choice", "options": ["A", "B", "C"], "weights": [0, 1, 0]}).generate_column(500, np_rng)
+
+    assert set(ints) == {1, 2, 3}
+    assert all(isinstance(v, int) for v in ints)
+    assert all(-1.0 <= v <= 1.0 and v == round(v, 1) for v in floats)
+    assert choices == ["B"] * 500
+    assert get_generator("c", {"type": "choice"}).generate_column(3, np_rng) == [None, None, None]
+
+
+# ==============================================================================
+# TC-028: White Box (Compilazione) - Metodo Faker risolto una sola volta
+# Verifica che il formato venga risolto alla costruzione e non a ogni valore.
+# ==============================================================================
+def test_string_generator_resolves_method_once():
+    gen = get_generator("citta", {"type": "string", "faker": "city"})
+    unknown = get_generator("x", {"type": "string", "faker": "unknown"})
+    plain = get_generator("y", {"type": "string"})
+
+    assert (gen.faker_method, gen.fallback) == ("city", False)
+    assert (unknown.faker_method, unknown.fallback) == ("word", True)
+    assert (plain.faker_method, plain.fallback) == ("word", False)
+
+    gen.generate()
+    bound = gen._bound
+    values = [gen.generate() for _ in range(5)]
+    assert gen._bound is bound
+    assert all(isinstance(v, str) and v for v in values)
+
+# ==============================================================================
+# TC-029: White Box (Tabella Alias) - Estrazione pesata precompilata
+# Verifica riproducibilità con seed, equivalenza del percorso batch,
+# frequenze coerenti con i pesi e rifiuto di pesi non validi.
+# ==============================================================================
+def test_choice_generator_alias_table():
+    from collections import Counter
+    from src.static_generator.rng import RandomSource
+
+    gen = get_generator("c", {"type": "choice", "options": ["A", "B", "C", "D"], "weights": [1, 0, 3, 6]})
+    first = gen.generate(RandomSource(seed=7))
+    rng = RandomSource(seed=7)
+    sequence = [gen.generate(rng) for _ in range(20000)]
+
+    assert first == sequence[0]
+    assert gen.generate_many(20000, RandomSource(seed=7)) == sequence
+    counts = Counter(sequence)
+    assert "B" not in counts
+    assert abs(counts["A"] / 20000 - 0.1) < 0.02
+    assert abs(counts["C"] / 20000 - 0.3) < 0.02
+    assert abs(counts["D"] / 20000 - 0.6) < 0.02
+
+    with pytest.raises(ValueError):
+        get_generator("c", {"type": "choice", "options": ["A", "B"], "weights": [1]})
+    with pytest.raises(ValueError):
+        get_generator("c", {"type": "choice", "options": ["A"], "weights": [0]})
+
+# ==============================================================================
+# TC-030: White Box (UUID dai bit casuali) - Versioni 4 e 7
+# Verifica che la v4 coincida con fake.uuid4() a parità di seed, che le colonne NumPy
+# abbiano versione e variante corrette e che la v7 sia crescente nell'ordine di generazione.
+# ==============================================================================
+def test_uuid_generator_versions():
+    import uuid
+    np = pytest.importorskip("numpy")
+    from src.static_generator.rng import RandomSource
+
+    gen = get_generator("id", {"type": "uuid"})
+    rng, reference = RandomSource(seed=3), RandomSource(seed=3)
+    assert [gen.generate(rng) for _ in range(100)] == [reference.fake.uuid4() for _ in range(100)]
+
+    column = gen.generate_column(500, np.random.default_rng(0))
+    assert len(set(column)) == 500
+    assert all(uuid.UUID(v).version == 4 and uuid.UUID(v).variant == uuid.RFC_4122 for v in column)
+
+    gen7 = get_generator("id", {"type": "uuid", "version": 7})
+    values = [gen7.generate(rng) for _ in range(300)] + gen7.generate_column(300, np.random.default_rng(0))
+    assert values == sorted(values)
+    assert len(set(values)) == 600
+    assert all(uuid.UUID(v).version == 7 and uuid.UUID(v).variant == uuid.RFC_4122 for v in values)
+
+    with pytest.raises(ValueError):
+        get_generator("id", {"type": "uuid", "version": 1})
+
+# ==============================================================================
+# TC-031: Robustness (Compilazione) - Metodi Faker non dei provider
+# Verifica che la risoluzione non invochi il metodo: seed_instance, seed e parse
+# ricadono sul fallback senza toccare lo stato dell'istanza condivisa.
+# ==============================================================================
+def test_string_generator_does_not_call_faker_methods():
+    state = fake.random.getstate()
+    with patch.object(type(fake), "seed_instance") as seed_instance:
+        gens = [get_generator(name, {"type": "string", "faker": name})
+                for name in ("seed_instance", "seed", "parse", "add_provider")]
+
+    seed_instance.assert_not_called()
+    assert fake.random.getstate() == state
+    assert all((g.faker_method, g.fallback) == ("word", True) for g in gens)
+    assert get_generator("e", {"type": "string", "format": "email"}).fallback is False
@@ -0,0 +1,87 @@
+import json
+import pytest
+
+from src.run import app
+
+
+SCHEMA = json.dumps({"type": "object", "properties": {
+    "id": {"type": "integer", "min_value": 1, "max_value": 1000},
+    "tags": {"type": "array", "items": {"type": "string"}, "min_items": 1, "max_items": 2},
+}})
+
+
+@pytest.fixture
+def client():
+    app.config["TESTING"] = True
+    return app.test_client()
+
+
+def stream(client, **payload):
+    return client.post("/api/schema/stream", json={"content": SCHEMA, "count": 5, "seed": 1, **payload})
+
+
+# =============================================================================
+# SUITE: API Flask
+# MODULE: run.py
+# STRATEGY: WECT (Formati), Robustness (Opzioni non valide prima degli header)
+# =============================================================================
+
+# TC-A01: WECT Valid (Streaming nei Formati Supportati)
+@pytest.mark.parametrize("payload, mimetype", [
+    ({"format": "ndjson"}, "application/x-ndjson"),
+    ({"format": "csv", "csv_arrays": "join"}, "text/csv"),
+    ({"format": "sql", "sql_mode": "multi", "sql_batch_size": "2"}, "text/plain"),
+])
+def test_stream_formats(client, payload, mimetype):
+    response = stream(client, **payload)
+
+    assert response.status_code == 200
+    assert response.mimetype == mimetype
+    body = response.get_data(as_text=True)
+    if payload["format"] == "ndjson":
+        assert len(body.splitlines()) == 5
+    elif payload["format"] == "sql":
+        # sql_batch_size come stringa viene convertito: 3 statement da al più 2 righe
+        assert body.count("INSERT INTO") == 3
+
+
+# TC-A02: Robustness (Opzioni Non Valide)
+# Obiettivo: Le opzioni non valide producono 400 prima di inviare gli header,
+# non un errore durante lo streaming della risposta.
+@pytest.mark.parametrize("payload", [
+    {"format": "sql", "sql_mode": "merge"},
+    {"format": "sql", "sql_batch_size": "tanti"},
+    {"format": "sql", "sql_batch_size": 0},
+    {"format": "csv", "csv_arrays": "semicolon"},
+    {"format": "xml"},
+    {"count": "molti"},
+    {"count": -1},
+])
+def test_stream_invalid_options(client, payload):
+    response = stream(client, **payload)
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+# TC-A03: Robustness (Schema Malformato)
+@pytest.mark.parametrize("content", ["{non json", json.dumps({"type": "array"}), json.dumps([1, 2])])
+def test_stream_malformed_schema(client, content):
+    response = client.post("/api/schema/stream", json={"content": content, "format": "ndjson"})
+
+    assert response.status_code == 400
+    assert response.get_json()["success"] is False
+
+
+# TC-A04: WECT Valid (Stream Equivalente a Generate)
+# Obiettivo: Il frontend usa /api/schema/stream: per ogni formato il testo è lo stesso
+# restituito da /api/schema/generate (stesso seed).
+@pytest.mark.parametrize("format_type", ["json", "csv", "ndjson", "sql"])
+def test_stream_matches_generate_text(client, format_type):
+    payload = {"content": SCHEMA, "count": 5, "seed": 7, "format": format_type}
+
+    generated = client.post("/api/schema/generate", json=payload).get_json()
+    streamed = client.post("/api/schema/stream", json=payload)
+
+    assert streamed.status_code == 200
+    assert streamed.get_data(as_text=True) == generated["text"]
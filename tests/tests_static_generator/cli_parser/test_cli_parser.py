@@ -27,6 +27,17 @@ def test_parse_args_minimal():
     assert args.format == 'json'
     assert args.table_name == 'my_table'
     assert args.verbose is False
+    assert args.columnar is False
+    assert args.workers is None
+    assert args.faker_pool is None
+    assert args.pool_cache is None
+    assert args.sql_mode == 'insert'
+    assert args.sql_batch is None
+    assert args.compress_workers is None
+    assert args.shard_size is None
+    assert args.compact is False
+    assert args.json_backend == 'stdlib'
+    assert args.csv_arrays == 'json'
 
 
 # TC-P02: WECT Valid (Override Completo)
@@ -55,7 +66,7 @@ def test_parse_args_full_override():
 
 # TC-P03: WECT Valid (Tutti i Formati Supportati)
 # Obiettivo: Verificare che l'Enum 'choices' accetti tutte le opzioni permesse.
-@pytest.mark.parametrize("fmt", ['json', 'csv', 'ndjson', 'sql']) # - Test Parametrizzato per tutti i formati validi
+@pytest.mark.parametrize("fmt", ['json', 'csv', 'ndjson', 'sql', 'sqlite', 'parquet']) # - Test Parametrizzato per tutti i formati validi
 def test_parse_args_valid_formats(fmt):
     args = parse_arguments(['--schema', 's.json', '--format', fmt])
     assert args.format == fmt
@@ -194,4 +205,22 @@ def test_parse_args_no_short_flags(capsys):
         parse_arguments(['--schema', 'data.json', '-s'])  # Utente prova shortcut
 
     captured = capsys.readouterr()
-    assert "unrecognized arguments" in captured.err
\ No newline at end of file
+    assert "unrecognized arguments" in captured.err
+
+# TC-P16: WECT / BVA (Dimensione degli Shard)
+# Obiettivo: Verificare il parsing di --shard-size in record o byte e il rifiuto dei valori non validi.
+@pytest.mark.parametrize("value, expected", [
+    ("1000", ("records", 1000)),
+    ("512B", ("bytes", 512)),
+    ("64kb", ("bytes", 64 * 1024)),
+    ("2MB", ("bytes", 2 * 1024 ** 2)),
+    ("1GB", ("bytes", 1024 ** 3)),
+])
+def test_parse_shard_size(value, expected):
+    assert parse_arguments(['--schema', 's.json', '--shard-size', value]).shard_size == expected
+
+
+@pytest.mark.parametrize("value", ["0", "-5", "10TB", "abc"])
+def test_parse_shard_size_invalid(value):
+    with pytest.raises(SystemExit):
+        parse_arguments(['--schema', 's.json', '--shard-size', value])
@@ -0,0 +1,74 @@
+import bz2
+import gzip
+import lzma
+from unittest.mock import patch
+
+import pytest
+from src.static_generator.compression import CompressedTextWriter, compression_for
+
+
+# =============================================================================
+# SUITE: Output compresso in background
+# MODULE: compression.py
+# STRATEGY: WECT (Algoritmi), White Box (Thread, Blocchi), Robustness
+# =============================================================================
+
+TEXT = "".join(f'{{"id": {i}, "città": "Forlì"}}\n' for i in range(2000))
+
+
+# TC-Z01: WECT Valid - Estensioni riconosciute
+@pytest.mark.parametrize("path, expected", [
+    ("data.ndjson.gz", "gzip"), ("data.sql.BZ2", "bz2"), ("out/data.csv.xz", "xz"), ("data.json", None),
+])
+def test_compression_for(path, expected):
+    assert compression_for(path) == expected
+
+
+# TC-Z02: WECT Valid - Round trip per algoritmo, su più blocchi
+@pytest.mark.parametrize("method, opener", [("gzip", gzip.open), ("bz2", bz2.open), ("xz", lzma.open)])
+def test_compressed_writer_round_trip(tmp_path, method, opener):
+    path = str(tmp_path / f"data.{method}")
+    with patch.object(CompressedTextWriter, "BLOCK_SIZE", 1000):
+        writer = CompressedTextWriter(path, method)
+        for line in TEXT.splitlines(keepends=True):
+            writer.write(line)
+        writer.close()
+
+    with opener(path, "rt", encoding="utf-8") as f:
+        assert f.read() == TEXT
+
+
+# TC-Z03: White Box - gzip multi-membro parallelo
+def test_compressed_writer_parallel_gzip(tmp_path):
+    paths = [str(tmp_path / "a.gz"), str(tmp_path / "b.gz")]
+    with patch.object(CompressedTextWriter, "BLOCK_SIZE", 1000):
+        for path in paths:
+            writer = CompressedTextWriter(path, "gzip", workers=3)
+            for line in TEXT.splitlines(keepends=True):
+                writer.write(line)
+            writer.close()
+
+    with open(paths[0], "rb") as a, open(paths[1], "rb") as b:
+        data = a.read()
+        assert data == b.read()  # output deterministico
+    assert data.count(b"\x1f\x8b\x08") > 1  # più membri gzip
+    assert gzip.decompress(data).decode("utf-8") == TEXT
+
+
+# TC-Z04: Robustness - Errori del thread e stream chiuso
+def test_compressed_writer_errors(tmp_path):
+    with pytest.raises(ValueError):
+        CompressedTextWriter(str(tmp_path / "x.zip"), "zip")
+
+    writer = CompressedTextWriter(str(tmp_path / "x.gz"), "gzip")
+    writer.close()
+    writer.close()  # idempotente
+    with pytest.raises(ValueError):
+        writer.write("dopo la chiusura")
+
+    with patch("gzip.GzipFile.write", side_effect=OSError("Disk full")):
+        writer = CompressedTextWriter(str(tmp_path / "y.gz"), "gzip")
+        writer.write("dati")
+        with pytest.raises(OSError, match="Disk full"):
+            writer.close()
+    assert writer.closed
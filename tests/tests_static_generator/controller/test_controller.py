@@ -28,6 +28,17 @@ def mock_args():
     args.format = "json"
     args.table_name = "test_table"
     args.out = None
+    args.columnar = False
+    args.workers = None
+    args.faker_pool = None
+    args.pool_cache = None
+    args.sql_mode = "insert"
+    args.sql_batch = None
+    args.compress_workers = None
+    args.shard_size = None
+    args.compact = False
+    args.json_backend = "stdlib"
+    args.csv_arrays = "json"
     return args
 
 
@@ -44,25 +55,34 @@ def test_controller_stdout_happy_path(mock_args):
     # SETUP: Mockiamo le dipendenze per isolare il controller
     with patch("src.static_generator.controller.MockEngine") as MockEngineCls, \
             patch("src.static_generator.controller.DataExporter") as MockExporter:
-        # Simuliamo dati generati dall'Engine
+        # Simuliamo dati generati dall'Engine (iteratore in streaming)
         mock_instance = MockEngineCls.return_value
-        fake_data = [{"id": 1, "val": "test"}]
-        mock_instance.generate.return_value = fake_data
+        fake_data = iter([{"id": 1, "val": "test"}])
+        mock_instance.iter_records.return_value = fake_data
 
         # ACTION: Eseguiamo il controller
         run_generation_process(mock_args)
 
         # ASSERT (Verifiche di Interazione):
         # 1. Verifica inizializzazione Engine
-        MockEngineCls.assert_called_once_with(schema_path="dummy_schema.json", seed=42)
-        # 2. Verifica chiamata generazione
-        mock_instance.generate.assert_called_once_with(n=10)
+        MockEngineCls.assert_called_once_with(
+            schema_path="dummy_schema.json", seed=42, pool_size=None, pool_cache_dir=None
+        )
+        # 2. Verifica chiamata generazione in streaming (nessuna lista materializzata)
+        mock_instance.iter_records.assert_called_once_with(n=10, columnar=False)
+        mock_instance.generate.assert_not_called()
         # 3. Verifica esportazione su sys.stdout
         MockExporter.export.assert_called_once_with(
             data=fake_data,
             format_type="json",
             output_stream=sys.stdout,
-            table_name="test_table"
+            table_name="test_table",
+            sql_mode="insert",
+            sql_batch_size=None,
+            compact=False,
+            json_backend="stdlib",
+            fields=mock_instance.fields,
+            csv_arrays="json"
         )
 
 
@@ -87,7 +107,7 @@ def test_controller_file_output_logic(mock_args, path_input, expect_makedirs_cal
             patch("os.makedirs") as mock_makedirs:
 
         mock_instance = MockEngineCls.return_value
-        mock_instance.generate.return_value = [{"id": 1}]
+        mock_instance.iter_records.return_value = iter([{"id": 1}])
 
         # ACTION
         run_generation_process(mock_args)
@@ -141,7 +161,13 @@ def test_controller_file_output_happy_path(mock_args):
             data=[{"id": 1}],
             format_type="json",
             output_stream=file_handle,
-            table_name="test_table"
+            table_name="test_table",
+            sql_mode="insert",
+            sql_batch_size=None,
+            compact=False,
+            json_backend="stdlib",
+            fields=mock_instance.fields,
+            csv_arrays="json"
         )
 
         # 4. Verifica che il file sia stato CHIUSO
@@ -189,4 +215,143 @@ def test_controller_export_error_cleanup(mock_args):
             run_generation_process(mock_args)
 
         # VERIFICA CRUCIALE: Il file deve essere chiuso nonostante l'errore
-        mocked_file().close.assert_called_once()
\ No newline at end of file
+        mocked_file().close.assert_called_once()
+
+
+# TC-005: Interaction Testing (Modalità Colonnare)
+def test_controller_columnar_mode(mock_args):
+    """
+    Obiettivo: Verificare che con --columnar il Controller chieda all'Engine lo stream a blocchi colonnari.
+    """
+    mock_args.columnar = True
+
+    with patch("src.static_generator.controller.MockEngine") as MockEngineCls, \
+            patch("src.static_generator.controller.DataExporter") as MockExporter:
+        mock_instance = MockEngineCls.return_value
+        records = iter([{"id": 1}])
+        mock_instance.iter_records.return_value = records
+
+        run_generation_process(mock_args)
+
+        mock_instance.iter_records.assert_called_once_with(n=10, columnar=True)
+        assert MockExporter.export.call_args.kwargs["data"] is records
+
+
+# TC-007: Interaction Testing (Generazione Parallela)
+def test_controller_parallel_mode(mock_args):
+    """
+    Obiettivo: Verificare che con --workers il Controller usi la generazione parallela a shard.
+    """
+    mock_args.workers = 4
+
+    with patch("src.static_generator.controller.MockEngine") as MockEngineCls, \
+            patch("src.static_generator.controller.DataExporter") as MockExporter:
+        mock_instance = MockEngineCls.return_value
+        records = iter([{"id": 1}])
+        mock_instance.iter_parallel.return_value = records
+
+        run_generation_process(mock_args)
+
+        mock_instance.iter_parallel.assert_called_once_with(n=10, workers=4, columnar=False)
+        mock_instance.iter_records.assert_not_called()
+        assert MockExporter.export.call_args.kwargs["data"] is records
+
+
+# TC-008: Interaction Testing (Segnalazione Formati Faker non validi)
+def test_controller_reports_faker_fallbacks_once(mock_args, caplog):
+    """
+    Obiettivo: Verificare che i formati Faker non risolti vengano segnalati con un solo warning.
+    """
+    with patch("src.static_generator.controller.MockEngine") as MockEngineCls, \
+            patch("src.static_generator.controller.DataExporter"):
+        MockEngineCls.return_value.faker_fallbacks = {"a": "boh", "obj.b": "parse"}
+
+        with caplog.at_level("WARNING", logger="src.static_generator.controller"):
+            run_generation_process(mock_args)
+
+    warnings = [r.getMessage() for r in caplog.records if r.levelname == "WARNING"]
+    assert len(warnings) == 1
+    assert "2 campi" in warnings[0] and "obj.b (parse)" in warnings[0]
+
+
+# TC-006: Integration (Streaming senza Mock)
+def test_controller_streaming_ndjson(mock_args, tmp_path, capsys):
+    """
+    Obiettivo: Verificare end-to-end che l'export NDJSON consumi lo stream dell'Engine
+    e produca una riga per record.
+    """
+    schema = tmp_path / "schema.json"
+    schema.write_text('{"type": "object", "properties": {"val": {"type": "integer"}}}', encoding="utf-8")
+    mock_args.schema = str(schema)
+    mock_args.format = "ndjson"
+    mock_args.count = 250
+
+    run_generation_process(mock_args)
+
+    lines = capsys.readouterr().out.splitlines()
+    assert len(lines) == 250
+    assert all(line.startswith('{"val": ') for line in lines)
+
+
+# TC-009: Integration (Export diretto su SQLite)
+def test_controller_sqlite_export(mock_args, tmp_path):
+    """
+    Obiettivo: Verificare che il formato sqlite scriva i record nel database indicato da --out,
+    con i tipi di colonna ricavati dallo schema, e che senza --out venga sollevato un errore.
+    """
+    import sqlite3
+    schema = tmp_path / "schema.json"
+    schema.write_text('{"type": "object", "properties": {"val": {"type": "integer"}, "tag": {"type": "choice", "options": ["A"]}}}', encoding="utf-8")
+    mock_args.schema = str(schema)
+    mock_args.format = "sqlite"
+    mock_args.count = 120
+    mock_args.out = str(tmp_path / "db" / "mock.db")
+
+    run_generation_process(mock_args)
+
+    conn = sqlite3.connect(mock_args.out)
+    assert conn.execute("SELECT COUNT(*), MIN(tag), MAX(tag) FROM test_table").fetchone() == (120, "A", "A")
+    assert [row[2] for row in conn.execute("PRAGMA table_info(test_table)")] == ["INTEGER", "TEXT"]
+    conn.close()
+
+    mock_args.out = None
+    with pytest.raises(ValueError):
+        run_generation_process(mock_args)
+
+
+# TC-010: Integration (Export Parquet)
+def test_controller_parquet_export(mock_args, tmp_path):
+    """
+    Obiettivo: Verificare che il formato parquet scriva il file indicato da --out.
+    """
+    pq = pytest.importorskip("pyarrow.parquet")
+    schema = tmp_path / "schema.json"
+    schema.write_text('{"type": "object", "properties": {"val": {"type": "integer"}}}', encoding="utf-8")
+    mock_args.schema = str(schema)
+    mock_args.format = "parquet"
+    mock_args.count = 50
+    mock_args.out = str(tmp_path / "mock.parquet")
+
+    run_generation_process(mock_args)
+
+    assert pq.read_table(mock_args.out).num_rows == 50
+
+
+# TC-011: Integration (Output Compresso)
+def test_controller_compressed_output(mock_args, tmp_path):
+    """
+    Obiettivo: Verificare che un --out con estensione .gz venga compresso in modo trasparente.
+    """
+    import gzip
+    schema = tmp_path / "schema.json"
+    schema.write_text('{"type": "object", "properties": {"val": {"type": "integer"}}}', encoding="utf-8")
+    mock_args.schema = str(schema)
+    mock_args.format = "ndjson"
+    mock_args.count = 300
+    mock_args.out = str(tmp_path / "mock.ndjson.gz")
+    mock_args.compress_workers = 2
+
+    run_generation_process(mock_args)
+
+    with gzip.open(mock_args.out, "rt", encoding="utf-8") as f:
+        assert len(f.read().splitlines()) == 300
@@ -106,16 +106,17 @@ def test_generate_unsupported_type():
          (es. tipo non gestito logicamente, anche se lo schema è valido),
          l'engine NON crashi ma metta None nel campo.
          """
-    # 1. Usiamo uno schema SINTATTICAMENTE VALIDO per passare il check del Parser
-    # (Così evitiamo lo SchemaError iniziale)
-    engine = MockEngine(schema_path("valid_schema.json"))
-
-    # 2. "Sabotiamo" la funzione get_generator interna usando il Mock.
+    # 1. "Sabotiamo" la funzione get_generator interna usando il Mock.
     # Le diciamo: "Qualsiasi cosa ti chiedano, lancia un'eccezione generica".
     # IMPORTANTE: Il path nel patch deve puntare a dove viene USATA la funzione, non dove è definita.
     with patch('src.static_generator.engine.get_generator') as mock_gen:
         mock_gen.side_effect = Exception("Generatore non trovato o rotto")
 
+        # 2. Usiamo uno schema SINTATTICAMENTE VALIDO per passare il check del Parser
+        # (Così evitiamo lo SchemaError iniziale). Il piano viene compilato nel costruttore,
+        # quindi l'engine va creato mentre il patch è attivo.
+        engine = MockEngine(schema_path("valid_schema.json"))
+
         # 3. Eseguiamo la generazione
         records = engine.generate(1)
 
@@ -156,4 +157,230 @@ def test_generate_determinism_with_seed():
     from unittest.mock import patch
 
 
+# TC-014: White Box - Piano di generazione compilato una sola volta
+def test_generate_plan_compiled_once():
+    """
+    White Box: la factory get_generator deve essere invocata una sola volta per campo
+    (in fase di compilazione), indipendentemente dal numero di record generati.
+    """
+    from src.static_generator import algorithmic
+
+    with patch('src.static_generator.engine.get_generator', wraps=algorithmic.get_generator) as spy:
+        engine = MockEngine(schema_path("valid_schema.json"))
+        compiled_calls = spy.call_count
+        engine.generate(50)
+
+    assert compiled_calls == len(engine.fields)
+    assert spy.call_count == compiled_calls
+    assert isinstance(engine.plan, tuple)
+    assert [fname for fname, _ in engine.plan] == list(engine.fields.keys())
+
+
+# TC-015: White Box - Compilazione con campo non supportato
+def test_compile_unsupported_field_yields_none():
+    """
+    White Box: un campo con tipo non gestito dalla factory viene compilato in un
+    generatore segnaposto che produce sempre None, senza bloccare gli altri campi.
+    """
+    plan = MockEngine.compile({"id": {"type": "integer"}, "flag": {"type": "boolean"}})
+    values = {fname: gen.generate() for fname, gen in plan}
+
+    assert isinstance(values["id"], int)
+    assert values["flag"] is None
+
+
+# TC-016: BVA Tipico - Generazione colonnare (NumPy)
+def test_generate_batch_typical():
+    """
+    Black Box: generate_batch restituisce n record con le stesse chiavi dello schema,
+    e i valori numerici rispettano i vincoli dei generatori vettorizzati.
+    """
+    pytest.importorskip("numpy")
+    engine = MockEngine(schema_path("valid_schema.json"), seed=7)
+    records = engine.generate_batch(100)
+
+    assert len(records) == 100
+    for rec in records:
+        assert list(rec.keys()) == list(engine.fields.keys())
+
+
+# TC-017: White Box - Determinismo della modalità colonnare
+def test_generate_batch_determinism_with_seed():
+    pytest.importorskip("numpy")
+    schema = schema_path("valid_schema.json")
+
+    assert MockEngine(schema, seed=3).generate_columns(20) == MockEngine(schema, seed=3).generate_columns(20)
+    assert MockEngine(schema, seed=3).generate_batch(0) == []
+
+
+# TC-018: White Box - Stream di record (generatore)
+def test_iter_records_is_lazy():
+    """
+    White Box: iter_records restituisce un generatore che produce i record su richiesta,
+    con lo stesso risultato di generate() a parità di seed.
+    """
+    import types
+    schema = schema_path("valid_schema.json")
+
+    stream = MockEngine(schema, seed=11).iter_records(3)
+    assert isinstance(stream, types.GeneratorType)
+    assert list(stream) == MockEngine(schema, seed=11).generate(3)
+
+
+# TC-019: BVA - Stream colonnare su più blocchi
+def test_iter_records_columnar_chunks():
+    pytest.importorskip("numpy")
+    engine = MockEngine(schema_path("valid_schema.json"), seed=5)
+    engine.STREAM_CHUNK_SIZE = 4
+
+    records = list(engine.iter_records(10, columnar=True))
+    assert len(records) == 10
+
+
+# TC-020: White Box - Costruzione da dict (senza file)
+def test_engine_from_schema_dict():
+    schema = {"type": "object", "properties": {"id": {"type": "integer", "min_value": 1, "max_value": 1}}}
+    engine = MockEngine(schema=schema, seed=1)
+    assert engine.generate(2) == [{"id": 1}, {"id": 1}]
+
+
+# TC-021: White Box - Generazione parallela deterministica
+def test_generate_parallel_deterministic_across_workers():
+    """
+    White Box: con shard da 7 record, 30 record vengono divisi in 5 shard.
+    A parità di seed, l'output è identico con 1 o 3 processi, coincide con la
+    generazione seriale e non ci sono record persi.
+    """
+    def engine(seed=21):
+        e = MockEngine(schema_path("valid_schema.json"), seed=seed)
+        e.PARALLEL_SHARD_SIZE = 7
+        return e
+
+    serial = engine().generate_parallel(30, workers=1)
+    parallel = engine().generate_parallel(30, workers=3)
+
+    assert len(serial) == 30
+    assert serial == parallel
+    assert serial == engine().generate(30)
+    assert engine(seed=22).generate_parallel(30, workers=1) != serial
+
+
+# TC-022: White Box - Indipendenza dallo stato globale
+def test_engines_do_not_share_random_state():
+    """
+    White Box: due engine con lo stesso seed producono gli stessi record anche se
+    generati in modo interlacciato e con il modulo random globale rimescolato.
+    """
+    import random
+    schema = schema_path("valid_schema.json")
+    first, second = MockEngine(schema, seed=8), MockEngine(schema, seed=8)
+
+    out_first, out_second = [], []
+    for _ in range(3):
+        out_first.append(first.generate_record())
+        random.seed(123)
+        out_second.append(second.generate_record())
+
+    assert out_first == out_second
+
+
+# TC-023: White Box - Accesso diretto al record i (stream counter-based)
+def test_record_at_random_access():
+    """
+    White Box: record_at(i) e generate_range(start, stop) coincidono con la sequenza
+    prodotta da generate(), in qualunque ordine vengano richiesti.
+    """
+    schema = schema_path("valid_schema.json")
+    sequence = MockEngine(schema, seed=4).generate(12)
+    engine = MockEngine(schema, seed=4)
+
+    assert engine.record_at(9) == sequence[9]
+    assert engine.generate_range(5, 8) == sequence[5:8]
+    assert engine.record_at(0) == sequence[0]
+    # L'accesso diretto non sposta la sequenza dell'engine
+    assert engine.generate(2) == sequence[:2]
+    with pytest.raises(ValueError):
+        engine.record_at(-1)
+
+
+# TC-024: White Box - Indipendenza degli stream per campo
+def test_field_streams_are_independent():
+    """
+    White Box: aggiungere un campo allo schema non cambia i valori degli altri campi,
+    perché ogni campo ha uno stream derivato dal proprio percorso.
+    """
+    base = {"type": "object", "properties": {"a": {"type": "integer"}, "b": {"type": "choice", "options": ["X", "Y", "Z"]}}}
+    extended = {"type": "object", "properties": {"x": {"type": "string"}, "a": {"type": "integer"}, "b": {"type": "choice", "options": ["X", "Y", "Z"]}}}
+
+    records = MockEngine(schema=base, seed=6).generate(5)
+    extended_records = MockEngine(schema=extended, seed=6).generate(5)
+
+    assert [{"a": r["a"], "b": r["b"]} for r in extended_records] == records
+
+
+
+# TC-025: White Box - Pool di valori Faker con cache su disco
+def test_engine_faker_pools(tmp_path):
+    """
+    White Box: con pool_size i campi stringa estraggono dai pool precalcolati, in modo
+    deterministico; i metodi inesistenti usano il pool del metodo di fallback.
+    """
+    schema = {"type": "object", "properties": {
+        "email": {"type": "string", "format": "email"},
+        "city": {"type": "string", "faker": "city"},
+        "other": {"type": "string", "faker": "metodo_inesistente"},
+    }}
+    engine = MockEngine(schema=schema, seed=3, pool_size=20, pool_cache_dir=str(tmp_path))
+
+    assert set(engine.rng.pools) == {"email", "city", "word"}
+    records = engine.generate(30)
+    assert all(r["email"] in engine.rng.pools["email"].values for r in records)
+    assert all(r["city"] in engine.rng.pools["city"].values for r in records)
+    columns = engine.generate_columns(10)
+    assert set(columns["city"]) <= set(engine.rng.pools["city"].values)
+
+    again = MockEngine(schema=schema, seed=3, pool_size=20, pool_cache_dir=str(tmp_path))
+    assert again.generate(30) == records
+
+
+# TC-026: White Box - Formati Faker non validi risolti in compilazione
+def test_engine_reports_faker_fallbacks():
+    """
+    White Box: i formati inesistenti o non invocabili vengono individuati una volta
+    sola dal piano compilato, con il percorso completo del campo.
+    """
+    schema = {"type": "object", "properties": {
+        "ok": {"type": "string", "format": "email"},
+        "plain": {"type": "string"},
+        "bad": {"type": "string", "faker": "metodo_inesistente"},
+        "obj": {"type": "object", "fields": {"inner": {"type": "string", "format": "parse"}}},
+    }}
+    engine = MockEngine(schema=schema, seed=1)
+
+    assert engine.faker_fallbacks == {"bad": "metodo_inesistente", "obj.inner": "parse"}
+    record = engine.generate_record()
+    assert isinstance(record["bad"], str) and record["bad"]
+
+
+# TC-027: White Box - Blocchi colonnari allineati
+def test_columnar_range_split_independent():
+    """
+    White Box: in modalità colonnare il record i dipende solo da seed e indice:
+    un intervallo suddiviso (o proseguito con iter_records) dà gli stessi record.
+    """
+    pytest.importorskip("numpy")
+    schema = schema_path("valid_schema.json")
+    whole = list(MockEngine(schema, seed=1).iter_range(0, 1500, columnar=True))
+
+    split = MockEngine(schema, seed=1)
+    assert list(split.iter_range(700, 1500, columnar=True)) == whole[700:]
+    assert list(split.iter_range(0, 700, columnar=True)) == whole[:700]
 
+    engine = MockEngine(schema, seed=1)
+    engine.STREAM_CHUNK_SIZE = 64
+    stream = list(engine.iter_records(100, columnar=True)) + list(engine.iter_records(50, columnar=True))
+    aligned = MockEngine(schema, seed=1)
+    aligned.STREAM_CHUNK_SIZE = 64
+    assert stream == list(aligned.iter_range(0, 150, columnar=True))
+    assert engine.generate_columns(5, start=140) == {
+        name: [r[name] for r in stream[140:145]] for name in stream[0]}
@@ -1,7 +1,7 @@
 import io
 import json
 import pytest
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 # Assicurati che l'import sia corretto in base alla tua struttura
 from src.static_generator.exporter import DataExporter
 
@@ -323,3 +323,283 @@ def test_export_ndjson_partial_failure():
     assert '{"id": 2' not in content  # La seconda riga non deve esserci (o essere incompleta)
 
 
+# TC-E21: WECT Valid (Input in Streaming)
+# Obiettivo: Verificare che ogni formato accetti un generatore di record (non solo liste)
+# e che il JSON prodotto in streaming sia identico a json.dump(indent=2).
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv", "sql"])
+def test_export_accepts_generator(sample_data, fmt):
+    from_list = io.StringIO()
+    from_generator = io.StringIO()
+
+    DataExporter.export(sample_data, fmt, from_list)
+    DataExporter.export((row for row in sample_data), fmt, from_generator)
+
+    assert from_generator.getvalue() == from_list.getvalue()
+    if fmt == "json":
+        assert from_list.getvalue() == json.dumps(sample_data, indent=2, ensure_ascii=False) + "\n"
+
+
+# TC-E22: BVA Minimo (Generatore Vuoto)
+# Obiettivo: Un generatore che non produce record non deve scrivere nulla.
+def test_export_empty_generator():
+    output = io.StringIO()
+    DataExporter.export(iter([]), "csv", output)
+    assert output.getvalue() == ""
+
+
+
+# TC-E23: WECT Valid (SQL Multi-Riga)
+# Obiettivo: Verificare il raggruppamento delle righe in INSERT da sql_batch_size righe.
+def test_export_sql_multi_row_batches():
+    data = [{"id": i, "name": f"n'{i}"} for i in range(5)]
+    output = io.StringIO()
+    DataExporter.export(data, "sql", output, table_name="t", sql_mode="multi", sql_batch_size=2)
+
+    content = output.getvalue()
+    assert content.count("INSERT INTO t (id, name) VALUES\n") == 3
+    assert "(0, 'n''0'),\n(1, 'n''1');\n" in content
+    assert content.endswith("(4, 'n''4');\n")
+
+
+# TC-E24: Integration (SQL Transazione SQLite)
+# Obiettivo: Lo script in modalità 'sqlite' deve essere eseguibile da SQLite così com'è.
+def test_export_sql_sqlite_mode_loads():
+    import sqlite3
+    data = [{"id": i, "ok": i % 2 == 0, "note": None if i == 3 else "x"} for i in range(7)]
+    output = io.StringIO()
+    DataExporter.export(data, "sql", output, table_name="t", sql_mode="sqlite", sql_batch_size=3)
+
+    script = output.getvalue()
+    assert script.startswith("BEGIN TRANSACTION;\n") and script.endswith("COMMIT;\n")
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (id INTEGER, ok BOOLEAN, note TEXT)")
+    conn.executescript(script)
+    assert conn.execute("SELECT COUNT(*), SUM(ok), COUNT(note) FROM t").fetchone() == (7, 4, 6)
+
+
+# TC-E25: BVA (SQL COPY - Escaping)
+# Obiettivo: Verificare NULL, booleani, JSON e caratteri speciali nel formato testo di COPY.
+def test_export_sql_copy_format():
+    data = [{"id": 1, "txt": "a\tb\nc\\d", "flag": True, "meta": {"k": 1}, "none": None}]
+    output = io.StringIO()
+    DataExporter.export(data, "sql", output, table_name="t", sql_mode="copy")
+
+    assert output.getvalue() == (
+        "COPY t (id, txt, flag, meta, none) FROM stdin;\n"
+        "1\ta\\tb\\nc\\\\d\tt\t{\"k\": 1}\t\\N\n"
+        "\\.\n"
+    )
+
+
+# TC-E26: WECT Invalid (Modalità SQL Sconosciuta)
+@pytest.mark.parametrize("options", [{"sql_mode": "merge"}, {"sql_mode": "multi", "sql_batch_size": -1}])
+def test_export_sql_invalid_options(sample_data, options):
+    with pytest.raises(RuntimeError):
+        DataExporter.export(sample_data, "sql", io.StringIO(), **options)
+
+
+# TC-E27: Integration (Export Diretto su SQLite)
+# Obiettivo: Verificare tipi di colonna, mappatura dei valori e transazioni a batch.
+def test_export_sqlite_direct(tmp_path):
+    import sqlite3
+    db_path = str(tmp_path / "mock.db")
+    fields = {"id": {"type": "integer"}, "score": {"type": "float"}, "tags": {"type": "array"}}
+    data = ({"id": i, "score": i / 2, "tags": ["a", i], "ok": i % 2 == 0, "note": None} for i in range(10))
+
+    written = DataExporter.export_sqlite(data, db_path, table_name="my table", fields=fields, batch_size=3)
+
+    assert written == 10
+    conn = sqlite3.connect(db_path)
+    types = {row[1]: row[2] for row in conn.execute('PRAGMA table_info("my table")')}
+    assert types == {"id": "INTEGER", "score": "REAL", "tags": "TEXT", "ok": "INTEGER", "note": "TEXT"}
+    assert conn.execute('SELECT id, score, tags, ok, note FROM "my table" WHERE id = 4').fetchone() == (4, 2.0, '["a", 4]', 1, None)
+    conn.close()
+
+    # Tabella esistente: viene ricreata, rieseguire l'export dà lo stesso database
+    data = [{"id": i, "score": i / 2, "tags": ["a", i], "ok": i % 2 == 0, "note": None} for i in range(10)]
+    assert DataExporter.export_sqlite(data, db_path, table_name="my table", fields=fields) == 10
+    assert DataExporter.export_sqlite(data, db_path, table_name="my table", fields=fields) == 10
+    conn = sqlite3.connect(db_path)
+    assert conn.execute('SELECT COUNT(*) FROM "my table"').fetchone() == (10,)
+    conn.close()
+    with pytest.raises(RuntimeError):
+        DataExporter.export_sqlite([{"id": 1}] * 5 + [{"other": 1}], db_path, table_name="my table", batch_size=2)
+    # Export fallito a metà: la tabella precedente resta intatta, nessuna tabella di appoggio
+    conn = sqlite3.connect(db_path)
+    assert conn.execute('SELECT COUNT(*) FROM "my table"').fetchone() == (10,)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == [("my table",)]
+    conn.close()
+    # Input vuoto: nessuna riga scritta, la tabella precedente viene rimossa
+    assert DataExporter.export_sqlite([], db_path, table_name="my table") == 0
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall() == []
+    conn.close()
+
+
+# TC-E28: Integration (Export Parquet a Row Group)
+# Obiettivo: Verificare colonne tipizzate (dictionary per choice, struct per object) e row group incrementali.
+def test_export_parquet_typed_columns(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    pq = pytest.importorskip("pyarrow.parquet")
+    fields = {
+        "id": {"type": "integer"},
+        "score": {"type": "float"},
+        "kind": {"type": "choice", "options": ["A", "B"]},
+        "owner": {"type": "object", "fields": {"name": {"type": "string"}, "age": {"type": "integer"}}},
+        "tags": {"type": "array", "item_type": "integer"},
+    }
+    records = [
+        {"id": i, "score": i / 4, "kind": "AB"[i % 2], "owner": {"name": f"n{i}", "age": i}, "tags": [i], "extra": None}
+        for i in range(10)
+    ]
+    path = str(tmp_path / "mock.parquet")
+
+    written = DataExporter.export_parquet((r for r in records), path, fields=fields, row_group_size=4)
+
+    assert written == 10
+    parquet_file = pq.ParquetFile(path)
+    assert parquet_file.metadata.num_row_groups == 3
+    schema = parquet_file.schema_arrow
+    assert schema.field("id").type == pa.int64()
+    assert schema.field("score").type == pa.float64()
+    assert pa.types.is_dictionary(schema.field("kind").type)
+    assert pa.types.is_struct(schema.field("owner").type)
+    assert schema.field("tags").type == pa.list_(pa.int64())
+    assert parquet_file.read().to_pylist() == records
+    assert DataExporter.export_parquet([], path) == 0
+
+
+# TC-E29: WECT Valid (JSON/NDJSON Compatti)
+# Obiettivo: Verificare l'output senza indentazione né spazi, con entrambi i backend.
+@pytest.mark.parametrize("backend", ["stdlib", "auto"])
+def test_export_compact_json(sample_data, backend):
+    as_json = io.StringIO()
+    as_ndjson = io.StringIO()
+    DataExporter.export(sample_data, "json", as_json, compact=True, json_backend=backend)
+    DataExporter.export(sample_data, "ndjson", as_ndjson, compact=True, json_backend=backend)
+
+    compact = [json.dumps(item, ensure_ascii=False, separators=(",", ":")) for item in sample_data]
+    assert as_json.getvalue() == "[" + ",".join(compact) + "]\n"
+    assert as_ndjson.getvalue() == "".join(line + "\n" for line in compact)
+
+
+# TC-E30: White Box (Backend JSON)
+# Obiettivo: orjson (se installato) produce lo stesso JSON indentato della libreria standard;
+# un backend sconosciuto viene rifiutato.
+def test_export_json_backends_match(sample_data):
+    pytest.importorskip("orjson")
+    data = sample_data + [{"nested": {"list": [1, 2.5, None, True], "empty": {}, "text": "città"}, "big": 2 ** 70}]
+    outputs = []
+    for backend in ("stdlib", "orjson"):
+        output = io.StringIO()
+        DataExporter.export(data, "json", output, json_backend=backend)
+        outputs.append(output.getvalue())
+
+    assert outputs[0] == outputs[1] == json.dumps(data, indent=2, ensure_ascii=False) + "\n"
+    with pytest.raises(RuntimeError):
+        DataExporter.export(sample_data, "json", io.StringIO(), json_backend="simplejson")
+
+
+# TC-E31: White Box (Scritture a Blocchi)
+# Obiettivo: Verificare che l'export effettui una write per blocco di record e non una per record.
+def test_export_batched_writes():
+    data = [{"id": i} for i in range(2500)]
+    output = MagicMock()
+
+    DataExporter.export(data, "ndjson", output)
+
+    assert output.write.call_count == 3
+    written = "".join(call.args[0] for call in output.write.call_args_list)
+    assert written.count("\n") == 2500
+
+
+# TC-E32: WECT Valid (CSV Appiattito da Schema)
+# Obiettivo: Verificare le colonne puntate ricavate dallo schema per gli object annidati
+# e la resa degli array con entrambe le politiche.
+@pytest.mark.parametrize("policy, tags_cell", [("json", '"[""a"", ""b""]"'), ("join", "a|b")])
+def test_export_csv_flattens_nested_fields(policy, tags_cell):
+    fields = {
+        "id": {"type": "integer"},
+        "anagrafica": {"type": "object", "fields": {
+            "nome": {"type": "string"},
+            "indirizzo": {"type": "object", "fields": {"citta": {"type": "string"}}},
+        }},
+        "tags": {"type": "array", "item_type": "string"},
+    }
+    data = [
+        {"id": 1, "anagrafica": {"nome": "Anna", "indirizzo": {"citta": "Roma"}}, "tags": ["a", "b"]},
+        {"id": 2, "anagrafica": {"nome": "Luca"}, "tags": ["a", "b"]},
+    ]
+    output = io.StringIO()
+
+    DataExporter.export(data, "csv", output, fields=fields, csv_arrays=policy)
+
+    assert output.getvalue().split("\n")[:3] == [
+        "id,anagrafica.nome,anagrafica.indirizzo.citta,tags",
+        f"1,Anna,Roma,{tags_cell}",
+        f"2,Luca,,{tags_cell}",
+    ]
+
+
+# TC-E33: White Box (CSV senza Schema e a Blocchi)
+# Obiettivo: Senza schema le colonne si ricavano dal primo record (oggetti appiattiti);
+# le righe sono scritte in chunk da write_batch_size.
+def test_export_csv_plan_from_first_record():
+    data = [{"id": i, "geo": {"lat": 1.5, "lon": 2.5}} for i in range(5)]
+
+    chunks = list(DataExporter.iter_export(data, "csv", write_batch_size=2))
+
+    assert len(chunks) == 3
+    lines = "".join(chunks).splitlines()
+    assert lines[0] == "id,geo.lat,geo.lon"
+    assert lines[1:] == [f"{i},1.5,2.5" for i in range(5)]
+    with pytest.raises(ValueError):
+        list(DataExporter.iter_export(data, "csv", csv_arrays="semicolon"))
+
+
+# TC-E34: WECT Valid (Float nel Backend di Default)
+# Obiettivo: Senza json_backend l'output è quello della libreria standard, anche con orjson
+# installato: la notazione dei float (1e-05, 1.5e+16) non dipende dai pacchetti presenti.
+def test_export_json_default_backend_floats():
+    data = [{"small": 1e-05, "big": 1.5e16, "third": 1 / 3, "neg": -2.5e-10}]
+
+    for fmt, expected in (
+        ("json", json.dumps(data, indent=2, ensure_ascii=False) + "\n"),
+        ("ndjson", json.dumps(data[0], ensure_ascii=False) + "\n"),
+    ):
+        output = io.StringIO()
+        DataExporter.export(data, fmt, output)
+        assert output.getvalue() == expected
+    assert "1e-05" in expected and "1.5e+16" in expected
+
+    output = io.StringIO()
+    DataExporter.export(data, "json", output, compact=True)
+    assert json.loads(output.getvalue()) == data
+    assert '"small":1e-05' in output.getvalue()
+
+
+# TC-E35: White Box (SQLite Esistente)
+# Obiettivo: I pragma di caricamento massivo non si applicano a un database già esistente
+# e le altre tabelle del file non vengono toccate.
+def test_export_sqlite_existing_database(tmp_path):
+    import sqlite3
+    db_path = str(tmp_path / "app.db")
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE users (id INTEGER)")
+    conn.execute("INSERT INTO users VALUES (1)")
+    conn.commit()
+    conn.close()
+
+    with patch.object(DataExporter, "SQLITE_PRAGMAS", ("PRAGMA user_version = 7",)):
+        assert DataExporter.export_sqlite([{"id": 1}, {"id": 2}], db_path, table_name="mock") == 2
+        new_path = str(tmp_path / "new.db")
+        DataExporter.export_sqlite([{"id": 1}], new_path, table_name="mock")
+
+    conn = sqlite3.connect(db_path)
+    assert conn.execute("PRAGMA user_version").fetchone() == (0,)
+    assert conn.execute("SELECT COUNT(*) FROM users").fetchone() == (1,)
+    assert conn.execute("SELECT COUNT(*) FROM mock").fetchone() == (2,)
+    conn.close()
+    conn = sqlite3.connect(new_path)
+    assert conn.execute("PRAGMA user_version").fetchone() == (7,)
+    conn.close()
@@ -1,5 +1,8 @@
 import pytest
+import os
+import subprocess
 import sys
+import time
 import logging
 from unittest.mock import patch, MagicMock
 # Assicurati che l'import punti correttamente
@@ -135,4 +138,42 @@ def test_main_catch_specific_exception(mock_run, mock_parse, capsys):
 
     assert excinfo.value.code == 1
     captured = capsys.readouterr()
-    assert "Critical Error: Invalid Schema Structure" in captured.err
\ No newline at end of file
+    assert "Critical Error: Invalid Schema Structure" in captured.err
+
+# --- AVVIO RAPIDO (Import differiti) ---
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../.."))
+MAIN_CLI = os.path.join(PROJECT_ROOT, "src", "static_generator", "__main_cli__.py")
+# Soglia volutamente larga: protegge dalle regressioni (es. import eager di Faker) senza essere instabile
+HELP_OVERHEAD_BUDGET = 0.25
+
+
+def _run_python(*args):
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT)
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, cwd=PROJECT_ROOT)
+
+
+# TC-M08: White Box (Import Guard) - --help non carica i moduli pesanti
+def test_help_does_not_import_heavy_modules():
+    result = _run_python("-X", "importtime", MAIN_CLI, "--help")
+
+    assert result.returncode == 0
+    imported = {line.split("|")[-1].strip() for line in result.stderr.splitlines() if line.startswith("import time:")}
+    for module in ("faker", "jsonschema", "numpy", "src.static_generator.engine", "src.static_generator.controller"):
+        assert module not in imported
+
+
+# TC-M09: Benchmark - Tempo di avvio di --help
+def test_help_startup_time():
+    def best_of(*args, runs=3):
+        best = float("inf")
+        for _ in range(runs):
+            start = time.perf_counter()
+            _run_python(*args)
+            best = min(best, time.perf_counter() - start)
+        return best
+
+    baseline = best_of("-c", "pass")
+    startup = best_of(MAIN_CLI, "--help")
+
+    assert startup - baseline < HELP_OVERHEAD_BUDGET
@@ -0,0 +1,73 @@
+import json
+from unittest.mock import patch
+
+import pytest
+from src.static_generator.engine import MockEngine
+from src.static_generator.schema_cache import SchemaCache
+from src.static_generator.schema_parser import SchemaError
+
+
+# =============================================================================
+# SUITE: Cache degli schemi compilati
+# MODULE: schema_cache.py
+# STRATEGY: White Box (LRU, Metriche), Robustness
+# =============================================================================
+
+def _schema(field):
+    return json.dumps({"type": "object", "properties": {field: {"type": "integer"}}})
+
+
+# TC-S01: White Box - Stesso contenuto, una sola compilazione
+def test_schema_cache_hit_skips_compilation():
+    cache = SchemaCache(max_size=4)
+    content = _schema("a")
+
+    with patch.object(MockEngine, "compile_schema", wraps=MockEngine.compile_schema) as spy:
+        first = cache.get(content)
+        second = cache.get(content)
+
+    spy.assert_called_once()
+    assert first is second
+    assert cache.stats() == {"size": 1, "max_size": 4, "hits": 1, "misses": 1, "evictions": 0}
+
+
+# TC-S02: White Box - Evizione LRU
+def test_schema_cache_evicts_least_recently_used():
+    cache = SchemaCache(max_size=2)
+    a, b, c = _schema("a"), _schema("b"), _schema("c")
+
+    cache.get(a)
+    cache.get(b)
+    cache.get(a)   # "a" diventa il più recente
+    cache.get(c)   # evizione di "b"
+
+    assert len(cache) == 2
+    assert cache.evictions == 1
+    cache.get(a)
+    assert cache.hits == 2
+    cache.get(b)
+    assert cache.misses == 4
+
+
+# TC-S03: White Box - Engine da cache identici a quelli da dict
+def test_schema_cache_engine_matches_plain_engine():
+    cache = SchemaCache()
+    schema = {"type": "object", "properties": {"n": {"type": "integer"}, "c": {"type": "choice", "options": ["X", "Y"]}}}
+
+    expected = MockEngine(schema=schema, seed=9).generate(5)
+    assert cache.engine(schema, seed=9).generate(5) == expected
+    # Stesso contenuto come testo JSON con chiavi in ordine diverso: stessa chiave
+    assert cache.key_for(schema) == cache.key_for(json.loads(json.dumps(schema)))
+    assert cache.engine(schema, seed=9).generate(5) == expected
+
+
+# TC-S04: Robustness - Schemi non validi non finiscono in cache
+def test_schema_cache_invalid_content():
+    cache = SchemaCache()
+    with pytest.raises(json.JSONDecodeError):
+        cache.get("{non json")
+    with pytest.raises(SchemaError):
+        cache.get(json.dumps({"type": "array"}))
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        SchemaCache(max_size=0)
@@ -0,0 +1,90 @@
+import hashlib
+import json
+import os
+
+import pytest
+from src.static_generator.engine import MockEngine
+from src.static_generator.sharding import manifest_path, shard_path, write_sharded
+
+
+# =============================================================================
+# SUITE: Output a shard con manifest
+# MODULE: sharding.py
+# STRATEGY: WECT, White Box (Manifest, Parallel), Robustness
+# =============================================================================
+
+SCHEMA = {"type": "object", "properties": {"id": {"type": "integer"}, "tag": {"type": "choice", "options": ["A", "B"]}}}
+
+
+def _read_lines(directory, manifest):
+    lines = []
+    for shard in manifest["shards"]:
+        with open(os.path.join(directory, shard["file"]), encoding="utf-8") as f:
+            lines.extend(f.read().splitlines())
+    return lines
+
+
+# TC-H01: WECT Valid - Nomi di shard e manifest
+@pytest.mark.parametrize("path, shard, manifest", [
+    ("out/data.ndjson", "out/data-00003.ndjson", "out/data.manifest.json"),
+    ("data.csv.gz", "data-00003.csv.gz", "data.manifest.json"),
+    ("data", "data-00003", "data.manifest.json"),
+])
+def test_shard_paths(path, shard, manifest):
+    assert shard_path(path, 3) == shard
+    assert manifest_path(path) == manifest
+
+
+# TC-H02: White Box - Shard a record: manifest e output identico a quello seriale
+@pytest.mark.parametrize("workers", [None, 2])
+def test_write_sharded_by_records(tmp_path, workers):
+    expected = [json.dumps(r) for r in MockEngine(schema=SCHEMA, seed=5).generate(25)]
+    path = str(tmp_path / "data.ndjson")
+
+    manifest = write_sharded(MockEngine(schema=SCHEMA, seed=5), 25, path, "ndjson", shard_records=10, workers=workers)
+
+    assert [(s["start"], s["stop"], s["records"]) for s in manifest["shards"]] == [(0, 10, 10), (10, 20, 10), (20, 25, 5)]
+    assert _read_lines(tmp_path, manifest) == expected
+    with open(manifest_path(path), encoding="utf-8") as f:
+        assert json.load(f) == manifest
+    first = manifest["shards"][0]
+    with open(tmp_path / first["file"], "rb") as f:
+        data = f.read()
+    assert first["bytes"] == len(data)
+    assert first["sha256"] == hashlib.sha256(data).hexdigest()
+
+
+# TC-H03: BVA - Shard a dimensione in byte
+def test_write_sharded_by_bytes(tmp_path):
+    expected = [json.dumps(r) for r in MockEngine(schema=SCHEMA, seed=2).generate(200)]
+    manifest = write_sharded(MockEngine(schema=SCHEMA, seed=2), 200, str(tmp_path / "data.ndjson"), "ndjson", shard_bytes=1024)
+
+    assert len(manifest["shards"]) > 1
+    assert sum(s["records"] for s in manifest["shards"]) == 200
+    assert all(s["bytes"] < 1024 + 100 for s in manifest["shards"])
+    assert [s["start"] for s in manifest["shards"][1:]] == [s["stop"] for s in manifest["shards"][:-1]]
+    assert _read_lines(tmp_path, manifest) == expected
+
+
+# TC-H04: Robustness - Opzioni non valide
+@pytest.mark.parametrize("options", [
+    {"format_type": "sqlite", "shard_records": 10},
+    {"format_type": "ndjson"},
+    {"format_type": "ndjson", "shard_records": 10, "shard_bytes": 10},
+    {"format_type": "ndjson", "shard_bytes": 100, "workers": 2},
+    {"format_type": "ndjson", "shard_records": 0},
+])
+def test_write_sharded_invalid_options(tmp_path, options):
+    with pytest.raises(ValueError):
+        write_sharded(MockEngine(schema=SCHEMA, seed=1), 10, str(tmp_path / "data.ndjson"), **options)
+
+
+# TC-H05: BVA - Shard a byte in SQL multi-riga
+def test_write_sharded_sql_multi_by_bytes(tmp_path):
+    manifest = write_sharded(MockEngine(schema=SCHEMA, seed=2), 200, str(tmp_path / "data.sql"), "sql",
+                             shard_bytes=1024, sql_mode="multi", sql_batch_size=500)
+
+    assert len(manifest["shards"]) > 1
+    assert sum(s["records"] for s in manifest["shards"]) == 200
+    # La soglia vale record per record anche con INSERT multi-riga richiesti
+    assert all(s["bytes"] < 1024 + 200 for s in manifest["shards"])
@@ -0,0 +1,107 @@
+from unittest.mock import patch
+
+import pytest
+from src.static_generator.algorithmic import get_generator
+from src.static_generator.engine import MockEngine
+from src.static_generator.uniqueness import BloomFilter, UniqueSet, UniquenessError
+
+
+# =============================================================================
+# SUITE: Vincoli di unicità
+# MODULE: uniqueness.py (+ UniqueGenerator / unique_items in algorithmic.py)
+# STRATEGY: White Box (Strutture dati, Integrazione Engine), Robustness
+# =============================================================================
+
+# TC-U01: White Box - Bloom filter senza falsi negativi e con falsi positivi limitati
+def test_bloom_filter_error_rate():
+    bloom = BloomFilter(capacity=10_000, error_rate=0.01)
+    for i in range(10_000):
+        bloom.add(f"v{i}")
+
+    assert all(f"v{i}" in bloom for i in range(10_000))
+    assert not bloom.add("v42")
+    false_positives = sum(f"x{i}" in bloom for i in range(10_000))
+    assert false_positives < 300
+    assert bloom.nbytes < 13_000
+
+
+# TC-U02: White Box - Modalità auto: set esatto, poi migrazione nel Bloom filter
+def test_unique_set_auto_switches_to_bloom():
+    with patch("src.static_generator.uniqueness.EXACT_LIMIT", 100):
+        seen = UniqueSet("auto", capacity=1000, error_rate=0.001)
+        assert all(seen.add(i) for i in range(100))
+        assert seen.bloom is None
+        assert seen.add(100)
+
+    assert seen.exact is None and seen.bloom is not None
+    assert not any(seen.add(i) for i in range(101))
+    # Oggetti confrontati tramite JSON canonico (ordine delle chiavi ininfluente)
+    objects = UniqueSet("exact")
+    assert objects.add({"a": [1], "b": 2})
+    assert not objects.add({"b": 2, "a": [1]})
+    with pytest.raises(ValueError):
+        UniqueSet("fuzzy")
+
+
+# TC-U03: White Box - Campi univoci nell'engine e spazio dei valori esaurito
+def test_engine_unique_fields(tmp_path):
+    schema = {"type": "object", "properties": {
+        "id": {"type": "integer", "min_value": 1, "max_value": 60, "unique": True},
+        "nested": {"type": "object", "fields": {
+            "code": {"type": "choice", "options": list("ABCDEFGHIJ"), "unique": {"mode": "bloom", "capacity": 100}},
+        }},
+    }}
+    records = MockEngine(schema=schema, seed=1).generate(10)
+    assert len({r["id"] for r in records}) == 10
+    assert sorted(r["nested"]["code"] for r in records) == list("ABCDEFGHIJ")
+
+    engine = MockEngine(schema=schema, seed=1)
+    assert engine.has_unique
+    with patch.object(MockEngine, "PARALLEL_SHARD_SIZE", 7):
+        parallel = engine.generate_parallel(10, workers=2)
+    assert parallel == records
+    with pytest.raises(UniquenessError, match="code"):
+        engine.generate(1)
+
+
+# TC-U05: Robustness - Accesso diretto con campi univoci
+def test_unique_fields_reject_random_access():
+    schema = {"type": "object", "properties": {
+        "id": {"type": "integer", "min_value": 1, "max_value": 1_000_000, "unique": True},
+    }}
+    sequence = MockEngine(schema=schema, seed=3).generate(8)
+
+    engine = MockEngine(schema=schema, seed=3)
+    assert engine.record_at(0) == sequence[0]
+    assert engine.generate_range(1, 4) == sequence[1:4]
+    # Ripetere un indice o saltare avanti darebbe valori diversi: errore esplicito
+    with pytest.raises(ValueError, match="univoci"):
+        engine.record_at(0)
+    with pytest.raises(ValueError, match="univoci"):
+        engine.generate_range(6, 8)
+    tail = list(engine.iter_range(4, 8, columnar=True))
+    assert len({r["id"] for r in sequence[:4] + tail}) == 8
+
+    engine = MockEngine(schema=schema, seed=3)
+    assert engine.record_at(0) == sequence[0]
+    with pytest.raises(ValueError):
+        engine.record_at(5)
+
+
+# TC-U04: Robustness - unique_items negli array e configurazioni non valide
+def test_array_unique_items_and_invalid_options():
+    from src.static_generator.rng import RandomSource
+
+    rng = RandomSource(seed=3)
+    gen = get_generator("tags", {"type": "array", "item_type": "integer", "min_items": 5, "max_items": 5,
+                                 "uniqueItems": True})
+    for _ in range(50):
+        items = gen.generate(rng)
+        assert len(set(items)) == len(items) == 5
+
+    tiny = get_generator("tags", {"type": "array", "item_type": "integer", "min_items": 500, "max_items": 500,
+                                  "unique_items": True})
+    with pytest.raises(UniquenessError):
+        tiny.generate(rng)
+    with pytest.raises(ValueError):
+        get_generator("id", {"type": "uuid", "unique": {"mode": "bloom", "error_rate": 2}})
@@ -0,0 +1,59 @@
+import os
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+from src.static_generator.rng import CounterRandom
+from src.static_generator.value_pool import ValuePool, ValuePoolCache, build_pool
+
+
+# =============================================================================
+# SUITE: Pool di valori Faker precalcolati
+# MODULE: value_pool.py
+# STRATEGY: White Box (Serializzazione, Cache), Robustness
+# =============================================================================
+
+# TC-V01: White Box - Round trip del formato binario
+def test_value_pool_bytes_round_trip():
+    pool = ValuePool(["Roma", "", "Forlì-Cesena", "ünïcødé ✓"])
+    assert ValuePool.from_bytes(pool.to_bytes()).values == pool.values
+
+
+# TC-V02: Robustness - File corrotti o vuoti
+def test_value_pool_rejects_invalid_data():
+    data = ValuePool(["alpha", "beta"]).to_bytes()
+    with pytest.raises(ValueError):
+        ValuePool.from_bytes(b"garbage")
+    with pytest.raises(ValueError):
+        ValuePool.from_bytes(data[:-2])
+    with pytest.raises(ValueError):
+        ValuePool([])
+
+
+# TC-V03: White Box - Pool deterministici e campionamento
+def test_build_pool_is_deterministic():
+    pool = build_pool("it_IT", "city", seed=5, size=50)
+    assert pool.values == build_pool("it_IT", "city", seed=5, size=50).values
+    assert pool.values != build_pool("it_IT", "city", seed=6, size=50).values
+
+    rng = CounterRandom(1)
+    assert all(pool.sample(rng) in pool.values for _ in range(20))
+    column = pool.sample_column(100, np.random.default_rng(0))
+    assert len(column) == 100 and set(column) <= set(pool.values)
+
+
+# TC-V04: White Box - La seconda esecuzione legge la cache su disco
+def test_pool_cache_hits_disk(tmp_path):
+    first = ValuePoolCache(str(tmp_path))
+    pool = first.get("it_IT", "email", seed=1, size=30)
+    assert first.misses == 1
+    assert os.path.exists(first.path_for("it_IT", "email", 1, 30))
+
+    second = ValuePoolCache(str(tmp_path))
+    with patch("src.static_generator.value_pool.build_pool") as mock_build:
+        cached = second.get("it_IT", "email", seed=1, size=30)
+    mock_build.assert_not_called()
+    assert second.hits == 1
+    assert cached.values == pool.values
+    # Nessun file temporaneo residuo
+    assert all(name.endswith(".pool") for name in os.listdir(tmp_path))